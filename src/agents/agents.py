@@ -4,8 +4,7 @@
 from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
-from src.llms.llm import get_llm_by_type
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.llm import get_llm_for_agent
 
 
 # Create agents using configured LLM types
@@ -14,7 +13,7 @@ def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template:
     configurable = None
     return create_react_agent(
         name=agent_name,
-        model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
+        model=get_llm_for_agent(agent_type),
         tools=tools,
         prompt=lambda state: apply_prompt_template(prompt_template, state, configurable),
     )
@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure checkpoint size and write latency with and without the blob store.
+
+Usage:
+    uv run python -m src.benchmark.checkpoint_size --steps 10 --result-size 20000
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+import uuid
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.prompts.planner_model import Plan, Step, StepType
+from src.storage import blob_store
+
+
+def _random_text(size: int) -> str:
+    words = [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 10)))
+        for _ in range(size // 6 + 1)
+    ]
+    return " ".join(words)[:size]
+
+
+def _simulate_run(steps: int, result_size: int, use_blob_store: bool) -> dict:
+    """Write one checkpoint per completed step, the way the research team does."""
+    os.environ["BLOB_STORE_ENABLED"] = "true" if use_blob_store else "false"
+    random.seed(0)
+    saver = MemorySaver()
+    config = {"configurable": {"thread_id": str(uuid.uuid4()), "checkpoint_ns": ""}}
+    plan = Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="benchmark",
+        title="benchmark",
+        steps=[
+            Step(
+                need_web_search=True,
+                title=f"Step {i}",
+                description="benchmark step",
+                step_type=StepType.RESEARCH,
+            )
+            for i in range(steps)
+        ],
+    )
+    messages = [HumanMessage(content="benchmark query")]
+    observations = []
+    write_seconds = []
+    for i in range(steps):
+        content = _random_text(result_size)
+        # Like _execute_agent_step, the plan and the observations hold a
+        # reference while the message stays inline, as it is displayed
+        stored_content = blob_store.offload(content)
+        plan.steps[i].execution_res = stored_content
+        messages = messages + [HumanMessage(content=content, name="researcher")]
+        observations = observations + [stored_content]
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {
+            "messages": messages,
+            "observations": observations,
+            "current_plan": plan,
+        }
+        new_versions = {k: i + 1 for k in checkpoint["channel_values"]}
+        started_at = time.perf_counter()
+        config = saver.put(config, checkpoint, {"step": i}, new_versions)
+        write_seconds.append(time.perf_counter() - started_at)
+
+    total_bytes = sum(len(blob[1]) for blob in saver.blobs.values())
+    return {
+        "total_bytes": total_bytes,
+        "last_checkpoint_bytes": sum(
+            len(blob[1])
+            for (_, _, _, version), blob in saver.blobs.items()
+            if version == steps
+        ),
+        "mean_write_ms": 1000 * sum(write_seconds) / len(write_seconds),
+        "max_write_ms": 1000 * max(write_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint size benchmark")
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--result-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as blob_dir:
+        os.environ["BLOB_STORE_DIR"] = blob_dir
+        blob_store._blob_store = None
+        for use_blob_store in (False, True):
+            result = _simulate_run(args.steps, args.result_size, use_blob_store)
+            print(
+                f"blob_store={'on' if use_blob_store else 'off':<3} "
+                f"total={result['total_bytes'] / 1024:10.1f} KiB "
+                f"last_checkpoint={result['last_checkpoint_bytes'] / 1024:8.1f} KiB "
+                f"mean_write={result['mean_write_ms']:7.3f} ms "
+                f"max_write={result['max_write_ms']:7.3f} ms"
+            )
+        blob_store._blob_store = None
+
+
+if __name__ == "__main__":
+    main()
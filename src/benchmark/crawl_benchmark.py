@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Offline benchmark of the direct crawler against a local web site.
+
+Serves synthetic articles from a ``FakeSite`` with a configurable latency and
+crawls them with ``CRAWLER_ENGINE=direct``, reporting the latency of fetching
+the HTML alone and of the full crawl including readability extraction. The
+crawl cache is disabled so that every page is fetched.
+
+Usage:
+    uv run python -m src.benchmark.crawl_benchmark
+    uv run python -m src.benchmark.crawl_benchmark --pages 200 --concurrency 1 8 32 --latency 0.05
+    uv run python -m src.benchmark.crawl_benchmark --fetch-only
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+from src.config import CrawlerEngine
+from src.crawler import Crawler
+from src.crawler.direct_client import DirectClient
+from src.utils.http_client import close_http_clients
+
+from .fakes import FakeSite
+
+
+async def _run(
+    crawl: Callable[[str], Awaitable], urls: list[str], concurrency: int
+) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def timed(url: str) -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            await crawl(url)
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(timed(url) for url in urls))
+    return latencies, time.perf_counter() - started_at
+
+
+def _report(name: str, concurrency: int, latencies: list[float], wall: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=20)
+    print(
+        f"{name:<8}{concurrency:>12}{1000 * statistics.median(latencies):>12.1f}"
+        f"{1000 * quantiles[18]:>12.1f}{len(latencies) / wall:>12.1f}"
+    )
+
+
+async def _benchmark(args: argparse.Namespace) -> None:
+    os.environ["CRAWL_CACHE_ENABLED"] = "false"
+    # The fake site is served on the loopback address
+    os.environ["CRAWL_ALLOW_PRIVATE_HOSTS"] = "true"
+    # Measure the crawler, not the politeness delays towards the local site
+    os.environ["CRAWL_MIN_DELAY_PER_HOST"] = "0"
+    os.environ["CRAWL_MAX_CONCURRENCY"] = str(max(args.concurrency))
+    os.environ["CRAWL_MAX_CONCURRENCY_PER_HOST"] = str(max(args.concurrency))
+    with FakeSite(latency=args.latency, paragraphs=args.paragraphs) as site:
+        urls = [f"{site.url}/article/{i}" for i in range(args.pages)]
+        print(f"{'':<8}{'concurrency':>12}{'p50 ms':>12}{'p95 ms':>12}{'pages/s':>12}")
+        for concurrency in args.concurrency:
+            _report(
+                "fetch",
+                concurrency,
+                *await _run(DirectClient().acrawl, urls, concurrency),
+            )
+            if not args.fetch_only:
+                _report(
+                    "crawl",
+                    concurrency,
+                    *await _run(Crawler().acrawl, urls, concurrency),
+                )
+        await close_http_clients()
+    print(
+        f"\n{args.pages} pages of {args.paragraphs} paragraphs, "
+        f"{1000 * args.latency:.0f} ms site latency"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Direct crawler benchmark")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--paragraphs", type=int, default=20)
+    parser.add_argument(
+        "--fetch-only",
+        action="store_true",
+        help="Skip readability extraction, which needs Node.js",
+    )
+    args = parser.parse_args()
+    with patch(
+        "src.crawler.crawler.SELECTED_CRAWLER_ENGINE", CrawlerEngine.DIRECT.value
+    ):
+        asyncio.run(_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
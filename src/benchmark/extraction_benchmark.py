@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Compare the latency and quality of the article extractors on saved pages.
+
+The corpus in ``extraction_corpus`` has an HTML page and the text of its
+article (``<page>.txt``) for news, blog, documentation, encyclopedia and
+layout-only (div) pages. Quality is the F1 score of the extracted words
+against the article text; CJK characters count as words.
+
+Usage:
+    uv run python -m src.benchmark.extraction_benchmark
+    uv run python -m src.benchmark.extraction_benchmark --engines lxml --repeat 100
+"""
+
+import argparse
+import os
+import re
+import statistics
+import time
+from collections import Counter
+from typing import Optional
+
+import lxml.html
+
+from src.config import ExtractorEngine
+from src.crawler.readability_extractor import ReadabilityExtractor
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "extraction_corpus")
+_WORD = re.compile(r"[぀-ヿ㐀-鿿]|\w+")
+
+
+def load_corpus(corpus_dir: str = CORPUS_DIR) -> list[tuple[str, str, str]]:
+    """Return the name, HTML and article text of every page of the corpus."""
+    pages = []
+    for file_name in sorted(os.listdir(corpus_dir)):
+        name, extension = os.path.splitext(file_name)
+        if extension != ".html":
+            continue
+        with open(os.path.join(corpus_dir, file_name), encoding="utf-8") as f:
+            html = f.read()
+        with open(os.path.join(corpus_dir, f"{name}.txt"), encoding="utf-8") as f:
+            pages.append((name, html, f.read()))
+    return pages
+
+
+def text_of(html: Optional[str]) -> str:
+    """Return the text of extracted HTML, with blocks separated by spaces."""
+    if not html or not html.strip():
+        return ""
+    return " ".join(lxml.html.fromstring(html).itertext())
+
+
+def f1_score(extracted: str, expected: str) -> float:
+    """Return the F1 score of the words of ``extracted`` against ``expected``."""
+    extracted_words = Counter(_WORD.findall(extracted.lower()))
+    expected_words = Counter(_WORD.findall(expected.lower()))
+    overlap = sum((extracted_words & expected_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(extracted_words.values())
+    recall = overlap / sum(expected_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Article extraction benchmark")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=[engine.value for engine in ExtractorEngine],
+        choices=[engine.value for engine in ExtractorEngine],
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    extractor = ReadabilityExtractor()
+    pages = load_corpus()
+    print(f"{'page':<12}" + "".join(f"{engine:>24}" for engine in args.engines))
+    results = {engine: [] for engine in args.engines}
+    for name, html, expected in pages:
+        row = f"{name:<12}"
+        for engine in args.engines:
+            started_at = time.perf_counter()
+            for _ in range(args.repeat):
+                article = extractor.extract_article(html, engine)
+            milliseconds = 1000 * (time.perf_counter() - started_at) / args.repeat
+            f1 = f1_score(text_of(article.html_content), expected)
+            results[engine].append((milliseconds, f1))
+            row += f"{milliseconds:>12.2f} ms  F1 {f1:.2f}"
+        print(row)
+    row = f"{'mean':<12}"
+    for engine in args.engines:
+        milliseconds, f1 = (statistics.mean(column) for column in zip(*results[engine]))
+        row += f"{milliseconds:>12.2f} ms  F1 {f1:.2f}"
+    print(f"{row}\n\nMilliseconds per page, averaged over {args.repeat} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Scripted stand-ins for the chat model, web search, crawler and web sites.
+
+They let the research graph run end to end without network access, with
+configurable latency, so the orchestration overhead can be measured and the
+server can be load tested reproducibly. The model, search and crawler live next
+to the providers that select them, ``FakeSite`` is only used by benchmarks and
+tests.
+"""
+
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.crawler.fake_crawler import FakeCrawler
+from src.llms.fake import FakeChatModel
+from src.tools.fake_search import FakeSearchTool
+from src.utils.synthetic import synthetic_text
+
+__all__ = ["FakeChatModel", "FakeCrawler", "FakeSearchTool", "FakeSite"]
+
+
+class _FakeSiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Accept bursts of concurrent connections
+    request_queue_size = 128
+
+
+class FakeSite:
+    """
+    A local web site that serves synthetic articles after ``latency`` seconds.
+
+    Every path is an article of ``paragraphs`` paragraphs (or ``?paragraphs=N``)
+    with an ``ETag``, except ``/redirect/<n>/<path>``, which redirects ``n``
+    times before serving ``<path>``, and paths ending in ``.pdf``, which are not
+    HTML. ``HEAD`` requests get the headers of the same responses. Use it as a
+    context manager, ``url`` is the base URL of the site.
+    """
+
+    def __init__(self, latency: float = 0.0, paragraphs: int = 20):
+        site = self
+        self.latency = latency
+        self.paragraphs = paragraphs
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes, don't delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                site.requests += 1
+                time.sleep(site.latency)
+                parts = urlsplit(self.path)
+                redirect = re.fullmatch(r"/redirect/(\d+)(/.*)", parts.path)
+                if redirect:
+                    hops, path = int(redirect.group(1)), redirect.group(2)
+                    location = f"/redirect/{hops - 1}{path}" if hops > 1 else path
+                    if parts.query:
+                        location += f"?{parts.query}"
+                    self.send_response(302)
+                    self.send_header("Location", location)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if parts.path.endswith(".pdf"):
+                    self._send(b"%PDF-1.4", "application/pdf")
+                    return
+                query = parse_qs(parts.query)
+                paragraphs = int(query.get("paragraphs", [site.paragraphs])[0])
+                body = "".join(
+                    f"<p>{synthetic_text(60, i)}</p>" for i in range(paragraphs)
+                )
+                html = (
+                    f"<html><head><title>Article at {parts.path}</title></head>"
+                    f"<body><article><h1>Article at {parts.path}</h1>{body}"
+                    "</article></body></html>"
+                )
+                self._send(html.encode(), "text/html; charset=utf-8")
+
+            do_HEAD = do_GET
+
+            def _send(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", f'"{len(body)}"')
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _FakeSiteServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "FakeSite":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
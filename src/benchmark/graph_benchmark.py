@@ -0,0 +1,343 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Offline end-to-end benchmark of the research graph.
+
+Runs the full graph from ``coordinator`` through ``reporter`` against the fake
+chat model, search and crawl backends, and reports per-node overhead (node wall
+time minus time spent inside LLM and tool calls), total wall time, memory peak
+and event loop lag (how late a task sleeping on the loop is woken up, which is
+what blocking calls inside nodes do to every other stream of the server).
+
+Usage:
+    uv run python -m src.benchmark.graph_benchmark
+    uv run python -m src.benchmark.graph_benchmark --steps 1 20 --concurrency 1 200
+    uv run python -m src.benchmark.graph_benchmark --steps 3 --concurrency 50 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from unittest.mock import patch
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import CrawlerEngine, SearchEngine
+from src.graph.builder import build_graph_with_memory
+
+from .fakes import FakeChatModel
+
+logger = logging.getLogger(__name__)
+
+
+def _top_level_node(metadata: Optional[dict]) -> Optional[str]:
+    """Map a run to the top-level graph node it belongs to."""
+    namespace = (metadata or {}).get("langgraph_checkpoint_ns")
+    if not namespace:
+        return None
+    return namespace.split("|")[0].split(":")[0]
+
+
+@dataclass
+class NodeStats:
+    calls: int = 0
+    wall: float = 0.0
+    llm: float = 0.0
+    tool: float = 0.0
+
+    @property
+    def overhead(self) -> float:
+        return max(self.wall - self.llm - self.tool, 0.0)
+
+
+class NodeTimingCallback(BaseCallbackHandler):
+    """Collect wall time per top-level node and the time spent in LLM/tool calls."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.stats: dict[str, NodeStats] = defaultdict(NodeStats)
+        self._node_runs: dict[Any, tuple[str, str, float]] = {}
+        self._active_namespaces: set[str] = set()
+        self._child_runs: dict[Any, tuple[str, str, float]] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        namespace = (metadata or {}).get("langgraph_checkpoint_ns", "")
+        # Agents named after their node share its namespace, only count the node
+        if (
+            node
+            and kwargs.get("name") == node
+            and "|" not in namespace
+            and namespace not in self._active_namespaces
+        ):
+            self._active_namespaces.add(namespace)
+            self._node_runs[run_id] = (node, namespace, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        if run_id in self._node_runs:
+            node, namespace, started_at = self._node_runs.pop(run_id)
+            self._active_namespaces.discard(namespace)
+            self.stats[node].calls += 1
+            self.stats[node].wall += time.perf_counter() - started_at
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self.on_chain_end(None, run_id=run_id)
+
+    def _start_child(self, kind: str, run_id, metadata):
+        node = _top_level_node(metadata)
+        if node:
+            self._child_runs[run_id] = (node, kind, time.perf_counter())
+
+    def _end_child(self, run_id):
+        if run_id in self._child_runs:
+            node, kind, started_at = self._child_runs.pop(run_id)
+            setattr(
+                self.stats[node],
+                kind,
+                getattr(self.stats[node], kind) + time.perf_counter() - started_at,
+            )
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        self._start_child("llm", run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start_child("llm", run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end_child(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end_child(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        self._start_child("tool", run_id, metadata)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_child(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_child(run_id)
+
+
+class EventLoopLagMonitor:
+    """Sample how late the event loop wakes up a task sleeping ``interval``."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(loop.time() - expected, 0.0))
+
+    async def __aenter__(self) -> "EventLoopLagMonitor":
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(percentile / 100 * len(values)), len(values) - 1)]
+
+
+@dataclass
+class ScenarioResult:
+    steps: int
+    concurrency: int
+    wall_seconds: float
+    run_seconds: list[float]
+    errors: int
+    peak_rss_mb: float
+    peak_traced_mb: Optional[float]
+    loop_lag_seconds: list[float] = field(default_factory=list)
+    node_stats: dict[str, NodeStats] = field(default_factory=dict)
+
+
+@contextmanager
+def offline_backends(model: FakeChatModel):
+    """Route every LLM, search and crawl call of the graph to the fakes."""
+    with (
+        patch("src.graph.nodes.get_llm_for_agent", lambda agent: model),
+        patch("src.agents.agents.get_llm_for_agent", lambda agent: model),
+        patch("src.tools.search.SELECTED_SEARCH_ENGINE", SearchEngine.FAKE.value),
+        patch("src.graph.nodes.SELECTED_SEARCH_ENGINE", SearchEngine.FAKE.value),
+        patch("src.crawler.crawler.SELECTED_CRAWLER_ENGINE", CrawlerEngine.FAKE.value),
+    ):
+        yield
+
+
+async def _run_once(graph, steps: int, callback: NodeTimingCallback) -> float:
+    started_at = time.perf_counter()
+    async for _ in graph.astream(
+        {
+            "messages": [{"role": "user", "content": "benchmark question"}],
+            "auto_accepted_plan": True,
+            "enable_background_investigation": True,
+        },
+        config={
+            "thread_id": str(uuid.uuid4()),
+            "max_plan_iterations": 1,
+            "max_step_num": steps,
+            "max_search_results": 3,
+            "recursion_limit": 4 * steps + 20,
+            "callbacks": [callback],
+        },
+        stream_mode=["messages", "updates"],
+        subgraphs=True,
+    ):
+        pass
+    return time.perf_counter() - started_at
+
+
+async def run_scenario(
+    steps: int,
+    concurrency: int,
+    model_kwargs: dict,
+    trace_memory: bool = False,
+) -> ScenarioResult:
+    """Run ``concurrency`` research runs with ``steps``-step plans at once."""
+    graph = build_graph_with_memory()
+    callback = NodeTimingCallback()
+    model = FakeChatModel(plan_steps=steps, **model_kwargs)
+    if trace_memory:
+        tracemalloc.start()
+    with offline_backends(model):
+        async with EventLoopLagMonitor() as lag_monitor:
+            started_at = time.perf_counter()
+            results = await asyncio.gather(
+                *(_run_once(graph, steps, callback) for _ in range(concurrency)),
+                return_exceptions=True,
+            )
+            wall_seconds = time.perf_counter() - started_at
+    peak_traced_mb = None
+    if trace_memory:
+        peak_traced_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for error in errors[:3]:
+        logger.error(f"Benchmark run failed: {error!r}")
+    return ScenarioResult(
+        steps=steps,
+        concurrency=concurrency,
+        wall_seconds=wall_seconds,
+        run_seconds=[r for r in results if not isinstance(r, BaseException)],
+        errors=len(errors),
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        peak_traced_mb=peak_traced_mb,
+        loop_lag_seconds=lag_monitor.lags,
+        node_stats=dict(callback.stats),
+    )
+
+
+def _print_result(result: ScenarioResult) -> None:
+    runs = sorted(result.run_seconds) or [0.0]
+    traced = (
+        f" traced_peak={result.peak_traced_mb:.1f}MiB"
+        if result.peak_traced_mb is not None
+        else ""
+    )
+    print(
+        f"\nsteps={result.steps} concurrency={result.concurrency} "
+        f"wall={result.wall_seconds:.3f}s "
+        f"run_p50={statistics.median(runs):.3f}s run_max={runs[-1]:.3f}s "
+        f"errors={result.errors} peak_rss={result.peak_rss_mb:.1f}MiB{traced}"
+    )
+    lags = result.loop_lag_seconds
+    print(
+        f"  loop_lag p50={1000 * _percentile(lags, 50):.2f}ms "
+        f"p99={1000 * _percentile(lags, 99):.2f}ms "
+        f"max={1000 * max(lags, default=0.0):.2f}ms"
+    )
+    print(
+        f"  {'node':<24}{'calls':>7}{'wall ms/call':>14}"
+        f"{'llm+tool ms/call':>18}{'overhead ms/call':>18}"
+    )
+    for node, stats in sorted(result.node_stats.items()):
+        calls = stats.calls or 1
+        print(
+            f"  {node:<24}{stats.calls:>7}{1000 * stats.wall / calls:>14.2f}"
+            f"{1000 * (stats.llm + stats.tool) / calls:>18.2f}"
+            f"{1000 * stats.overhead / calls:>18.2f}"
+        )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    model_kwargs = {
+        "latency": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "response_tokens": args.response_tokens,
+        "tool_calls_per_step": args.tool_calls_per_step,
+    }
+    os.environ["FAKE_SEARCH_LATENCY"] = str(args.search_latency)
+    os.environ["FAKE_CRAWL_LATENCY"] = str(args.crawl_latency)
+    if args.steps or args.concurrency:
+        scenarios = [
+            (steps, concurrency)
+            for steps in args.steps or [3]
+            for concurrency in args.concurrency or [1]
+        ]
+    else:
+        # Plan size sweep for a single run, then a concurrency sweep
+        scenarios = [(steps, 1) for steps in (1, 5, 10, 20)] + [
+            (3, concurrency) for concurrency in (10, 50, 100, 200)
+        ]
+    for steps, concurrency in scenarios:
+        result = await run_scenario(
+            steps, concurrency, model_kwargs, trace_memory=args.trace_memory
+        )
+        _print_result(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline research graph benchmark")
+    parser.add_argument("--steps", type=int, nargs="*", help="Plan sizes to run")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="*", help="Numbers of concurrent runs"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="LLM latency (s)")
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=0.0, help="LLM token rate"
+    )
+    parser.add_argument("--response-tokens", type=int, default=50)
+    parser.add_argument("--tool-calls-per-step", type=int, default=2)
+    parser.add_argument("--search-latency", type=float, default=0.0)
+    parser.add_argument("--crawl-latency", type=float, default=0.0)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Report the Python heap peak per scenario (slows down the run)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Load generator for the streaming chat API.
+
+Opens concurrent `/api/chat/stream` SSE sessions and reports time to first
+event, time to first report token, events per second and server RSS growth.
+Plans are either auto accepted or, on an interrupt, resumed with
+``--interrupt-feedback``.
+
+To get reproducible capacity numbers, start the server with the offline fakes
+(``model_provider: fake`` in conf.yaml, ``SEARCH_API=fake`` and
+``CRAWLER_ENGINE=fake``), then run:
+
+    uv run server.py
+    uv run python -m src.benchmark.load_test --sessions 50 --server-pid <pid>
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionResult:
+    events: int = 0
+    interrupts: int = 0
+    first_event: Optional[float] = None
+    first_report_token: Optional[float] = None
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class RSSSampler:
+    """Sample the resident set size of the server process from /proc."""
+
+    pid: Optional[int]
+    interval: float = 0.5
+    samples: list[int] = field(default_factory=list)
+
+    def read(self) -> Optional[int]:
+        if not self.pid:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError as e:
+            logger.warning(f"Cannot read RSS of process {self.pid}: {e}")
+            self.pid = None
+        return None
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            if (rss := self.read()) is not None:
+                self.samples.append(rss)
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _parse_sse(lines: list[str]) -> tuple[Optional[str], dict]:
+    event_type, data = None, ""
+    for line in lines:
+        if line.startswith("event:"):
+            event_type = line.removeprefix("event:").strip()
+        elif line.startswith("data:"):
+            data += line.removeprefix("data:").strip()
+    return event_type, json.loads(data) if data else {}
+
+
+async def _stream_request(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    result: SessionResult,
+    started_at: float,
+) -> bool:
+    """Consume one SSE response, return whether the run stopped at an interrupt."""
+    interrupted = False
+    async with client.stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        lines: list[str] = []
+        async for line in response.aiter_lines():
+            if line:
+                lines.append(line)
+                continue
+            if not lines:
+                continue
+            event_type, data = _parse_sse(lines)
+            lines = []
+            now = time.perf_counter() - started_at
+            result.events += 1
+            if result.first_event is None:
+                result.first_event = now
+            if (
+                result.first_report_token is None
+                and event_type == "message_chunk"
+                and data.get("agent") == "reporter"
+                and data.get("content")
+            ):
+                result.first_report_token = now
+            if event_type == "interrupt":
+                result.interrupts += 1
+                interrupted = True
+    return interrupted
+
+
+async def run_session(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> SessionResult:
+    """Run one research conversation, resuming after plan interrupts if asked."""
+    result = SessionResult()
+    thread_id = str(uuid.uuid4())
+    url = f"{args.url.rstrip('/')}/api/chat/stream"
+    payload = {
+        "messages": [{"role": "user", "content": args.query}],
+        "thread_id": thread_id,
+        "max_plan_iterations": 1,
+        "max_step_num": args.max_step_num,
+        "max_search_results": 3,
+        "auto_accepted_plan": args.auto_accept,
+        "enable_background_investigation": True,
+    }
+    started_at = time.perf_counter()
+    try:
+        interrupted = await _stream_request(client, url, payload, result, started_at)
+        resumes = 0
+        while interrupted and args.interrupt_feedback and resumes < args.max_resumes:
+            resumes += 1
+            interrupted = await _stream_request(
+                client,
+                url,
+                {
+                    **payload,
+                    "messages": [],
+                    "auto_accepted_plan": False,
+                    "interrupt_feedback": args.interrupt_feedback,
+                },
+                result,
+                started_at,
+            )
+    except Exception as e:
+        result.error = repr(e)
+    result.duration = time.perf_counter() - started_at
+    return result
+
+
+def _percentiles(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    values = sorted(values)
+
+    def pick(q: float) -> float:
+        return values[min(int(q * len(values)), len(values) - 1)]
+
+    return (
+        f"p50={1000 * statistics.median(values):.0f}ms "
+        f"p90={1000 * pick(0.9):.0f}ms p99={1000 * pick(0.99):.0f}ms "
+        f"max={1000 * values[-1]:.0f}ms"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    sampler = RSSSampler(pid=args.server_pid)
+    rss_before = sampler.read()
+    stop = asyncio.Event()
+    sampler_task = asyncio.create_task(sampler.run(stop))
+
+    async def delayed_session(index: int) -> SessionResult:
+        if args.ramp_up:
+            await asyncio.sleep(args.ramp_up * index / args.sessions)
+        return await run_session(client, args)
+
+    limits = httpx.Limits(max_connections=args.sessions + 10)
+    timeout = httpx.Timeout(args.timeout, connect=10.0)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        started_at = time.perf_counter()
+        results = await asyncio.gather(
+            *(delayed_session(i) for i in range(args.sessions))
+        )
+        wall = time.perf_counter() - started_at
+    stop.set()
+    await sampler_task
+    rss_after = sampler.read()
+
+    completed = [r for r in results if r.error is None]
+    errors = [r for r in results if r.error is not None]
+    total_events = sum(r.events for r in results)
+    print(f"sessions={args.sessions} completed={len(completed)} errors={len(errors)}")
+    for error in {r.error for r in errors[:5]}:
+        print(f"  error: {error}")
+    print(f"wall={wall:.2f}s events={total_events} events/s={total_events / wall:.1f}")
+    print(
+        "time to first event:        "
+        + _percentiles([r.first_event for r in results if r.first_event is not None])
+    )
+    print(
+        "time to first report token: "
+        + _percentiles(
+            [r.first_report_token for r in results if r.first_report_token is not None]
+        )
+    )
+    print(
+        "session duration:           " + _percentiles([r.duration for r in completed])
+    )
+    print(f"interrupts={sum(r.interrupts for r in results)}")
+    if rss_before is not None and sampler.samples:
+        print(
+            f"server rss: before={rss_before / 1024 / 1024:.1f}MiB "
+            f"peak={max(sampler.samples) / 1024 / 1024:.1f}MiB "
+            f"after={(rss_after or 0) / 1024 / 1024:.1f}MiB "
+            f"growth={((rss_after or rss_before) - rss_before) / 1024 / 1024:+.1f}MiB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the chat stream API")
+    parser.add_argument("--url", default="http://localhost:8000", help="Server URL")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument(
+        "--ramp-up", type=float, default=0.0, help="Seconds to spread session starts"
+    )
+    parser.add_argument("--query", default="What is the market size of solar energy?")
+    parser.add_argument("--max-step-num", type=int, default=3)
+    parser.add_argument(
+        "--no-auto-accept",
+        action="store_false",
+        dest="auto_accept",
+        help="Let the server interrupt for plan review",
+    )
+    parser.add_argument(
+        "--interrupt-feedback",
+        default="accepted",
+        help="Feedback used to resume after a plan interrupt, empty to stop there",
+    )
+    parser.add_argument("--max-resumes", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument(
+        "--server-pid", type=int, help="Server process id, to sample its RSS"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
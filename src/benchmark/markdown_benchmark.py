@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure markdown conversion of large pages and its effect on the event loop.
+
+Articles of the extraction corpus are repeated up to each page size. For every
+size it reports the time of a full conversion (what the crawl tools did before),
+of a conversion that stops after the characters the tools return, and of the
+same conversion in the process pool. Then it converts several pages at once
+on the event loop and in the process pool, and reports the event loop lag
+(how late a task sleeping on the loop is woken up).
+
+Usage:
+    uv run python -m src.benchmark.markdown_benchmark
+    uv run python -m src.benchmark.markdown_benchmark --sizes 100000 5000000 --pages 8
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable
+
+from src.crawler import Article
+from src.crawler.lxml_extractor import LxmlExtractor
+from src.crawler.process_pool import (
+    arun_cpu_bound,
+    run_cpu_bound,
+    shutdown_process_pool,
+)
+
+from .extraction_benchmark import load_corpus
+
+
+def _page(size: int) -> Article:
+    articles = [LxmlExtractor().extract_article(html) for _, html, _ in load_corpus()]
+    html = "".join(article.html_content for article in articles)
+    return Article(title="Large page", html_content=html * (size // len(html) + 1))
+
+
+def _milliseconds(fn: Callable[[], object], repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return 1000 * (time.perf_counter() - started_at) / repeat
+
+
+async def _loop_lag(work: Callable[[], Awaitable]) -> tuple[float, float]:
+    """Return the wall time of ``work`` and the worst event loop lag during it."""
+    lags = []
+
+    async def tick():
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started_at - 0.01)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0.05)
+    started_at = time.perf_counter()
+    await work()
+    wall = time.perf_counter() - started_at
+    ticker.cancel()
+    return wall, max(lags)
+
+
+async def _concurrent(article: Article, pages: int) -> None:
+    async def on_loop():
+        for _ in range(pages):
+            article.to_markdown()
+            # Let the other streams of the loop run between pages
+            await asyncio.sleep(0)
+
+    async def in_pool():
+        await asyncio.gather(
+            *(
+                arun_cpu_bound(article.to_markdown, size=len(article.html_content))
+                for _ in range(pages)
+            )
+        )
+
+    for name, work in (("event loop", on_loop), ("process pool", in_pool)):
+        wall, lag = await _loop_lag(work)
+        print(f"{name:<16}{1000 * wall:>12.0f} ms{1000 * lag:>16.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown conversion benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000]
+    )
+    parser.add_argument("--max-chars", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    # Send every conversion to the pool, whatever its size
+    os.environ["CRAWL_PROCESS_POOL_MIN_CHARS"] = "0"
+
+    # Start the workers before measuring
+    run_cpu_bound(len, "", size=0)
+    print(f"{'page chars':<12}{'full':>12}{'first chars':>16}{'in pool':>12}")
+    for size in args.sizes:
+        article = _page(size)
+        full = _milliseconds(article.to_markdown, 1)
+        first = _milliseconds(
+            lambda: article.to_markdown(max_chars=args.max_chars), args.repeat
+        )
+        pooled = _milliseconds(
+            lambda: run_cpu_bound(article.to_markdown, True, args.max_chars, size=size),
+            args.repeat,
+        )
+        print(f"{size:<12}{full:>9.1f} ms{first:>13.1f} ms{pooled:>9.1f} ms")
+    print(f"\nfirst chars: conversion stops after {args.max_chars} characters")
+
+    print(f"\n{args.pages} full conversions of {args.sizes[-1]} chars")
+    print(f"{'':<16}{'wall':>15}{'max loop lag':>19}")
+    asyncio.run(_concurrent(_page(args.sizes[-1]), args.pages))
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
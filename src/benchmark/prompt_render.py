@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Measure prompt rendering with and without precompiled, memoized templates.
+
+Usage:
+    uv run python -m src.benchmark.prompt_render --renders 1000
+"""
+
+import argparse
+import dataclasses
+import os
+import time
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from src.config.configuration import Configuration
+from src.prompts import template as prompt_template
+
+_PROMPTS = ["planner", "researcher", "coder", "reporter", "coordinator"]
+_STATIC_PROMPTS = ["ppt/ppt_composer", "podcast/podcast_script_writer"]
+
+
+def _uncached_render(env: Environment, prompt_name: str, state: dict) -> str:
+    """Render the way templates were rendered before they were memoized."""
+    state_vars = {
+        "CURRENT_TIME": datetime.now().strftime("%a %b %d %Y %H:%M:%S %z"),
+        **state,
+        **dataclasses.asdict(Configuration()),
+    }
+    return env.get_template(f"{prompt_name}.md").render(**state_vars)
+
+
+def _microseconds_per_render(render, renders: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(renders):
+        render()
+    return 1_000_000 * (time.perf_counter() - started_at) / renders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt render benchmark")
+    parser.add_argument("--renders", type=int, default=1000)
+    args = parser.parse_args()
+
+    state = {"messages": [{"role": "user", "content": "q"}], "locale": "en-US"}
+    uncached_env = Environment(
+        loader=FileSystemLoader(os.path.dirname(prompt_template.__file__)),
+        autoescape=select_autoescape(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    started_at = time.perf_counter()
+    count = prompt_template.precompile_prompt_templates()
+    print(
+        f"precompiled {count} templates in "
+        f"{1000 * (time.perf_counter() - started_at):.1f} ms\n"
+    )
+    print(f"{'template':<32}{'uncached':>12}{'inline':>12}{'prefix_cache':>14}")
+    for prompt_name in _PROMPTS + _STATIC_PROMPTS:
+        static = prompt_name in _STATIC_PROMPTS
+        uncached = _microseconds_per_render(
+            lambda: (
+                uncached_env.get_template(f"{prompt_name}.md").render()
+                if static
+                else _uncached_render(uncached_env, prompt_name, state)
+            ),
+            args.renders,
+        )
+        timings = []
+        for layout in prompt_template.PromptLayout:
+            os.environ["PROMPT_LAYOUT"] = layout.value
+            timings.append(
+                _microseconds_per_render(
+                    lambda: (
+                        prompt_template.get_prompt_template(prompt_name)
+                        if static
+                        else prompt_template.apply_prompt_template(
+                            prompt_name, state, Configuration()
+                        )
+                    ),
+                    args.renders,
+                )
+            )
+        print(
+            f"{prompt_name:<32}{uncached:>9.1f} us{timings[0]:>9.1f} us"
+            f"{timings[1]:>11.1f} us"
+        )
+    print(f"\n{args.renders} renders per template, microseconds per render")
+
+
+if __name__ == "__main__":
+    main()
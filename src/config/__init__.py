@@ -1,7 +1,13 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .tools import SELECTED_SEARCH_ENGINE, SearchEngine
+from .tools import (
+    SELECTED_CRAWLER_ENGINE,
+    SELECTED_SEARCH_ENGINE,
+    CrawlerEngine,
+    ExtractorEngine,
+    SearchEngine,
+)
 from .questions import BUILT_IN_QUESTIONS
 
 from dotenv import load_dotenv
@@ -43,5 +49,8 @@ __all__ = [
     "TEAM_MEMBER_CONFIGURATIONS",
     "SELECTED_SEARCH_ENGINE",
     "SearchEngine",
+    "SELECTED_CRAWLER_ENGINE",
+    "CrawlerEngine",
+    "ExtractorEngine",
     "BUILT_IN_QUESTIONS",
 ]
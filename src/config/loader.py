@@ -13,22 +13,38 @@ def replace_env_vars(value: Any) -> Any:
     return value
 
 
+def process_value(value: Any) -> Any:
+    """Recursively replace environment variables in dicts, lists and strings."""
+    if isinstance(value, dict):
+        return process_dict(value)
+    if isinstance(value, list):
+        return [process_value(item) for item in value]
+    return replace_env_vars(value)
+
+
 def process_dict(config: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively process dictionary to replace environment variables."""
-    result = {}
-    for key, value in config.items():
-        if isinstance(value, dict):
-            result[key] = process_dict(value)
-        elif isinstance(value, str):
-            result[key] = replace_env_vars(value)
-        else:
-            result[key] = value
-    return result
+    return {key: process_value(value) for key, value in config.items()}
 
 
 _config_cache: Dict[str, Dict[str, Any]] = {}
 
 
+def read_yaml_config(file_path: str) -> Dict[str, Any]:
+    """Read and process YAML configuration file, bypassing the cache."""
+    if not os.path.exists(file_path):
+        return {}
+
+    with open(file_path, "r") as f:
+        config = yaml.safe_load(f)
+    return process_dict(config)
+
+
+def cache_yaml_config(file_path: str, config: Dict[str, Any]) -> None:
+    """Replace the cached configuration of a file, e.g. after a reload."""
+    _config_cache[file_path] = config
+
+
 def load_yaml_config(file_path: str) -> Dict[str, Any]:
     """Load and process YAML configuration file."""
     if not os.path.exists(file_path):
@@ -37,9 +53,6 @@ def load_yaml_config(file_path: str) -> Dict[str, Any]:
     if file_path in _config_cache:
         return _config_cache[file_path]
 
-    with open(file_path, "r") as f:
-        config = yaml.safe_load(f)
-    processed_config = process_dict(config)
-
+    processed_config = read_yaml_config(file_path)
     _config_cache[file_path] = processed_config
     return processed_config
@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Reload configuration without restarting the server.
+
+A reload is triggered by SIGHUP or, when watching is enabled, by a change of
+the configuration file's modification time. The reload callback builds the new
+objects and swaps them in; calls that already hold the old ones finish on them.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReloadEvent:
+    trigger: str
+    started_at: float
+    duration_seconds: float
+    error: Optional[str] = None
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+class ConfigReloader:
+    """Runs a reload callback on SIGHUP or when a file changes and records it."""
+
+    def __init__(self, path: str, reload: Callable[[], None], history: int = 20):
+        self.path = path
+        self._reload = reload
+        self._mtime = _mtime(path)
+        self._events: deque[ReloadEvent] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.failures = 0
+
+    def reload(self, trigger: str) -> ReloadEvent:
+        """
+        Run the reload callback, one reload at a time.
+
+        Args:
+            trigger: What caused the reload, e.g. ``signal`` or ``file``
+
+        Returns:
+            The reload event with its duration and error, if any
+        """
+        with self._lock:
+            self._mtime = _mtime(self.path)
+            started_at = time.time()
+            start = time.monotonic()
+            error = None
+            try:
+                self._reload()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            event = ReloadEvent(trigger, started_at, time.monotonic() - start, error)
+            self._events.append(event)
+            if error:
+                self.failures += 1
+                logger.error(
+                    f"Reloading {self.path} ({trigger}) failed, keeping the "
+                    f"previous configuration: {error}"
+                )
+            else:
+                self.reloads += 1
+                logger.info(
+                    f"Reloaded {self.path} ({trigger}) in "
+                    f"{event.duration_seconds * 1000:.1f}ms"
+                )
+            return event
+
+    def changed(self) -> bool:
+        """Whether the file was modified since it was last loaded."""
+        return _mtime(self.path) != self._mtime
+
+    async def watch(self, interval: float) -> None:
+        """Poll the file every ``interval`` seconds and reload it on changes."""
+        while True:
+            await asyncio.sleep(interval)
+            if self.changed():
+                await asyncio.to_thread(self.reload, "file")
+
+    def install_signal_handler(self) -> bool:
+        """Reload on SIGHUP, returns False where signal handlers are unsupported."""
+        if not hasattr(signal, "SIGHUP"):
+            return False
+        loop = asyncio.get_running_loop()
+        tasks: set[asyncio.Task] = set()
+
+        def on_signal() -> None:
+            # Keep a reference, the loop only holds weak references to tasks
+            task = loop.create_task(asyncio.to_thread(self.reload, "signal"))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            loop.add_signal_handler(signal.SIGHUP, on_signal)
+        except (NotImplementedError, RuntimeError):
+            return False
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "events": [asdict(event) for event in self._events],
+        }
@@ -13,7 +13,20 @@ class SearchEngine(enum.Enum):
     DUCKDUCKGO = "duckduckgo"
     BRAVE_SEARCH = "brave_search"
     ARXIV = "arxiv"
+    FAKE = "fake"
+
+
+class CrawlerEngine(enum.Enum):
+    JINA = "jina"
+    DIRECT = "direct"
+    FAKE = "fake"
+
+
+class ExtractorEngine(enum.Enum):
+    READABILITY = "readability"
+    LXML = "lxml"
 
 
 # Tool configuration
 SELECTED_SEARCH_ENGINE = os.getenv("SEARCH_API", SearchEngine.TAVILY.value)
+SELECTED_CRAWLER_ENGINE = os.getenv("CRAWLER_ENGINE", CrawlerEngine.JINA.value)
@@ -2,9 +2,19 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
+from .batch import CrawlResult, crawl_many
+from .cache import get_crawl_cache_stats
 from .crawler import Crawler
+from .process_pool import get_process_pool_stats, shutdown_process_pool
+from .scheduler import get_crawl_scheduler_stats
 
 __all__ = [
     "Article",
     "Crawler",
+    "CrawlResult",
+    "crawl_many",
+    "get_crawl_cache_stats",
+    "get_crawl_scheduler_stats",
+    "get_process_pool_stats",
+    "shutdown_process_pool",
 ]
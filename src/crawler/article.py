@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Optional
 from urllib.parse import urljoin
 
 from markdownify import markdownify as md
 
+from .markdown import html_to_markdown
+
 
 class Article:
     url: str
@@ -14,11 +17,17 @@ class Article:
         self.title = title
         self.html_content = html_content
 
-    def to_markdown(self, including_title: bool = True) -> str:
+    def to_markdown(
+        self, including_title: bool = True, max_chars: Optional[int] = None
+    ) -> str:
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        if max_chars is None:
+            markdown += md(self.html_content)
+        else:
+            # Only the start is used, don't convert the rest of the page
+            markdown += html_to_markdown(self.html_content, max_chars - len(markdown))
         return markdown
 
     def to_message(self) -> list[dict]:
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from .article import Article
+from .crawler import Crawler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CrawlResult:
+    url: str
+    latency_seconds: float
+    article: Optional[Article] = None
+    error: Optional[str] = None
+
+
+async def crawl_many(
+    urls: list[str], timeout: Optional[float] = None
+) -> AsyncIterator[CrawlResult]:
+    """
+    Crawl several urls concurrently and yield the results as they complete.
+
+    The crawls of one site are limited by the crawl scheduler.
+
+    Args:
+        urls: The urls to crawl, duplicates are crawled once
+        timeout: Seconds until a url is given up once the scheduler granted it a
+            slot, default ``CRAWL_TIMEOUT`` or 30
+
+    Yields:
+        One result per url, with the article or the error
+    """
+    if timeout is None:
+        timeout = float(os.getenv("CRAWL_TIMEOUT", "30"))
+    crawler = Crawler()
+
+    async def crawl(url: str) -> CrawlResult:
+        started_at = time.perf_counter()
+        try:
+            article = await crawler.acrawl(url, timeout)
+            return CrawlResult(url, time.perf_counter() - started_at, article)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout}s"
+        except Exception as e:
+            error = repr(e)
+        logger.warning(f"Failed to crawl {url}: {error}")
+        return CrawlResult(url, time.perf_counter() - started_at, error=error)
+
+    tasks = [asyncio.create_task(crawl(url)) for url in dict.fromkeys(urls)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # The consumer stopped early, don't leave crawls running
+        for task in tasks:
+            task.cancel()
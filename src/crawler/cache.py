@@ -0,0 +1,241 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Disk-backed cache of crawled articles with a freshness policy.
+
+Articles are cached by normalized URL for ``CRAWL_CACHE_TTL`` seconds. The
+``ETag`` and ``Last-Modified`` headers of pages fetched from their sites are
+kept with the article, so the crawler can revalidate an expired entry with a
+conditional ``HEAD`` request to the page instead of crawling it again. The
+total size is capped and the least recently used articles are evicted first.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from src.storage.disk_cache import DiskLRUCache
+
+from .article import Article
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Query parameters that track the visitor and never change the page
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that equivalent spellings share a cache entry.
+
+    The scheme and host are lowercased, default ports, fragments and tracking
+    parameters are dropped and the remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+@dataclass
+class CrawlCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Expired entries that the page confirmed unchanged
+    revalidated: int = 0
+    # Expired entries that had to be crawled again
+    expired: int = 0
+
+
+@dataclass
+class CachedArticle:
+    article: Article
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class CrawlCache:
+    """Crawled articles by normalized URL, with a TTL and revalidation."""
+
+    def __init__(
+        self,
+        store: DiskLRUCache,
+        ttl_seconds: float = 3600,
+        revalidate: bool = True,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.revalidate = revalidate
+        self.stats = CrawlCacheStats()
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def get(self, url: str) -> tuple[Optional[Article], Optional[CachedArticle]]:
+        """
+        Look up the article of a URL.
+
+        Args:
+            url: The crawled URL
+
+        Returns:
+            The article if it is fresh, else None and the expired entry (if any)
+            for ``revalidate_entry``
+        """
+        value = self.store.get(normalize_url(url))
+        if value is None:
+            self._count("misses")
+            return None, None
+        try:
+            data = json.loads(zlib.decompress(value))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping unreadable crawl cache entry of {url}: {e}")
+            self._count("misses")
+            return None, None
+        article = Article(title=data["title"], html_content=data["html_content"])
+        article.url = url
+        entry = CachedArticle(
+            article, data["fetched_at"], data.get("etag"), data.get("last_modified")
+        )
+        if time.time() - entry.fetched_at < self.ttl_seconds:
+            self._count("hits")
+            return article, None
+        return None, entry
+
+    def conditional_headers(self, entry: CachedArticle) -> dict[str, str]:
+        """
+        Return the headers of a request asking whether an expired entry changed.
+
+        Returns:
+            The headers, empty when the entry can't be revalidated
+        """
+        headers = {}
+        if self.revalidate and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if self.revalidate and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidate_entry(
+        self, url: str, entry: CachedArticle, response: Optional[httpx.Response]
+    ) -> Optional[Article]:
+        """
+        Keep an expired entry if the page answered that it is unchanged.
+
+        Args:
+            url: The crawled URL
+            entry: The expired entry returned by ``get``
+            response: The answer to a request with ``conditional_headers``, None
+                if there was none
+
+        Returns:
+            The cached article if the page is unchanged, else None
+        """
+        unchanged = response is not None and (
+            response.status_code == 304
+            or (
+                response.status_code == 200
+                and entry.etag is not None
+                and response.headers.get("etag") == entry.etag
+            )
+        )
+        if not unchanged:
+            self._count("expired")
+            return None
+        self._write(url, entry.article, time.time(), entry.etag, entry.last_modified)
+        self._count("revalidated")
+        return entry.article
+
+    def put(self, url: str, article: Article, **validators: Optional[str]) -> None:
+        """Cache the article of a URL, fetched just now."""
+        self._write(
+            url,
+            article,
+            time.time(),
+            validators.get("etag"),
+            validators.get("last_modified"),
+        )
+
+    def _write(
+        self,
+        url: str,
+        article: Article,
+        fetched_at: float,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        value = {
+            "title": article.title,
+            "html_content": article.html_content,
+            "fetched_at": fetched_at,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        try:
+            self.store.set(
+                normalize_url(url), zlib.compress(json.dumps(value).encode())
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache the article of {url}: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = CrawlCacheStats(**vars(self.stats))
+        lookups = stats.hits + stats.misses + stats.revalidated + stats.expired
+        return {
+            **vars(stats),
+            "hit_rate": (stats.hits + stats.revalidated) / lookups if lookups else 0.0,
+            "entries": len(self.store),
+            "size_bytes": self.store.size(),
+            "evictions": self.store.stats.evictions,
+        }
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the crawl cache configured by the environment, None when disabled."""
+    global _crawl_cache
+    if os.getenv("CRAWL_CACHE_ENABLED", "true").lower() not in ("true", "1", "yes"):
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            _crawl_cache = CrawlCache(
+                DiskLRUCache(
+                    os.getenv("CRAWL_CACHE_PATH", ".cache/crawl_cache.sqlite"),
+                    int(
+                        float(os.getenv("CRAWL_CACHE_MAX_SIZE_MB", "256")) * 1024 * 1024
+                    ),
+                ),
+                ttl_seconds=float(os.getenv("CRAWL_CACHE_TTL", "3600")),
+                revalidate=os.getenv("CRAWL_CACHE_REVALIDATE", "true").lower()
+                in ("true", "1", "yes"),
+            )
+        return _crawl_cache
+
+
+def get_crawl_cache_stats() -> dict[str, Any]:
+    """Return hit/miss counters and the size of the crawl cache."""
+    return _crawl_cache.get_stats() if _crawl_cache is not None else {}
@@ -1,14 +1,41 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
+import os
 import sys
+from typing import Optional
+
+import httpx
+
+from src.config.tools import SELECTED_CRAWLER_ENGINE, CrawlerEngine
 
 from .article import Article
+from .cache import CrawlCache, get_crawl_cache
+from .direct_client import DirectClient
+from .fake_crawler import FakeCrawler
 from .jina_client import JinaClient
+from .process_pool import run_cpu_bound
 from .readability_extractor import ReadabilityExtractor
+from .scheduler import get_crawl_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def _fallback_to_jina() -> bool:
+    return os.getenv("CRAWLER_FALLBACK_TO_JINA", "true").lower() in ("true", "1", "yes")
 
 
 class Crawler:
+    def __init__(self, extractor: Optional[str] = None):
+        """
+        Args:
+            extractor: The ``ExtractorEngine`` of the articles, default
+                ``CRAWL_EXTRACTOR`` or ``readability``
+        """
+        self.extractor = extractor
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
@@ -20,10 +47,141 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
+        #
+        # With CRAWLER_ENGINE=direct, pages are fetched from their sites,
+        # which saves the Jina hop, and Jina is only the fallback.
+        if SELECTED_CRAWLER_ENGINE == CrawlerEngine.FAKE.value:
+            # Offline crawler for benchmarks and load tests
+            return FakeCrawler().crawl(url)
+
+        cache = get_crawl_cache()
+        if cache is not None:
+            article = self._cached(cache, url)
+            if article is not None:
+                return article
+
+        with get_crawl_scheduler().slot(url):
+            article, validators = self._fetch(url)
+        if cache is not None:
+            cache.put(url, article, **validators)
+        return article
+
+    async def acrawl(self, url: str, timeout: Optional[float] = None) -> Article:
+        """
+        Crawl a url without blocking the event loop, see ``crawl``.
+
+        Args:
+            url: The url to crawl
+            timeout: Seconds the fetch may take once the scheduler granted it a
+                slot, the wait for the slot does not count
+
+        Raises:
+            asyncio.TimeoutError: The fetch took longer than ``timeout``
+        """
+        if SELECTED_CRAWLER_ENGINE == CrawlerEngine.FAKE.value:
+            return await FakeCrawler().acrawl(url)
+
+        cache = get_crawl_cache()
+        if cache is not None:
+            article = await self._acached(cache, url)
+            if article is not None:
+                return article
+
+        async with get_crawl_scheduler().aslot(url):
+            article, validators = await asyncio.wait_for(self._afetch(url), timeout)
+        if cache is not None:
+            # SQLite writes would block the event loop
+            await asyncio.to_thread(cache.put, url, article, **validators)
+        return article
+
+    @staticmethod
+    def _revalidates(headers: dict[str, str]) -> bool:
+        # Only pages fetched from their sites have validators, and the site is
+        # never contacted when Jina crawls it
+        return bool(headers) and SELECTED_CRAWLER_ENGINE == CrawlerEngine.DIRECT.value
+
+    def _cached(self, cache: CrawlCache, url: str) -> Optional[Article]:
+        """Return the cached article of a url if it is fresh or unchanged."""
+        article, expired = cache.get(url)
+        if article is not None or expired is None:
+            return article
+        headers = cache.conditional_headers(expired)
+        response = None
+        if self._revalidates(headers):
+            try:
+                # The request counts against the politeness limits of the site
+                with get_crawl_scheduler().slot(url):
+                    response = DirectClient().head(url, headers)
+            except (httpx.HTTPError, OSError, ValueError) as e:
+                logger.debug(f"Failed to revalidate {url}: {e}")
+        return cache.revalidate_entry(url, expired, response)
+
+    async def _acached(self, cache: CrawlCache, url: str) -> Optional[Article]:
+        """See ``_cached``, the SQLite lookups and writes run in a thread."""
+        article, expired = await asyncio.to_thread(cache.get, url)
+        if article is not None or expired is None:
+            return article
+        headers = cache.conditional_headers(expired)
+        response = None
+        if self._revalidates(headers):
+            try:
+                async with get_crawl_scheduler().aslot(url):
+                    response = await DirectClient().ahead(url, headers)
+            except (httpx.HTTPError, OSError, ValueError) as e:
+                logger.debug(f"Failed to revalidate {url}: {e}")
+        return await asyncio.to_thread(cache.revalidate_entry, url, expired, response)
+
+    def _fetch(self, url: str) -> tuple[Article, dict[str, Optional[str]]]:
+        """Fetch and extract the article of a url, with its cache validators."""
+        if SELECTED_CRAWLER_ENGINE == CrawlerEngine.DIRECT.value:
+            try:
+                page = DirectClient().fetch(url)
+                article = self._extract(url, page.html)
+                if article.html_content or not _fallback_to_jina():
+                    return article, page.validators
+                error = "no readable content"
+            except Exception as e:
+                if not _fallback_to_jina():
+                    raise
+                # Back the site off even though Jina crawls it now
+                get_crawl_scheduler().record_error(e)
+                error = repr(e)
+            logger.info(f"Direct crawl of {url} failed ({error}), using Jina")
+
         jina_client = JinaClient()
         html = jina_client.crawl(url, return_format="html")
+        # Pages crawled by Jina are not revalidated with their site
+        return self._extract(url, html), {}
+
+    async def _afetch(self, url: str) -> tuple[Article, dict[str, Optional[str]]]:
+        if SELECTED_CRAWLER_ENGINE == CrawlerEngine.DIRECT.value:
+            try:
+                page = await DirectClient().afetch(url)
+                # Readability extraction is CPU bound
+                article = await asyncio.to_thread(self._extract, url, page.html)
+                if article.html_content or not _fallback_to_jina():
+                    return article, page.validators
+                error = "no readable content"
+            except Exception as e:
+                if not _fallback_to_jina():
+                    raise
+                # Back the site off even though Jina crawls it now
+                get_crawl_scheduler().record_error(e)
+                error = repr(e)
+            logger.info(f"Direct crawl of {url} failed ({error}), using Jina")
+
+        html = await JinaClient().acrawl(url, return_format="html")
+        return await asyncio.to_thread(self._extract, url, html), {}
+
+    def _extract(self, url: str, html: str) -> Article:
+        max_chars = int(os.getenv("CRAWL_MAX_HTML_CHARS", "2000000"))
+        if len(html) > max_chars:
+            logger.info(f"Extracting the first {max_chars} characters of {url}")
+            html = html[:max_chars]
         extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        article = run_cpu_bound(
+            extractor.extract_article, html, self.extractor, size=len(html)
+        )
         article.url = url
         return article
 
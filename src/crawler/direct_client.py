@@ -0,0 +1,224 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Fetch the HTML of a page from its site, without the Jina reader.
+
+Downloads are streamed and cut off after ``CRAWL_MAX_BYTES`` bytes (default
+5 MB), and at most ``CRAWL_MAX_REDIRECTS`` redirects (default 5) are followed.
+Responses that are not HTML, like PDFs, are rejected so that the crawler can
+fall back to Jina, which converts them. The ``ETag`` and ``Last-Modified``
+headers of a page are returned with its HTML, so that the crawl cache can later
+ask the site whether the page changed.
+
+The URLs come from search results and page content, so the client only
+requests http(s) URLs of hosts that resolve to public addresses, before the
+first request and before every redirect. Loopback, private, link-local (like
+the cloud metadata address 169.254.169.254) and other reserved addresses are
+refused, unless ``CRAWL_ALLOW_PRIVATE_HOSTS`` is set, e.g. to crawl an intranet.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from src.utils.http_client import get_async_http_client, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# All crawled sites share one connection pool
+DIRECT_CRAWL_POOL = "direct-crawl"
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (compatible; DeerFlow; +https://github.com/bytedance/deer-flow)"
+)
+
+
+@dataclass
+class Page:
+    html: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def validators(self) -> dict[str, Optional[str]]:
+        return {"etag": self.etag, "last_modified": self.last_modified}
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _check_addresses(url: httpx.URL, addresses: list[tuple]) -> None:
+    for *_, sockaddr in addresses:
+        if not _is_public(sockaddr[0]):
+            raise ValueError(f"{url} resolves to the non-public address {sockaddr[0]}")
+
+
+class DirectClient:
+    def __init__(self):
+        self.max_bytes = int(os.getenv("CRAWL_MAX_BYTES", str(5 * 1024 * 1024)))
+        self.max_redirects = int(os.getenv("CRAWL_MAX_REDIRECTS", "5"))
+        self.allow_private_hosts = os.getenv(
+            "CRAWL_ALLOW_PRIVATE_HOSTS", "false"
+        ).lower() in ("true", "1", "yes")
+        self.headers = {
+            "User-Agent": os.getenv("CRAWL_USER_AGENT", _DEFAULT_USER_AGENT),
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+        }
+
+    def _check_scheme(self, url: httpx.URL) -> bool:
+        """Return whether the host of an http(s) url has to be resolved and checked."""
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"{url} is not an http(s) url")
+        return not self.allow_private_hosts
+
+    def _check_url(self, url: httpx.URL) -> None:
+        """Raise ValueError if a url may not be crawled, see the module docstring."""
+        if self._check_scheme(url):
+            _check_addresses(url, socket.getaddrinfo(url.host, url.port or 0))
+
+    async def _acheck_url(self, url: httpx.URL) -> None:
+        if self._check_scheme(url):
+            loop = asyncio.get_running_loop()
+            _check_addresses(url, await loop.getaddrinfo(url.host, url.port or 0))
+
+    def _send(
+        self, client: httpx.Client, request: httpx.Request, stream: bool = False
+    ) -> httpx.Response:
+        """Send a request, following at most ``max_redirects`` checked redirects."""
+        for _ in range(self.max_redirects + 1):
+            self._check_url(request.url)
+            response = client.send(request, stream=stream, follow_redirects=False)
+            if response.next_request is None:
+                return response
+            request = response.next_request
+            response.close()
+        raise httpx.TooManyRedirects(
+            f"More than {self.max_redirects} redirects", request=request
+        )
+
+    async def _asend(
+        self, client: httpx.AsyncClient, request: httpx.Request, stream: bool = False
+    ) -> httpx.Response:
+        for _ in range(self.max_redirects + 1):
+            await self._acheck_url(request.url)
+            response = await client.send(request, stream=stream, follow_redirects=False)
+            if response.next_request is None:
+                return response
+            request = response.next_request
+            await response.aclose()
+        raise httpx.TooManyRedirects(
+            f"More than {self.max_redirects} redirects", request=request
+        )
+
+    def _check(self, response: httpx.Response) -> None:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "text/html")
+        if content_type.split(";")[0].strip().lower() not in _HTML_TYPES:
+            raise ValueError(f"{response.url} is not HTML but {content_type}")
+
+    def _page(self, response: httpx.Response, body: bytearray) -> Page:
+        if len(body) > self.max_bytes:
+            logger.info(f"Cut off {response.url} after {self.max_bytes} bytes")
+            del body[self.max_bytes :]
+        return Page(
+            body.decode(response.encoding or "utf-8", errors="replace"),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
+    def crawl(self, url: str) -> str:
+        """Fetch the HTML of a page, see ``fetch``."""
+        return self.fetch(url).html
+
+    async def acrawl(self, url: str) -> str:
+        """Fetch the HTML of a page without blocking the event loop, see ``fetch``."""
+        return (await self.afetch(url)).html
+
+    def fetch(self, url: str) -> Page:
+        """
+        Fetch a page.
+
+        Args:
+            url: The page to fetch
+
+        Returns:
+            The HTML, cut off after ``max_bytes`` bytes, and the validators of
+            the page
+
+        Raises:
+            httpx.HTTPError: The request failed or there were too many redirects
+            ValueError: The page, or a redirect, is not a public http(s) url,
+                or the page is not HTML
+        """
+        client = get_http_client(url, pool=DIRECT_CRAWL_POOL)
+        request = client.build_request("GET", url, headers=self.headers)
+        response = self._send(client, request, stream=True)
+        try:
+            self._check(response)
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    break
+            return self._page(response, body)
+        finally:
+            response.close()
+
+    async def afetch(self, url: str) -> Page:
+        """Fetch a page without blocking the event loop, see ``fetch``."""
+        client = get_async_http_client(url, pool=DIRECT_CRAWL_POOL)
+        request = client.build_request("GET", url, headers=self.headers)
+        response = await self._asend(client, request, stream=True)
+        try:
+            self._check(response)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    break
+            return self._page(response, body)
+        finally:
+            await response.aclose()
+
+    def head(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """
+        Send a ``HEAD`` request to a page, e.g. a conditional one.
+
+        Args:
+            url: The page
+            headers: Headers in addition to those of every crawl
+
+        Returns:
+            The response, a 304 when a conditional page is unchanged
+
+        Raises:
+            httpx.HTTPError: The request failed, there were too many redirects
+                or the page answered an error
+            ValueError: The page, or a redirect, is not a public http(s) url
+        """
+        client = get_http_client(url, pool=DIRECT_CRAWL_POOL)
+        request = client.build_request("HEAD", url, headers={**self.headers, **headers})
+        response = self._send(client, request)
+        if response.is_error:
+            response.raise_for_status()
+        return response
+
+    async def ahead(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """Send a ``HEAD`` request without blocking the event loop, see ``head``."""
+        client = get_async_http_client(url, pool=DIRECT_CRAWL_POOL)
+        request = client.build_request("HEAD", url, headers={**self.headers, **headers})
+        response = await self._asend(client, request)
+        if response.is_error:
+            response.raise_for_status()
+        return response
@@ -0,0 +1,42 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+An offline crawler, the ``fake`` engine of ``CRAWLER_ENGINE``.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from src.utils.synthetic import env_float, synthetic_text
+
+from .article import Article
+
+
+class FakeCrawler:
+    """A crawler that returns a synthetic article after ``latency`` seconds."""
+
+    def __init__(self, latency: Optional[float] = None, paragraphs: int = 20):
+        self.latency = (
+            latency if latency is not None else env_float("FAKE_CRAWL_LATENCY", 0.0)
+        )
+        self.paragraphs = paragraphs
+
+    def _article(self, url: str) -> Article:
+        article = Article(
+            title=f"Article at {url}",
+            html_content="".join(
+                f"<p>{synthetic_text(60, i)}</p>" for i in range(self.paragraphs)
+            ),
+        )
+        article.url = url
+        return article
+
+    def crawl(self, url: str) -> Article:
+        time.sleep(self.latency)
+        return self._article(url)
+
+    async def acrawl(self, url: str) -> Article:
+        await asyncio.sleep(self.latency)
+        return self._article(url)
@@ -4,13 +4,15 @@
 import logging
 import os
 
-import requests
+from src.utils.http_client import get_async_http_client, get_http_client
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def _request(self, url: str, return_format: str) -> tuple[dict, dict]:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +23,22 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        return headers, {"url": url}
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        headers, data = self._request(url, return_format)
+        response = get_http_client(JINA_READER_URL).post(
+            JINA_READER_URL, headers=headers, json=data
+        )
+        # Rate limited and failed crawls must not be extracted as articles
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        headers, data = self._request(url, return_format)
+        response = await get_async_http_client(JINA_READER_URL).post(
+            JINA_READER_URL, headers=headers, json=data
+        )
+        # Rate limited and failed crawls must not be extracted as articles
+        response.raise_for_status()
         return response.text
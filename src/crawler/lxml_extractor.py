@@ -0,0 +1,277 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+In-process article extraction with lxml.
+
+Follows the content scoring of Readability.js: every paragraph scores the
+blocks above it by its length and commas, class and id names that look like
+boilerplate count against a block, scores are discounted by the share of
+link text, and the best block plus its related siblings is the article.
+Unlike ``simple_json_from_html_string(use_readability=True)`` it doesn't start
+a Node.js process per page.
+"""
+
+import re
+
+import lxml.html
+from lxml.etree import ParserError
+
+from .article import Article
+
+_UNLIKELY = re.compile(
+    r"banner|breadcrumb|combx|comment|community|cookie|disqus|extra|footer|gdpr"
+    r"|header|legends|menu|modal|newsletter|pager|pagination|popup|promo|related"
+    r"|remark|replies|rss|share|shoutbox|sidebar|skyscraper|social|sponsor"
+    r"|subscribe|supplemental|ad-break|agegate|navbox|infobox|toc",
+    re.I,
+)
+_MAYBE = re.compile(r"and|article|body|column|content|main|shadow", re.I)
+_POSITIVE = re.compile(
+    r"article|body|content|entry|hentry|h-entry|main|page|post|text|blog|story",
+    re.I,
+)
+_NEGATIVE = re.compile(
+    r"-ad-|hidden|^hid$|banner|combx|comment|com-|contact|foot|footnote|gdpr"
+    r"|masthead|media|meta|outbrain|promo|related|scroll|share|shoutbox|sidebar"
+    r"|skyscraper|sponsor|shopping|tags|tool|widget",
+    re.I,
+)
+_REMOVED_TAGS = {
+    "aside",
+    "button",
+    "canvas",
+    "embed",
+    "footer",
+    "form",
+    "iframe",
+    "input",
+    "link",
+    "meta",
+    "nav",
+    "noscript",
+    "object",
+    "script",
+    "select",
+    "style",
+    "svg",
+    "textarea",
+}
+_BLOCK_TAGS = {
+    "article",
+    "blockquote",
+    "div",
+    "dl",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "ul",
+}
+_TAG_WEIGHTS = {
+    "div": 5,
+    "article": 5,
+    "section": 5,
+    "pre": 3,
+    "td": 3,
+    "blockquote": 3,
+    "address": -3,
+    "ol": -3,
+    "ul": -3,
+    "dl": -3,
+    "dd": -3,
+    "dt": -3,
+    "li": -3,
+    "h1": -5,
+    "h2": -5,
+    "h3": -5,
+    "h4": -5,
+    "h5": -5,
+    "h6": -5,
+    "th": -5,
+}
+_KEPT_ATTRIBUTES = {"href", "src", "alt", "title", "colspan", "rowspan"}
+# "Title | Site", "Title - Site" and "标题_频道_网站"
+_TITLE_SEPARATOR = re.compile(r"\s[|\-–—»:]{1,2}\s|_")
+# A paragraph adds its score to its parent, half to its grandparent and less above
+_LEVEL_DIVIDERS = (1, 2, 6, 9, 12)
+# Commas of Latin and CJK text
+_COMMAS = re.compile(r"[,，、]")
+
+
+def _class_weight(element: lxml.html.HtmlElement) -> int:
+    weight = 0
+    for name in (element.get("class"), element.get("id")):
+        if name:
+            if _NEGATIVE.search(name):
+                weight -= 25
+            if _POSITIVE.search(name):
+                weight += 25
+    return weight
+
+
+def _link_density(element: lxml.html.HtmlElement, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_length = sum(len(link.text_content()) for link in element.iter("a"))
+    return min(link_length / text_length, 1.0)
+
+
+def _is_hidden(element: lxml.html.HtmlElement) -> bool:
+    style = element.get("style", "").replace(" ", "").lower()
+    return (
+        element.get("hidden") is not None
+        or element.get("aria-hidden") == "true"
+        or "display:none" in style
+        or "visibility:hidden" in style
+    )
+
+
+class LxmlExtractor:
+    def extract_article(self, html: str) -> Article:
+        try:
+            # Bytes, so that pages with an XML encoding declaration parse too
+            document = lxml.html.document_fromstring(
+                html.encode("utf-8"),
+                parser=lxml.html.HTMLParser(encoding="utf-8", remove_comments=True),
+            )
+        except ParserError:
+            return Article(title="", html_content="")
+        title = self._title(document)
+        body = document.find("body")
+        if body is None:
+            body = document
+        self._prune(body)
+        content = self._content(body)
+        self._clean(content)
+        return Article(
+            title=title,
+            html_content=lxml.html.tostring(content, encoding="unicode"),
+        )
+
+    def _title(self, document: lxml.html.HtmlElement) -> str:
+        for meta in document.iter("meta"):
+            if meta.get("property") == "og:title" and meta.get("content"):
+                return meta.get("content").strip()
+        title = document.find(".//title")
+        if title is not None and title.text_content().strip():
+            parts = _TITLE_SEPARATOR.split(title.text_content().strip())
+            # Drop the site name, which is the shorter part
+            return max(parts, key=lambda part: len(part.split()))
+        heading = document.find(".//h1")
+        return heading.text_content().strip() if heading is not None else ""
+
+    def _prune(self, element: lxml.html.HtmlElement) -> None:
+        """Remove scripts, hidden elements and blocks that look like boilerplate."""
+        for child in list(element):
+            if not isinstance(child.tag, str):
+                child.drop_tree()
+                continue
+            names = f"{child.get('class', '')} {child.get('id', '')}"
+            if (
+                child.tag in _REMOVED_TAGS
+                or _is_hidden(child)
+                or (
+                    child.tag not in ("article", "main")
+                    and _UNLIKELY.search(names)
+                    and not _MAYBE.search(names)
+                )
+            ):
+                child.drop_tree()
+            else:
+                self._prune(child)
+
+    def _content(self, body: lxml.html.HtmlElement) -> lxml.html.HtmlElement:
+        """Score the blocks and return the best one with its related siblings."""
+        scores: dict[lxml.html.HtmlElement, float] = {}
+        for element in body.iter("p", "pre", "td", "div", "section"):
+            if element.tag in ("div", "section") and any(
+                child.tag in _BLOCK_TAGS for child in element
+            ):
+                continue
+            text = element.text_content().strip()
+            if len(text) < 25:
+                continue
+            score = 1 + len(_COMMAS.findall(text)) + min(len(text) // 100, 3)
+            ancestor = element.getparent()
+            for level in range(5):
+                if ancestor is None:
+                    break
+                if ancestor not in scores:
+                    scores[ancestor] = _TAG_WEIGHTS.get(
+                        ancestor.tag, 0
+                    ) + _class_weight(ancestor)
+                scores[ancestor] += score / _LEVEL_DIVIDERS[level]
+                ancestor = ancestor.getparent()
+        if not scores:
+            return body
+
+        for candidate in scores:
+            scores[candidate] *= 1 - _link_density(
+                candidate, len(candidate.text_content())
+            )
+        top = max(scores, key=scores.get)
+        parent = top.getparent()
+        if parent is None:
+            return top
+
+        threshold = max(10.0, scores[top] * 0.2)
+        content = lxml.html.Element("div")
+        for sibling in list(parent):
+            if sibling is top:
+                content.append(sibling)
+                continue
+            score = scores.get(sibling, 0.0)
+            if sibling.get("class") and sibling.get("class") == top.get("class"):
+                score += scores[top] * 0.2
+            if score >= threshold:
+                content.append(sibling)
+            elif sibling.tag == "p":
+                text = sibling.text_content().strip()
+                density = _link_density(sibling, len(text))
+                if (len(text) > 80 and density < 0.25) or (
+                    0 < len(text) <= 80 and density == 0 and ". " in f"{text} "
+                ):
+                    content.append(sibling)
+        return content
+
+    def _clean(self, content: lxml.html.HtmlElement) -> None:
+        """Remove link lists, empty blocks and presentational attributes."""
+        for element in list(content.iter("h1")):
+            # The title is returned separately
+            element.drop_tree()
+        for element in reversed(
+            list(content.iter("div", "section", "ul", "ol", "table"))
+        ):
+            if element is content:
+                continue
+            text = element.text_content().strip()
+            if len(_COMMAS.findall(text)) >= 10:
+                continue
+            weight = _class_weight(element)
+            density = _link_density(element, len(text))
+            paragraphs = len(element.findall(".//p"))
+            images = len(element.findall(".//img"))
+            if (
+                weight < 0
+                or (images > 1 and paragraphs / images < 0.5)
+                or (len(text) < 25 and images == 0 and element.find(".//pre") is None)
+                or (weight < 25 and density > 0.2 and element.tag != "table")
+                or density > 0.5
+            ):
+                element.drop_tree()
+        for element in list(content.iter("p")):
+            if not element.text_content().strip() and element.find(".//img") is None:
+                element.drop_tree()
+        for element in content.iter():
+            for attribute in list(element.attrib):
+                if attribute not in _KEPT_ATTRIBUTES:
+                    del element.attrib[attribute]
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+HTML to markdown conversion that can stop early.
+
+The HTML is split into its top-level blocks with lxml, which is cheap compared
+to markdownify, and the blocks are converted in batches of doubling size. With
+``max_chars`` the conversion stops once enough markdown was produced, so the
+cost depends on the text that is used instead of the size of the page.
+"""
+
+import html
+from typing import Iterator, Optional
+
+import lxml.html
+from lxml.etree import ParserError
+from markdownify import markdownify as md
+
+# Blocks that only group other blocks, their children are split further
+_CONTAINER_TAGS = {"article", "body", "div", "header", "main", "section"}
+_BLOCK_TAGS = _CONTAINER_TAGS | {
+    "address",
+    "blockquote",
+    "details",
+    "dl",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "ol",
+    "p",
+    "pre",
+    "table",
+    "ul",
+}
+
+
+def _blocks(element: lxml.html.HtmlElement) -> Iterator[str]:
+    """Yield the HTML of the blocks of an element, runs of inline content as one."""
+    inline: list[str] = []
+
+    def flush() -> Iterator[str]:
+        text = "".join(inline).strip()
+        inline.clear()
+        if text:
+            yield f"<div>{text}</div>"
+
+    if element.text:
+        inline.append(html.escape(element.text))
+    for child in element:
+        if isinstance(child.tag, str) and child.tag in _BLOCK_TAGS:
+            yield from flush()
+            if child.tag in _CONTAINER_TAGS:
+                yield from _blocks(child)
+            else:
+                yield lxml.html.tostring(child, encoding="unicode", with_tail=False)
+        elif isinstance(child.tag, str):
+            inline.append(
+                lxml.html.tostring(child, encoding="unicode", with_tail=False)
+            )
+        if child.tail:
+            inline.append(html.escape(child.tail))
+    yield from flush()
+
+
+def html_to_markdown(content: Optional[str], max_chars: Optional[int] = None) -> str:
+    """
+    Convert HTML to markdown.
+
+    Args:
+        content: The HTML
+        max_chars: Stop converting once this many characters were produced,
+            the result can be longer. None converts everything.
+
+    Returns:
+        The markdown
+    """
+    if not content or not content.strip():
+        return ""
+    if max_chars is None:
+        return md(content)
+    try:
+        root = lxml.html.fragment_fromstring(content, create_parent="div")
+    except ParserError:
+        return md(content)
+    parts: list[str] = []
+    length = 0
+    batch: list[str] = []
+    batch_size = 1
+    for block in _blocks(root):
+        batch.append(block)
+        if len(batch) < batch_size:
+            continue
+        markdown = md("".join(batch)).strip()
+        batch.clear()
+        batch_size *= 2
+        if markdown:
+            parts.append(markdown)
+            length += len(markdown) + 2
+        if length >= max_chars:
+            return "\n\n".join(parts)
+    if batch:
+        markdown = md("".join(batch)).strip()
+        if markdown:
+            parts.append(markdown)
+    return "\n\n".join(parts)
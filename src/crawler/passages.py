@@ -0,0 +1,195 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Selection of the passages of a crawled page that are relevant to a query.
+
+The markdown of the page is split into passages of about ``passage_chars``
+characters along its paragraphs, and the passages are ranked with BM25 against
+the query. Document frequencies are counted over the passages of the page
+itself, so words that are everywhere on the page weigh little. CJK text is
+scored by character bigrams, as it has no spaces between words.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Optional
+
+from .article import Article
+
+# Run metadata with the task that tools crawl pages for
+CRAWL_QUERY_METADATA_KEY = "crawl_query"
+
+_WORD = re.compile(r"[぀-ヿ㐀-鿿가-힯]+|[^\W぀-ヿ㐀-鿿가-힯]+")
+_CJK = re.compile(r"[぀-ヿ㐀-鿿가-힯]")
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s*")
+# Marks passages that were not adjacent on the page
+_GAP = "\n\n...\n\n"
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def _tokens(text: str) -> list[str]:
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if _CJK.match(word):
+            tokens.extend(word[i : i + 2] for i in range(max(1, len(word) - 1)))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _split_long(paragraph: str, passage_chars: int) -> list[str]:
+    """Split a paragraph that is too long into passages at sentence ends."""
+    passages = []
+    current = ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        while len(sentence) > passage_chars:
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(sentence[:passage_chars])
+            sentence = sentence[passage_chars:]
+        if current and len(current) + len(sentence) + 1 > passage_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current.strip():
+        passages.append(current)
+    return passages
+
+
+def split_passages(markdown: str, passage_chars: int = 400) -> list[str]:
+    """
+    Split markdown into passages, merging short paragraphs.
+
+    Args:
+        markdown: The markdown of a page
+        passage_chars: The largest passage, in characters
+
+    Returns:
+        The passages, in the order of the page
+    """
+    passages = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", markdown):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) > passage_chars:
+            if current:
+                passages.append(current)
+                current = ""
+            passages.extend(_split_long(paragraph, passage_chars))
+        elif current and len(current) + len(paragraph) + 2 > passage_chars:
+            passages.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def rank_passages(passages: list[str], query: str) -> list[float]:
+    """Return the BM25 score of every passage for the query."""
+    documents = [Counter(_tokens(passage)) for passage in passages]
+    if not documents:
+        return []
+    average_length = sum(sum(d.values()) for d in documents) / len(documents) or 1
+    document_frequency = Counter(token for d in documents for token in d)
+    scores = []
+    for document in documents:
+        length = sum(document.values())
+        score = 0.0
+        for token in set(_tokens(query)):
+            frequency = document.get(token, 0)
+            if not frequency:
+                continue
+            df = document_frequency[token]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            score += idf * (
+                frequency
+                * (_K1 + 1)
+                / (frequency + _K1 * (1 - _B + _B * length / average_length))
+            )
+        scores.append(score)
+    return scores
+
+
+def select_passages(
+    markdown: str, query: Optional[str], max_chars: int, passage_chars: int = 400
+) -> str:
+    """
+    Return the passages of markdown that are the most relevant to a query.
+
+    Passages are taken by descending score while they fit in ``max_chars`` and
+    are returned in the order of the page. Without a query, or if no passage
+    matches it, the start of the markdown is returned.
+
+    Args:
+        markdown: The markdown of a page
+        query: What the page is read for
+        max_chars: The longest result, in characters
+        passage_chars: The largest passage, in characters
+
+    Returns:
+        The selected passages, non-adjacent ones separated by "..."
+    """
+    if not query or len(markdown) <= max_chars:
+        return markdown[:max_chars]
+    passages = split_passages(markdown, min(passage_chars, max_chars))
+    scores = rank_passages(passages, query)
+    selected = set()
+    length = 0
+    for index in sorted(range(len(passages)), key=lambda i: (-scores[i], i)):
+        if scores[index] <= 0:
+            break
+        if length + len(passages[index]) + len(_GAP) > max_chars:
+            continue
+        selected.add(index)
+        length += len(passages[index]) + len(_GAP)
+    if not selected:
+        return markdown[:max_chars]
+    result = ""
+    previous = None
+    for index in sorted(selected):
+        if result:
+            result += "\n\n" if index == previous + 1 else _GAP
+        result += passages[index]
+        previous = index
+    return result
+
+
+def relevant_content(
+    article: Article,
+    query: Optional[str],
+    max_chars: int,
+    passage_chars: int = 400,
+    scan_chars: int = 100_000,
+) -> str:
+    """
+    Return the markdown of an article, reduced to the passages relevant to a query.
+
+    The title of the article is always kept.
+
+    Args:
+        article: A crawled article
+        query: What the article is read for, the start of the article is
+            returned without it
+        max_chars: The longest result, in characters
+        passage_chars: The largest passage, in characters
+        scan_chars: Characters of the article's markdown that are ranked
+
+    Returns:
+        At most ``max_chars`` characters of markdown
+    """
+    if not query:
+        return article.to_markdown(max_chars=max_chars)[:max_chars]
+    title = f"# {article.title}\n\n"
+    markdown = article.to_markdown(including_title=False, max_chars=scan_chars)
+    passages = select_passages(markdown, query, max_chars - len(title), passage_chars)
+    return (title + passages)[:max_chars]
@@ -0,0 +1,138 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+A bounded process pool for the CPU bound steps of crawling.
+
+Article extraction and markdown conversion of large pages run in worker
+processes, so that they don't hold the GIL of the server while streams are
+served. Small inputs are processed inline, where the pickling round trip
+would cost more than it saves.
+
+Settings are read from the environment:
+    CRAWL_PROCESS_POOL_SIZE: Worker processes, default min(4, CPUs), 0 disables
+    CRAWL_PROCESS_POOL_MIN_CHARS: Smallest input sent to the pool, default 100000
+    CRAWL_PROCESS_POOL_MAX_PENDING: Queued and running tasks before callers wait,
+        default twice the workers
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ProcessPoolStats:
+    submitted: int = 0
+    inline: int = 0
+    failed: int = 0
+    pending: int = 0
+    # Seconds from submitting a task until its result is back
+    total_seconds: float = 0.0
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_stats = ProcessPoolStats()
+_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return int(os.getenv("CRAWL_PROCESS_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+
+
+def _get_pool() -> tuple[Optional[ProcessPoolExecutor], Optional[threading.Semaphore]]:
+    global _pool, _slots
+    with _lock:
+        if _pool is None and _pool_size() > 0:
+            size = _pool_size()
+            # Forking a server with running threads can deadlock the workers
+            _pool = ProcessPoolExecutor(
+                max_workers=size, mp_context=multiprocessing.get_context("spawn")
+            )
+            _slots = threading.BoundedSemaphore(
+                int(os.getenv("CRAWL_PROCESS_POOL_MAX_PENDING", str(2 * size)))
+            )
+        return _pool, _slots
+
+
+def run_cpu_bound(fn: Callable[..., T], *args: Any, size: int) -> T:
+    """
+    Run a picklable function in the process pool, or inline for small inputs.
+
+    Blocks until the result is available, and while the pool has
+    ``CRAWL_PROCESS_POOL_MAX_PENDING`` tasks.
+
+    Args:
+        fn: A module level function or a method of a picklable object
+        args: The arguments of ``fn``
+        size: Size of the input, in characters
+
+    Returns:
+        The result of ``fn(*args)``
+    """
+    global _pool
+    pool, slots = _get_pool()
+    if pool is None or size < int(os.getenv("CRAWL_PROCESS_POOL_MIN_CHARS", "100000")):
+        with _lock:
+            _stats.inline += 1
+        return fn(*args)
+
+    started_at = time.perf_counter()
+    with slots:
+        with _lock:
+            _stats.submitted += 1
+            _stats.pending += 1
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died, e.g. out of memory, start a new pool for the next task
+            with _lock:
+                _stats.failed += 1
+                if _pool is pool:
+                    _pool = None
+            pool.shutdown(wait=False)
+            raise
+        finally:
+            with _lock:
+                _stats.pending -= 1
+                _stats.total_seconds += time.perf_counter() - started_at
+
+
+async def arun_cpu_bound(fn: Callable[..., T], *args: Any, size: int) -> T:
+    """Run ``run_cpu_bound`` without blocking the event loop."""
+    return await asyncio.to_thread(run_cpu_bound, fn, *args, size=size)
+
+
+def get_process_pool_stats() -> dict[str, Any]:
+    """Return task counts and the average round trip of the process pool."""
+    with _lock:
+        stats = ProcessPoolStats(**vars(_stats))
+        workers = _pool_size() if _pool is not None else 0
+    return {
+        **vars(stats),
+        "workers": workers,
+        "average_ms": (
+            1000 * stats.total_seconds / stats.submitted if stats.submitted else 0.0
+        ),
+    }
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes."""
+    global _pool, _slots
+    with _lock:
+        pool, _pool, _slots = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
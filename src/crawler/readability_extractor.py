@@ -1,13 +1,38 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import os
+from typing import Optional
+
 from readabilipy import simple_json_from_html_string
 
+from src.config.tools import ExtractorEngine
+
 from .article import Article
+from .lxml_extractor import LxmlExtractor
 
 
 class ReadabilityExtractor:
-    def extract_article(self, html: str) -> Article:
+    def extract_article(self, html: str, engine: Optional[str] = None) -> Article:
+        """
+        Extract the article of an HTML page.
+
+        Args:
+            html: The page
+            engine: ``readability`` runs Readability.js in a Node.js process,
+                ``lxml`` scores the content in process, default
+                ``CRAWL_EXTRACTOR`` or ``readability``
+
+        Returns:
+            The title and the HTML of the article
+        """
+        engine = engine or os.getenv(
+            "CRAWL_EXTRACTOR", ExtractorEngine.READABILITY.value
+        )
+        if engine == ExtractorEngine.LXML.value:
+            return LxmlExtractor().extract_article(html)
+        if engine != ExtractorEngine.READABILITY.value:
+            raise ValueError(f"Unsupported extractor engine: {engine}")
         article = simple_json_from_html_string(html, use_readability=True)
         return Article(
             title=article.get("title"),
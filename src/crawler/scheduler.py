@@ -0,0 +1,324 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Politeness scheduling of the crawls of all research runs.
+
+Every crawl that goes to the network takes a slot of the ``CrawlScheduler``
+first. A slot is granted when fewer than ``max_concurrency`` crawls run in
+total and fewer than ``max_per_domain`` on the domain of the url, and at least
+``min_delay`` seconds after the last crawl of the domain started. Waiting crawls
+are served in the order of a fair queue: the n-th crawl of a research run (its
+``thread_id``) goes before the n+1-th crawl of any other run, so a run crawling
+many pages does not delay the pages of the others.
+
+A 429 or 503 response backs the domain off, for its ``Retry-After`` or for a
+delay that doubles with every throttled response up to ``max_backoff`` and
+halves with every successful crawl. A throttled response of the Jina reader
+pauses every crawl, as its rate limit is shared by all domains.
+
+Settings are read from the environment:
+    CRAWL_MAX_CONCURRENCY: Concurrent crawls, default 8
+    CRAWL_MAX_CONCURRENCY_PER_HOST: Concurrent crawls of one domain, default 2
+    CRAWL_MIN_DELAY_PER_HOST: Seconds between the crawls of one domain,
+        default 0.5
+    CRAWL_MAX_BACKOFF: Longest backoff after throttled responses, default 60
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from langchain_core.runnables import ensure_config
+
+from .jina_client import JINA_READER_URL
+
+logger = logging.getLogger(__name__)
+
+_THROTTLED_STATUS_CODES = (429, 503)
+# The backoff of the first throttled response without a Retry-After
+_INITIAL_BACKOFF_SECONDS = 1.0
+# Idle domains whose stats are kept
+_MAX_DOMAINS = 1000
+
+
+@dataclass
+class DomainState:
+    active: int = 0
+    queued: int = 0
+    # Earliest start of the next crawl
+    ready_at: float = 0.0
+    backoff_seconds: float = 0.0
+    throttled_at: float = 0.0
+    requests: int = 0
+    throttled: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+@dataclass
+class _Ticket:
+    domain: str
+    # Position of the crawl in the fair queue, lower goes first
+    rank: tuple[int, int]
+    granted_at: float = 0.0
+
+
+def _domain(url: str) -> str:
+    return (urlsplit(url).hostname or url).lower()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        # Missing, or an HTTP date
+        return None
+
+
+class CrawlScheduler:
+    """Global and per-domain limits of the crawls of every research run."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_per_domain: int = 2,
+        min_delay: float = 0.5,
+        max_backoff: float = 60.0,
+        poll_interval: float = 0.05,
+    ):
+        if max_concurrency < 1 or max_per_domain < 1:
+            raise ValueError(
+                f"Invalid crawl concurrency: {max_concurrency} in total, "
+                f"{max_per_domain} per domain"
+            )
+        self.max_concurrency = max_concurrency
+        self.max_per_domain = max_per_domain
+        self.min_delay = min_delay
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self._active = 0
+        # Every crawl waits until then after the Jina reader throttled one
+        self._paused_until = 0.0
+        self._domains: OrderedDict[str, DomainState] = OrderedDict()
+        self._waiting: list[_Ticket] = []
+        # Next rank of every run, and the rank of the last granted crawl
+        self._run_ranks: dict[str, int] = {}
+        self._virtual_time = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _state(self, domain: str) -> DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = DomainState()
+            # Forget the least recently crawled domains that are idle
+            for name, idle in list(self._domains.items()):
+                if len(self._domains) <= _MAX_DOMAINS:
+                    break
+                if name != domain and not idle.active and not idle.queued:
+                    del self._domains[name]
+        self._domains.move_to_end(domain)
+        return state
+
+    def _enqueue(self, url: str) -> _Ticket:
+        run = ensure_config().get("configurable", {}).get("thread_id") or ""
+        with self._lock:
+            rank = max(self._run_ranks.get(run, 0), self._virtual_time)
+            self._run_ranks[run] = rank + 1
+            ticket = _Ticket(_domain(url), (rank, next(self._sequence)))
+            self._waiting.append(ticket)
+            self._state(ticket.domain).queued += 1
+        return ticket
+
+    def _ready_at(self, ticket: _Ticket) -> Optional[float]:
+        """Return when the ticket can start, None while a limit is reached."""
+        state = self._domains[ticket.domain]
+        if self._active >= self.max_concurrency or state.active >= self.max_per_domain:
+            return None
+        return max(state.ready_at, self._paused_until)
+
+    def _try_acquire(self, ticket: _Ticket) -> float:
+        """Take a slot if the ticket is the first that can start, else return the delay."""
+        with self._lock:
+            now = time.monotonic()
+            ready_at = self._ready_at(ticket)
+            if ready_at is None:
+                return self.poll_interval
+            if ready_at > now:
+                # Wake up early enough to yield to a later, more urgent crawl
+                return min(ready_at - now, 1.0)
+            for other in self._waiting:
+                if other.rank < ticket.rank:
+                    other_ready_at = self._ready_at(other)
+                    if other_ready_at is not None and other_ready_at <= now:
+                        return self.poll_interval
+            state = self._domains[ticket.domain]
+            self._waiting.remove(ticket)
+            state.queued -= 1
+            state.active += 1
+            state.ready_at = now + self.min_delay
+            self._active += 1
+            self._virtual_time = max(self._virtual_time, ticket.rank[0])
+            ticket.granted_at = now
+            return 0.0
+
+    def _leave(self, ticket: _Ticket) -> None:
+        """Remove a ticket that was not granted, e.g. a cancelled crawl."""
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                self._domains[ticket.domain].queued -= 1
+
+    def _record_wait(self, ticket: _Ticket, wait: float) -> None:
+        with self._lock:
+            state = self._domains[ticket.domain]
+            state.requests += 1
+            state.total_wait_seconds += wait
+            state.max_wait_seconds = max(state.max_wait_seconds, wait)
+        if wait > 1.0:
+            logger.info(f"Crawl of {ticket.domain} waited {wait:.2f}s for a slot")
+
+    def _release(self, ticket: _Ticket, succeeded: bool) -> None:
+        with self._lock:
+            state = self._domains[ticket.domain]
+            state.active -= 1
+            self._active -= 1
+            if succeeded and state.throttled_at < ticket.granted_at:
+                state.backoff_seconds /= 2
+                if state.backoff_seconds < _INITIAL_BACKOFF_SECONDS:
+                    state.backoff_seconds = 0.0
+
+    def record_error(self, error: BaseException) -> bool:
+        """
+        Back off the domain of a throttled response.
+
+        Args:
+            error: The error of a crawl
+
+        Returns:
+            Whether the error was a throttled (429 or 503) response
+        """
+        if not isinstance(error, httpx.HTTPStatusError):
+            return False
+        response = error.response
+        if response.status_code not in _THROTTLED_STATUS_CODES:
+            return False
+        domain = _domain(str(error.request.url))
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(domain)
+            state.throttled += 1
+            state.throttled_at = now
+            state.backoff_seconds = min(
+                self.max_backoff,
+                _retry_after(response)
+                or max(_INITIAL_BACKOFF_SECONDS, 2 * state.backoff_seconds),
+            )
+            state.ready_at = max(state.ready_at, now + state.backoff_seconds)
+            if domain == _domain(JINA_READER_URL):
+                self._paused_until = max(self._paused_until, state.ready_at)
+        logger.warning(
+            f"{domain} answered {response.status_code}, "
+            f"backing off for {state.backoff_seconds:.1f}s"
+        )
+        return True
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Block until the url can be crawled, and hold a slot while it is."""
+        started_at = time.monotonic()
+        ticket = self._enqueue(url)
+        try:
+            while (delay := self._try_acquire(ticket)) > 0:
+                time.sleep(delay)
+        finally:
+            self._leave(ticket)
+        self._record_wait(ticket, time.monotonic() - started_at)
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        except BaseException as e:
+            self.record_error(e)
+            raise
+        finally:
+            self._release(ticket, succeeded)
+
+    @asynccontextmanager
+    async def aslot(self, url: str) -> AsyncIterator[None]:
+        """Wait until the url can be crawled, and hold a slot while it is."""
+        started_at = time.monotonic()
+        ticket = self._enqueue(url)
+        try:
+            while (delay := self._try_acquire(ticket)) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._leave(ticket)
+        self._record_wait(ticket, time.monotonic() - started_at)
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        except BaseException as e:
+            self.record_error(e)
+            raise
+        finally:
+            self._release(ticket, succeeded)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "active": self._active,
+                "queued": len(self._waiting),
+                "paused_seconds": max(0.0, self._paused_until - now),
+                "domains": {
+                    domain: {
+                        "active": state.active,
+                        "queued": state.queued,
+                        "requests": state.requests,
+                        "throttled": state.throttled,
+                        "backoff_seconds": state.backoff_seconds,
+                        "average_wait_seconds": (
+                            state.total_wait_seconds / state.requests
+                            if state.requests
+                            else 0.0
+                        ),
+                        "max_wait_seconds": state.max_wait_seconds,
+                    }
+                    for domain, state in self._domains.items()
+                },
+            }
+
+
+_scheduler: Optional[CrawlScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """Return the scheduler shared by every crawl of the process."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = CrawlScheduler(
+                max_concurrency=int(os.getenv("CRAWL_MAX_CONCURRENCY", "8")),
+                max_per_domain=int(os.getenv("CRAWL_MAX_CONCURRENCY_PER_HOST", "2")),
+                min_delay=float(os.getenv("CRAWL_MIN_DELAY_PER_HOST", "0.5")),
+                max_backoff=float(os.getenv("CRAWL_MAX_BACKOFF", "60")),
+            )
+        return _scheduler
+
+
+def get_crawl_scheduler_stats() -> dict[str, Any]:
+    """Return the running and queued crawls, and the waits and backoffs per domain."""
+    return get_crawl_scheduler().get_stats()
@@ -10,7 +10,6 @@ from langchain_core.runnables import RunnableConfig
 from src.agents import create_agent
 from src.config.configuration import Configuration
 from src.graph.types import State
-from src.prompts.template import apply_prompt_template
 from src.utils.mcp_utils import extract_mcp_settings
 
 logger = logging.getLogger(__name__)
@@ -88,22 +87,22 @@ async def handle_mcp_coordination(
             "mcp_coordinator", "mcp_coordinator", loaded_tools, "mcp_coordinator"
         )
         
-        agent_input = {
-            "messages": apply_prompt_template("mcp_coordinator", state, configurable)
-        }
+        # The agent adds its system prompt and trims the history itself
+        agent_input = {"messages": state["messages"]}
 
         # Invoke agent
         agent_response = await agent.ainvoke(
             input=agent_input, config={"recursion_limit": env_value_str}
         )
         
-        # Update messages with agent response
-        updated_messages = state["messages"] + agent_response.get("messages", [])
+        # The agent's messages start with its input, only keep what it added
+        new_messages = agent_response.get("messages", [])[
+            len(agent_input["messages"]) :
+        ]
+        updated_messages = state["messages"] + new_messages
         
         # Process tool calls
-        goto, locale = await process_tool_calls(
-            agent_response.get("messages", []), state
-        )
+        goto, locale = await process_tool_calls(new_messages, state)
         
     return goto, locale, updated_messages
 
@@ -1,20 +1,25 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
 import os
-from typing import Annotated, Literal
+from typing import Annotated, Callable, Literal, Optional
 
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import RunnableConfig, ensure_config
+from langchain_core.runnables.config import merge_configs
 from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
 from langgraph.types import Command, interrupt
+from pydantic import ValidationError
 from trustcall import create_extractor
 
 from src.agents import create_agent
-from src.tools.search import LoggedTavilySearch
+from src.tools.search import CachedTavilySearch
 from src.tools import (
+    crawl_many_tool,
     crawl_tool,
     get_web_search_tool,
     python_repl_tool,
@@ -22,10 +27,13 @@ from src.tools import (
 
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
-from src.llms.llm import get_llm_by_type
-from src.prompts.planner_model import Plan, StepType
+from src.crawler.passages import CRAWL_QUERY_METADATA_KEY
+from src.llms.llm import get_llm_for_agent
+from src.prompts.planner_model import Plan, Step, StepType
 from src.prompts.template import apply_prompt_template
-from src.utils.json_utils import repair_json_output
+from src.storage import offload, resolve
+from src.tracing import AGENT_METADATA_KEY, STEP_METADATA_KEY
+from src.utils.json_utils import PartialJSONParser, repair_json_output
 from src.utils.mcp_utils import extract_mcp_settings
 
 from .types import State
@@ -46,16 +54,16 @@ def handoff_to_planner(
     return
 
 
-def background_investigation_node(
+async def background_investigation_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["planner"]]:
     logger.info("background investigation node is running.")
     configurable = Configuration.from_runnable_config(config)
     query = state["messages"][-1].content
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY:
-        searched_content = LoggedTavilySearch(
+        searched_content = await CachedTavilySearch(
             max_results=configurable.max_search_results
-        ).invoke({"query": query})
+        ).ainvoke({"query": query})
         background_investigation_results = None
         if isinstance(searched_content, list):
             background_investigation_results = [
@@ -67,9 +75,9 @@ def background_investigation_node(
                 f"Tavily search returned malformed response: {searched_content}"
             )
     else:
-        background_investigation_results = get_web_search_tool(
+        background_investigation_results = await get_web_search_tool(
             configurable.max_search_results
-        ).invoke(query)
+        ).ainvoke(query)
     return Command(
         update={
             "background_investigation_results": json.dumps(
@@ -80,9 +88,18 @@ def background_investigation_node(
     )
 
 
-def _extract_plan_with_reasoning_model(llm, messages):
-    """Extract plan using reasoning model with standard LLM invocation."""
-    response = llm.invoke(messages)
+async def _extract_plan_with_reasoning_model(
+    llm, messages, on_partial_plan: Optional[Callable[[str, dict], None]] = None
+):
+    """Extract plan using reasoning model, streaming partial plans as tokens arrive."""
+    parser = PartialJSONParser()
+    response = None
+    async for chunk in llm.astream(messages):
+        response = chunk if response is None else response + chunk
+        if on_partial_plan and isinstance(chunk.content, str):
+            partial_plan = parser.feed(chunk.content)
+            if partial_plan is not None:
+                on_partial_plan(response.id, partial_plan)
     
     # Extract reasoning content from response metadata
     reasoning_content = ""
@@ -103,10 +120,10 @@ def _extract_plan_with_reasoning_model(llm, messages):
     return extracted_plan, reasoning_content
 
 
-def _extract_plan_with_trustcall(llm, messages):
+async def _extract_plan_with_trustcall(llm, messages):
     """Extract plan using trustcall extractor."""
     extractor = create_extractor(llm, tools=[Plan], tool_choice="Plan")
-    result = extractor.invoke({"messages": messages})
+    result = await extractor.ainvoke({"messages": messages})
     extracted_plan = result["responses"][0]
     
     # Ensure we have a Plan object
@@ -147,7 +164,57 @@ def _create_plan_command(extracted_plan: Plan, full_response: str) -> Command[Li
     )
 
 
-def planner_node(
+def _start_first_step(
+    state: State, config: RunnableConfig, partial_plan: dict
+) -> Optional[tuple[Step, asyncio.Task]]:
+    """Start executing the first step of a plan that is still being generated."""
+    if partial_plan.get("has_enough_context", True) or not partial_plan.get("steps"):
+        return None
+    try:
+        plan = Plan.model_validate({**partial_plan, "steps": partial_plan["steps"][:1]})
+    except ValidationError:
+        return None
+    step = plan.steps[0]
+    logger.info(f"Starting step '{step.title}' while the plan is being generated")
+    node = coder_node if step.step_type == StepType.PROCESSING else researcher_node
+    return step, asyncio.create_task(node({**state, "current_plan": plan}, config))
+
+
+async def _merge_first_step(
+    command: Command, extracted_plan: Plan, first_step: tuple[Step, asyncio.Task]
+) -> Command:
+    """Add the result of the early started first step to the planner command."""
+    step, task = first_step
+    if command.goto != "human_feedback" or not extracted_plan.steps:
+        task.cancel()
+        return command
+    try:
+        step_command = await task
+    except Exception as e:
+        logger.warning(f"Early execution of step '{step.title}' failed: {e}")
+        return command
+    planned_step = extracted_plan.steps[0]
+    unchanged = (planned_step.title, planned_step.description) == (
+        step.title,
+        step.description,
+    )
+    if not step.execution_res or not unchanged:
+        logger.warning(f"Step '{step.title}' changed, discarding its early result")
+        return command
+    planned_step.execution_res = step.execution_res
+    return Command(
+        update={
+            "messages": command.update["messages"] + step_command.update["messages"],
+            "observations": step_command.update["observations"],
+            "current_plan": extracted_plan.model_dump_json(
+                indent=4, exclude_none=True
+            ),
+        },
+        goto=command.goto,
+    )
+
+
+async def planner_node(
     state: State, config: RunnableConfig
 ) -> Command[Literal["human_feedback", "reporter"]]:
     """Planner node that generate the full plan."""
@@ -178,14 +245,25 @@ def planner_node(
         return Command(goto="reporter")
 
     # Get the LLM
-    llm = get_llm_by_type(AGENT_LLM_MAP["planner"])
-    
+    llm = get_llm_for_agent("planner")
+    writer = get_stream_writer()
+    first_step = None
+
+    def on_partial_plan(message_id: str, partial_plan: dict) -> None:
+        nonlocal first_step
+        writer({"type": "plan_update", "id": message_id, "plan": partial_plan})
+        # Accepted plans need no review, so research can start on the first step
+        if first_step is None and state.get("auto_accepted_plan"):
+            first_step = _start_first_step(state, config, partial_plan)
+
     try:
         # Extract plan using appropriate method based on model type
         if AGENT_LLM_MAP["planner"] == "reasoning":
-            extracted_plan, reasoning_content = _extract_plan_with_reasoning_model(llm, messages)
+            extracted_plan, reasoning_content = await _extract_plan_with_reasoning_model(
+                llm, messages, on_partial_plan
+            )
         else:
-            extracted_plan, reasoning_content = _extract_plan_with_trustcall(llm, messages)
+            extracted_plan, reasoning_content = await _extract_plan_with_trustcall(llm, messages)
         
         # Format response and create command
         full_response = _format_plan_response(extracted_plan, reasoning_content)
@@ -193,7 +271,10 @@ def planner_node(
         logger.debug(f"Current state messages: {state['messages']}")
         logger.info(f"Planner response: {full_response}")
         
-        return _create_plan_command(extracted_plan, full_response)
+        command = _create_plan_command(extracted_plan, full_response)
+        if first_step:
+            command = await _merge_first_step(command, extracted_plan, first_step)
+        return command
         
     except Exception as e:
         logger.warning(f"Plan extraction failed: {e}")
@@ -201,6 +282,9 @@ def planner_node(
             return Command(goto="reporter")
         else:
             return Command(goto="__end__")
+    finally:
+        if first_step and not first_step[1].done():
+            first_step[1].cancel()
 
 
 def human_feedback_node(
@@ -255,7 +339,7 @@ def human_feedback_node(
     )
 
 
-def _handle_standard_coordination(state, configurable):
+async def _handle_standard_coordination(state, configurable):
     """
     Handle coordination using standard LLM without MCP tools.
     
@@ -269,9 +353,9 @@ def _handle_standard_coordination(state, configurable):
     logger.info("Using standard coordinator")
     messages = apply_prompt_template("coordinator", state, configurable)
     response = (
-        get_llm_by_type(AGENT_LLM_MAP["coordinator"])
+        await get_llm_for_agent("coordinator")
         .bind_tools([handoff_to_planner])
-        .invoke(messages)
+        .ainvoke(messages)
     )
     logger.debug(f"Coordinator response: {response}")
 
@@ -322,7 +406,7 @@ async def coordinator_node(
             state, configurable, mcp_servers, enabled_tools, [handoff_to_planner]
         )
     else:
-        goto, locale = _handle_standard_coordination(state, configurable)
+        goto, locale = await _handle_standard_coordination(state, configurable)
     
     return Command(
         update={
@@ -333,7 +417,7 @@ async def coordinator_node(
     )
 
 
-def reporter_node(state: State, config: RunnableConfig):
+async def reporter_node(state: State, config: RunnableConfig):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
     configurable = Configuration.from_runnable_config(config)
@@ -366,12 +450,12 @@ def reporter_node(state: State, config: RunnableConfig):
     for observation in observations:
         invoke_messages.append(
             HumanMessage(
-                content=f"Below are some observations for the research task:\n\n{observation}",
+                content=f"Below are some observations for the research task:\n\n{resolve(observation)}",
                 name="observation",
             )
         )
     logger.debug(f"Current invoke messages: {invoke_messages}")
-    response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
+    response = await get_llm_for_agent("reporter").ainvoke(invoke_messages)
     response_content = response.content
     logger.info("Reporter response completed")
 
@@ -435,7 +519,9 @@ async def _execute_agent_step(
         completed_steps_info = "# Existing Research Findings\n\n"
         for i, step in enumerate(completed_steps):
             completed_steps_info += f"## Existing Finding {i+1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
+            completed_steps_info += (
+                f"<finding>\n{resolve(step.execution_res)}\n</finding>\n\n"
+            )
 
     # Prepare the input for the agent with completed steps info
     agent_input = {
@@ -478,16 +564,35 @@ async def _execute_agent_step(
         )
         recursion_limit = default_recursion_limit
 
+    # The agent and step names tell the runs apart when a step is started early
+    # inside the planner node
     result = await agent.ainvoke(
-        input=agent_input, config={"recursion_limit": recursion_limit}
+        input=agent_input,
+        config=merge_configs(
+            ensure_config(),
+            {
+                "recursion_limit": recursion_limit,
+                "metadata": {
+                    AGENT_METADATA_KEY: agent_name,
+                    STEP_METADATA_KEY: current_step.title,
+                    # Crawl tools return the passages of a page relevant to the step
+                    CRAWL_QUERY_METADATA_KEY: f"{current_step.title}\n{current_step.description}",
+                },
+            },
+        ),
     )
 
     # Process the result
     response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
 
+    # Large results are kept in the blob store, the plan and the observations only
+    # hold a reference which is resolved again when the result is put into a
+    # prompt. The message stays inline, as it is displayed and streamed.
+    stored_content = offload(response_content)
+
     # Update the step with the execution result
-    current_step.execution_res = response_content
+    current_step.execution_res = stored_content
     logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
@@ -498,7 +603,7 @@ async def _execute_agent_step(
                     name=agent_name,
                 )
             ],
-            "observations": observations + [response_content],
+            "observations": observations + [stored_content],
         },
         goto="research_team",
     )
@@ -544,7 +649,11 @@ async def researcher_node(
         state,
         config,
         "researcher",
-        [get_web_search_tool(configurable.max_search_results), crawl_tool],
+        [
+            get_web_search_tool(configurable.max_search_results),
+            crawl_tool,
+            crawl_many_tool,
+        ],
     )
 
 
@@ -0,0 +1,230 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Disk-backed response cache for chat models with record/replay support.
+
+The cache key covers the model configuration, the bound tools and call options,
+and the exact message list. In ``read_through`` mode misses are forwarded to the
+provider and recorded, in ``replay`` mode misses raise ``LLMCacheMissError`` so
+recorded traces can be replayed without network access.
+"""
+
+import asyncio
+import enum
+import hashlib
+import json
+import logging
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumps, loads
+from langchain_core.messages import BaseMessage, message_chunk_to_message
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.storage.disk_cache import DiskLRUCache
+
+from .wrapper import ChatModelWrapper, message_to_chunk
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMode(str, enum.Enum):
+    OFF = "off"
+    READ_THROUGH = "read_through"
+    REPLAY = "replay"
+
+
+class LLMCacheMissError(LookupError):
+    """Raised in replay mode when a call has no recorded response."""
+
+
+def _cache_key(llm_string: str, messages: list[BaseMessage]) -> str:
+    # Message ids are assigned per run and must not affect the key
+    messages = [message.model_copy(update={"id": None}) for message in messages]
+    payload = f"{llm_string}\n{dumps(messages)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _encode(generations: list[ChatGeneration]) -> bytes:
+    return json.dumps([dumps(generation) for generation in generations]).encode("utf-8")
+
+
+def _decode(value: bytes) -> list[ChatGeneration]:
+    generations = [loads(generation) for generation in json.loads(value)]
+    for generation in generations:
+        # Let the caller assign a fresh id, cached ids belong to the recorded run
+        generation.message.id = None
+    return generations
+
+
+class CachedChatModel(ChatModelWrapper):
+    """A chat model that serves responses from a ``DiskLRUCache`` when possible."""
+
+    store: DiskLRUCache
+    mode: LLMCacheMode = LLMCacheMode.READ_THROUGH
+
+    def _lookup(
+        self, messages: list[BaseMessage], stop: Optional[list[str]], **kwargs: Any
+    ) -> tuple[str, Optional[list[ChatGeneration]]]:
+        key = _cache_key(self.model._get_llm_string(stop=stop, **kwargs), messages)
+        value = self.store.get(key)
+        if value is not None:
+            logger.debug(f"LLM cache hit: {key}")
+            return key, _decode(value)
+        if self.mode == LLMCacheMode.REPLAY:
+            raise LLMCacheMissError(f"No recorded LLM response for key {key}")
+        return key, None
+
+    def _record(self, key: str, generations: list[ChatGeneration]) -> None:
+        try:
+            self.store.set(key, _encode(generations))
+        except Exception as e:
+            logger.warning(f"Failed to record LLM response: {e}")
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key, generations = self._lookup(messages, stop, **kwargs)
+        if generations is not None:
+            return ChatResult(generations=generations)
+        result = super()._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        self._record(key, result.generations)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # SQLite reads and commits would block the event loop
+        key, generations = await asyncio.to_thread(
+            self._lookup, messages, stop, **kwargs
+        )
+        if generations is not None:
+            return ChatResult(generations=generations)
+        result = await super()._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        await asyncio.to_thread(self._record, key, result.generations)
+        return result
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        key, generations = self._lookup(messages, stop, **kwargs)
+        if generations is not None:
+            yield message_to_chunk(generations[0].message)
+            return
+        chunks = []
+        for chunk in super()._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            chunks.append(chunk)
+            yield chunk
+        self._record_chunks(key, chunks)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key, generations = await asyncio.to_thread(
+            self._lookup, messages, stop, **kwargs
+        )
+        if generations is not None:
+            yield message_to_chunk(generations[0].message)
+            return
+        chunks = []
+        async for chunk in super()._astream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            chunks.append(chunk)
+            yield chunk
+        await asyncio.to_thread(self._record_chunks, key, chunks)
+
+    def _record_chunks(self, key: str, chunks: list[ChatGenerationChunk]) -> None:
+        # Only complete streams are recorded, an interrupted stream never gets here
+        if not chunks:
+            return
+        merged = chunks[0]
+        for chunk in chunks[1:]:
+            merged += chunk
+        self._record(
+            key,
+            [
+                ChatGeneration(
+                    message=message_chunk_to_message(merged.message),
+                    generation_info=merged.generation_info,
+                )
+            ],
+        )
+
+
+_cache_stores: dict[str, DiskLRUCache] = {}
+
+
+def parse_cache_mode(value: Any) -> LLMCacheMode:
+    """Parse the cache mode, YAML turns a bare `off` into False."""
+    if value is None or value is False:
+        return LLMCacheMode.OFF
+    try:
+        return LLMCacheMode(str(value).lower().replace("-", "_"))
+    except ValueError:
+        raise ValueError(f"Invalid LLM cache mode: {value}")
+
+
+def wrap_with_cache(llm: BaseChatModel, cache_conf: Optional[dict]) -> BaseChatModel:
+    """
+    Wrap a chat model with the response cache described by ``LLM_CACHE``.
+
+    Args:
+        llm: The chat model to wrap
+        cache_conf: The ``LLM_CACHE`` section of conf.yaml
+
+    Returns:
+        The cached chat model, or the model itself when caching is off
+    """
+    cache_conf = cache_conf or {}
+    mode = parse_cache_mode(cache_conf.get("mode"))
+    if mode == LLMCacheMode.OFF:
+        return llm
+    path = cache_conf.get("path", ".cache/llm_cache.sqlite")
+    if path not in _cache_stores:
+        _cache_stores[path] = DiskLRUCache(
+            path, int(float(cache_conf.get("max_size_mb", 512)) * 1024 * 1024)
+        )
+    return CachedChatModel(model=llm, store=_cache_stores[path], mode=mode)
+
+
+def get_cache_stats() -> dict[str, dict[str, Any]]:
+    """Return hit/miss counters and sizes of the open LLM caches by path."""
+    return {
+        path: {
+            "hits": store.stats.hits,
+            "misses": store.stats.misses,
+            "hit_rate": store.stats.hit_rate,
+            "evictions": store.stats.evictions,
+            "entries": len(store),
+            "size_bytes": store.size(),
+        }
+        for path, store in _cache_stores.items()
+    }
@@ -0,0 +1,203 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+A scripted offline chat model, the ``fake`` model provider of conf.yaml.
+
+It lets the research graph run end to end without a model provider, with
+configurable latency, for benchmarks and load tests.
+"""
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.utils.synthetic import synthetic_text
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    A scripted chat model that plays every agent of the research graph.
+
+    The role is inferred from the bound tools and the system prompt:
+    the coordinator hands off to the planner, the planner returns a plan with
+    ``plan_steps`` research steps, the researcher calls its tools
+    ``tool_calls_per_step`` times before answering, and everything else gets a
+    plain text answer of ``response_tokens`` tokens.
+    """
+
+    latency: float = 0.0
+    """Seconds before the first token."""
+
+    tokens_per_second: float = 0.0
+    """Output token rate, 0 for instant output."""
+
+    response_tokens: int = 50
+    plan_steps: int = 3
+    tool_calls_per_step: int = 2
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> Runnable:
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _respond(self, messages: list[BaseMessage], **kwargs: Any) -> AIMessage:
+        tool_names = [t["function"]["name"] for t in kwargs.get("tools") or []]
+        system_prompt = next(
+            (m.content for m in messages if isinstance(m, SystemMessage)), ""
+        )
+        if "handoff_to_planner" in tool_names:
+            return self._tool_call(
+                "handoff_to_planner", {"task_title": "benchmark", "locale": "en-US"}
+            )
+        if "Plan" in tool_names:
+            return self._tool_call("Plan", self._plan())
+        if "interface Plan" in system_prompt:
+            return AIMessage(content=json.dumps(self._plan()))
+        if "web_search" in tool_names:
+            tool_messages = 0
+            for message in reversed(messages):
+                if isinstance(message, HumanMessage):
+                    break
+                if isinstance(message, ToolMessage):
+                    tool_messages += 1
+            if tool_messages < self.tool_calls_per_step:
+                if tool_messages % 2 == 0 or "crawl_tool" not in tool_names:
+                    return self._tool_call("web_search", {"query": "benchmark"})
+                if "crawl_many_tool" in tool_names:
+                    # Read the pages of the search results in one call
+                    return self._tool_call(
+                        "crawl_many_tool",
+                        {
+                            "urls": [
+                                f"https://example.com/{tool_messages}/{i}"
+                                for i in range(3)
+                            ]
+                        },
+                    )
+                return self._tool_call(
+                    "crawl_tool", {"url": f"https://example.com/{tool_messages}"}
+                )
+        return AIMessage(content=synthetic_text(self.response_tokens, len(messages)))
+
+    def _tool_call(self, name: str, args: dict) -> AIMessage:
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex}"}],
+        )
+
+    def _plan(self) -> dict:
+        return {
+            "locale": "en-US",
+            "has_enough_context": False,
+            "thought": "Benchmark plan",
+            "title": "Benchmark plan",
+            "steps": [
+                {
+                    "need_web_search": True,
+                    "title": f"Step {i + 1}",
+                    "description": f"Collect data for step {i + 1}",
+                    "step_type": "research",
+                }
+                for i in range(self.plan_steps)
+            ],
+        }
+
+    def _output_seconds(self, message: AIMessage) -> float:
+        if not self.tokens_per_second or not isinstance(message.content, str):
+            return 0.0
+        return len(message.content.split()) / self.tokens_per_second
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages, **kwargs)
+        time.sleep(self.latency + self._output_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._respond(messages, **kwargs)
+        await asyncio.sleep(self.latency + self._output_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> list[AIMessageChunk]:
+        if message.tool_calls:
+            return [
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": tool_call["name"],
+                            "args": json.dumps(tool_call["args"]),
+                            "id": tool_call["id"],
+                            "index": index,
+                        }
+                        for index, tool_call in enumerate(message.tool_calls)
+                    ],
+                )
+            ]
+        return [
+            AIMessageChunk(content=token)
+            for token in re.split(r"(?<=\s)", message.content)
+            if token
+        ]
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._respond(messages, **kwargs)
+        time.sleep(self.latency)
+        for chunk in self._chunks(message):
+            if self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages, **kwargs)
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(message):
+            if self.tokens_per_second:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield ChatGenerationChunk(message=chunk)
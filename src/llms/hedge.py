@@ -0,0 +1,393 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Hedged LLM requests to cut tail latency.
+
+When the first chunk of a call has not arrived after a percentile of the
+recent first-chunk latencies, ``HedgedChatModel`` sends the same call again.
+The first attempt to produce a chunk wins and the other one is cancelled.
+Hedges are capped by a budget relative to the number of calls. Wrapping a
+``PooledChatModel`` sends the hedge to another endpoint, as the primary attempt
+is still outstanding on its endpoint.
+"""
+
+import asyncio
+import contextvars
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from .wrapper import ChatModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    budget_exhausted: int = 0
+
+
+class Hedger:
+    """Hedge delay from recent latencies, hedge budget and statistics."""
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay_seconds: float = 0.1,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError(f"Invalid hedging percentile of {name}: {percentile}")
+        self.name = name
+        self.settings = dict(
+            percentile=percentile,
+            budget=budget,
+            min_samples=min_samples,
+            window=window,
+            min_delay_seconds=min_delay_seconds,
+        )
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.stats = HedgeStats()
+        self._latencies: dict[bool, deque[float]] = {
+            True: deque(maxlen=window),
+            False: deque(maxlen=window),
+        }
+        self._lock = threading.Lock()
+
+    def start(self, streaming: bool) -> Optional[float]:
+        """Count a call and return how long to wait before hedging it."""
+        with self._lock:
+            self.stats.requests += 1
+            latencies = sorted(self._latencies[streaming])
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        index = min(
+            math.ceil(self.percentile / 100 * len(latencies)) - 1, len(latencies) - 1
+        )
+        return max(latencies[index], self.min_delay_seconds)
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self.stats.hedged + 1 > self.budget * self.stats.requests:
+                self.stats.budget_exhausted += 1
+                return False
+            self.stats.hedged += 1
+            return True
+
+    def record(self, streaming: bool, latency: float, hedge_won: bool) -> None:
+        with self._lock:
+            self._latencies[streaming].append(latency)
+            if hedge_won:
+                self.stats.hedge_wins += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.stats.requests,
+                "hedged": self.stats.hedged,
+                "hedge_wins": self.stats.hedge_wins,
+                "budget_exhausted": self.stats.budget_exhausted,
+                "hedge_rate": (
+                    self.stats.hedged / self.stats.requests
+                    if self.stats.requests
+                    else 0.0
+                ),
+            }
+
+
+_END = object()
+
+
+class _ThreadAttempt:
+    """Consume a blocking stream in a thread, forwarding its items to a queue."""
+
+    def __init__(self, index: int, stream: Iterator, events: queue.Queue):
+        self.index = index
+        self.started_at = time.monotonic()
+        self.cancelled = threading.Event()
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run, args=(self._run, stream, events), daemon=True
+        ).start()
+
+    def _run(self, stream: Iterator, events: queue.Queue) -> None:
+        try:
+            for item in stream:
+                if self.cancelled.is_set():
+                    break
+                events.put((self.index, item, None))
+            else:
+                events.put((self.index, _END, None))
+        except Exception as e:
+            events.put((self.index, None, e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+
+class HedgedChatModel(ChatModelWrapper):
+    """A chat model that hedges slow calls with a duplicate request."""
+
+    hedger: Hedger
+
+    def _race(
+        self, start_stream: Callable[[int], Iterator], streaming: bool
+    ) -> Iterator:
+        delay = self.hedger.start(streaming)
+        events: queue.Queue = queue.Queue()
+        attempts = [_ThreadAttempt(0, start_stream(0), events)]
+        winner = None
+        errors = []
+        try:
+            while winner is None:
+                timeout = None
+                if len(attempts) == 1 and delay is not None:
+                    timeout = max(attempts[0].started_at + delay - time.monotonic(), 0)
+                try:
+                    index, item, error = events.get(timeout=timeout)
+                except queue.Empty:
+                    if not self.hedger.try_hedge():
+                        delay = None
+                        continue
+                    logger.debug(f"Hedging a slow call to {self.hedger.name}")
+                    attempts.append(_ThreadAttempt(1, start_stream(1), events))
+                    continue
+                if error is not None:
+                    errors.append(error)
+                    if len(errors) == len(attempts):
+                        raise errors[0]
+                    # The other attempt may still succeed
+                    continue
+                winner = attempts[index]
+                self.hedger.record(
+                    streaming, time.monotonic() - winner.started_at, index == 1
+                )
+                for attempt in attempts:
+                    if attempt is not winner:
+                        attempt.cancelled.set()
+                if item is _END:
+                    return
+                yield item
+            while True:
+                index, item, error = events.get()
+                if index != winner.index:
+                    continue
+                if error is not None:
+                    raise error
+                if item is _END:
+                    return
+                yield item
+        finally:
+            for attempt in attempts:
+                attempt.cancelled.set()
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        def start_stream(index: int) -> Iterator[ChatResult]:
+            yield ChatModelWrapper._generate(
+                self,
+                messages,
+                stop=stop,
+                run_manager=run_manager if index == 0 else None,
+                **kwargs,
+            )
+
+        race = self._race(start_stream, streaming=False)
+        try:
+            return next(race)
+        finally:
+            race.close()
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        def start_stream(index: int) -> Iterator[ChatGenerationChunk]:
+            return ChatModelWrapper._stream(
+                self,
+                messages,
+                stop=stop,
+                run_manager=run_manager if index == 0 else None,
+                **kwargs,
+            )
+
+        yield from self._race(start_stream, streaming=True)
+
+    async def _arace(
+        self, start_stream: Callable[[int], AsyncIterator], streaming: bool
+    ) -> AsyncIterator:
+        delay = self.hedger.start(streaming)
+        streams = [start_stream(0)]
+        started_at = [time.monotonic()]
+        pending = {asyncio.ensure_future(anext(streams[0], _END)): 0}
+        winner = None
+        first_item = None
+        errors = []
+        try:
+            while winner is None:
+                timeout = None
+                if len(streams) == 1 and delay is not None:
+                    timeout = max(started_at[0] + delay - time.monotonic(), 0)
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if not self.hedger.try_hedge():
+                        delay = None
+                        continue
+                    logger.debug(f"Hedging a slow call to {self.hedger.name}")
+                    streams.append(start_stream(1))
+                    started_at.append(time.monotonic())
+                    pending[asyncio.ensure_future(anext(streams[1], _END))] = 1
+                    continue
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    if winner is None:
+                        winner, first_item = index, task.result()
+                if winner is None and not pending:
+                    raise errors[0]
+            self.hedger.record(
+                streaming, time.monotonic() - started_at[winner], winner == 1
+            )
+            await self._cancel(
+                pending, [s for i, s in enumerate(streams) if i != winner]
+            )
+            if first_item is _END:
+                return
+            yield first_item
+            async for item in streams[winner]:
+                yield item
+        finally:
+            await self._cancel(pending, streams)
+
+    @staticmethod
+    async def _cancel(pending: dict[asyncio.Future, int], streams: list) -> None:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        pending.clear()
+        for stream in streams:
+            try:
+                await stream.aclose()
+            except Exception as e:
+                logger.debug(f"Failed to close a hedged stream: {e!r}")
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async def start_stream(index: int) -> AsyncIterator[ChatResult]:
+            yield await ChatModelWrapper._agenerate(
+                self,
+                messages,
+                stop=stop,
+                run_manager=run_manager if index == 0 else None,
+                **kwargs,
+            )
+
+        race = self._arace(start_stream, streaming=False)
+        try:
+            return await anext(race)
+        finally:
+            await race.aclose()
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        def start_stream(index: int) -> AsyncIterator[ChatGenerationChunk]:
+            return ChatModelWrapper._astream(
+                self,
+                messages,
+                stop=stop,
+                run_manager=run_manager if index == 0 else None,
+                **kwargs,
+            )
+
+        async for chunk in self._arace(start_stream, streaming=True):
+            yield chunk
+
+
+_hedgers: dict[str, Hedger] = {}
+
+
+def wrap_with_hedging(
+    llm: BaseChatModel,
+    hedging_conf: Optional[dict],
+    name: str,
+    hedgers: Optional[dict[str, Hedger]] = None,
+) -> BaseChatModel:
+    """
+    Wrap a chat model with the hedging policy described by a ``hedging`` section.
+
+    Args:
+        llm: The chat model to wrap
+        hedging_conf: ``percentile``, ``budget``, ``min_samples``, ``window``
+            and ``min_delay_seconds``, hedging is off without it
+        name: The LLM type the policy belongs to
+        hedgers: The hedgers to reuse and add to, default those of the process
+
+    Returns:
+        The hedged chat model, or the model itself when hedging is off
+    """
+    if not hedging_conf or not hedging_conf.get("enabled", True):
+        return llm
+    settings = dict(
+        percentile=float(hedging_conf.get("percentile", 95)),
+        budget=float(hedging_conf.get("budget", 0.05)),
+        min_samples=int(hedging_conf.get("min_samples", 20)),
+        window=int(hedging_conf.get("window", 200)),
+        min_delay_seconds=float(hedging_conf.get("min_delay_seconds", 0.1)),
+    )
+    if hedgers is None:
+        hedgers = _hedgers
+    # Rebuilt models keep the latency samples unless a reload changed the policy
+    if name not in hedgers or hedgers[name].settings != settings:
+        hedgers[name] = Hedger(name, **settings)
+    return HedgedChatModel(model=llm, hedger=hedgers[name])
+
+
+def get_hedge_stats() -> dict[str, dict[str, Any]]:
+    """Return hedge counts and hedge wins of the hedged LLM types."""
+    return {name: hedger.get_stats() for name, hedger in _hedgers.items()}
@@ -1,49 +1,240 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import functools
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from langchain_openai import ChatOpenAI
+from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain.chat_models.base import init_chat_model
-from src.config.loader import load_yaml_config
-from src.config.agents import LLMType
+from langchain_openai.chat_models.base import BaseChatOpenAI
+from src.config.loader import cache_yaml_config, load_yaml_config, read_yaml_config
+from src.config.agents import AGENT_LLM_MAP, LLMType
+from src.llms import hedge, pool, rate_limit
+from src.llms.cache import wrap_with_cache
+from src.llms.fake import FakeChatModel
+from src.llms.hedge import wrap_with_hedging
+from src.llms.pool import create_llm_pool
+from src.llms.rate_limit import wrap_with_rate_limit
+from src.llms.routing import (
+    RoutedChatModel,
+    parse_routing_rules,
+    resolve_request_tier,
+)
+from src.utils.http_client import get_async_http_client, get_http_client
 
-# Cache for LLM instances
-_llm_cache: dict[LLMType, ChatOpenAI] = {}
+CONF_PATH = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
 
+# Cache for LLM instances, replaced as a whole by reload_llms
+_llm_cache: dict[LLMType, BaseChatModel] = {}
+_agent_llm_cache: dict[str, BaseChatModel] = {}
+_reload_lock = threading.Lock()
 
-def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> ChatOpenAI:
+
+@dataclass
+class _Registries:
+    """The pools, rate limiters and hedgers that models are built with."""
+
+    pools: dict[str, pool.LLMPool]
+    limiters: dict[str, rate_limit.RateLimiter]
+    hedgers: dict[str, hedge.Hedger]
+
+    @classmethod
+    def staged(cls) -> "_Registries":
+        """Copies of those of the process, to build models that may be rejected."""
+        return cls(dict(pool._pools), dict(rate_limit._limiters), dict(hedge._hedgers))
+
+    def commit(self) -> None:
+        pool._pools = self.pools
+        rate_limit._limiters = self.limiters
+        hedge._hedgers = self.hedgers
+
+
+def _load_conf() -> Dict[str, Any]:
+    return load_yaml_config(CONF_PATH)
+
+
+def _create_chat_model(
+    llm_conf: Dict[str, Any],
+    name: str,
+    registries: Optional[_Registries] = None,
+) -> BaseChatModel:
+    llm_conf = dict(llm_conf)
+    rate_limit_conf = llm_conf.pop("rate_limit", None)
+    if llm_conf.get("model_provider") == "fake":
+        # Scripted offline model for benchmarks and load tests
+        llm = FakeChatModel(
+            **{
+                k: v
+                for k, v in llm_conf.items()
+                if k not in ("model", "model_provider")
+            }
+        )
+    else:
+        llm = init_chat_model(**llm_conf)
+        if (
+            isinstance(llm, BaseChatOpenAI)
+            and "http_client" not in llm_conf
+            and "http_async_client" not in llm_conf
+            # The OpenAI client builds its own connections through the proxy,
+            # set in the section or by OPENAI_PROXY
+            and not llm.openai_proxy
+        ):
+            # Share keep-alive connections with the other clients of the host
+            base_url = (
+                llm.openai_api_base
+                or getattr(llm, "azure_endpoint", None)
+                or "https://api.openai.com/v1"
+            )
+            llm = init_chat_model(
+                **llm_conf,
+                http_client=get_http_client(base_url),
+                http_async_client=get_async_http_client(base_url),
+            )
+    return wrap_with_rate_limit(
+        llm, rate_limit_conf, name, registries and registries.limiters
+    )
+
+
+def _create_llm_use_conf(
+    llm_type: LLMType,
+    conf: Dict[str, Any],
+    registries: Optional[_Registries] = None,
+) -> BaseChatModel:
     llm_type_map = {
         "reasoning": conf.get("REASONING_MODEL"),
         "basic": conf.get("BASIC_MODEL"),
         "vision": conf.get("VISION_MODEL"),
     }
-    llm_conf = llm_type_map.get(llm_type)
+    # Routing rules may target any other <NAME>_MODEL section
+    llm_conf = llm_type_map.get(llm_type) or conf.get(f"{llm_type.upper()}_MODEL")
     if not llm_conf:
         raise ValueError(f"Unknown LLM type: {llm_type}")
     if not isinstance(llm_conf, dict):
         raise ValueError(f"Invalid LLM Conf: {llm_type}")
-    return init_chat_model(**llm_conf)
+    hedging_conf = llm_conf.get("hedging")
+    llm_conf = {k: v for k, v in llm_conf.items() if k != "hedging"}
+    if "endpoints" in llm_conf:
+        llm = create_llm_pool(
+            llm_type,
+            llm_conf,
+            functools.partial(_create_chat_model, registries=registries),
+            registries and registries.pools,
+        )
+        llm = wrap_with_rate_limit(
+            llm,
+            llm_conf.get("rate_limit"),
+            llm_type,
+            registries and registries.limiters,
+        )
+    else:
+        llm = _create_chat_model(llm_conf, llm_type, registries)
+    # Hedges go through the rate limit and the pool like any other call
+    llm = wrap_with_hedging(
+        llm, hedging_conf, llm_type, registries and registries.hedgers
+    )
+    return wrap_with_cache(llm, conf.get("LLM_CACHE"))
 
 
 def get_llm_by_type(
     llm_type: LLMType,
-) -> ChatOpenAI:
+) -> BaseChatModel:
     """
     Get LLM instance by type. Returns cached instance if available.
     """
-    if llm_type in _llm_cache:
-        return _llm_cache[llm_type]
+    # A model built while the caches are swapped lands in the old cache
+    cache = _llm_cache
+    if llm_type in cache:
+        return cache[llm_type]
+
+    llm = _create_llm_use_conf(llm_type, _load_conf())
+    cache[llm_type] = llm
+    return llm
+
 
-    conf = load_yaml_config(
-        str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+def _create_agent_llm(
+    agent: str, llm: BaseChatModel, conf: Dict[str, Any]
+) -> BaseChatModel:
+    rules = [
+        rule
+        for rule in parse_routing_rules(conf.get("MODEL_ROUTING"))
+        if rule.applies_to(agent)
+    ]
+    for rule in rules:
+        if f"{rule.model.upper()}_MODEL" not in conf:
+            raise ValueError(f"Unknown model of routing rule: {rule.model}")
+    if not rules:
+        return llm
+    return RoutedChatModel(
+        model=llm,
+        agent=agent,
+        default_model_name=AGENT_LLM_MAP[agent],
+        rules=rules,
+        resolve=get_llm_by_type,
     )
-    llm = _create_llm_use_conf(llm_type, conf)
-    _llm_cache[llm_type] = llm
+
+
+def get_request_tier(requested: Optional[str] = None) -> Optional[str]:
+    """
+    Return the routing tier of a chat request, see ``resolve_request_tier``.
+
+    Raises:
+        ValueError: The tier is not one of the ``request_tiers`` of conf.yaml
+    """
+    return resolve_request_tier(_load_conf().get("MODEL_ROUTING"), requested)
+
+
+def get_llm_for_agent(agent: str) -> BaseChatModel:
+    """
+    Get the LLM of an agent. Returns cached instance if available.
+
+    Calls are routed per call when ``MODEL_ROUTING`` rules apply to the agent,
+    otherwise the agent's LLM type from ``AGENT_LLM_MAP`` is used.
+    """
+    cache = _agent_llm_cache
+    if agent in cache:
+        return cache[agent]
+
+    llm = _create_agent_llm(agent, get_llm_by_type(AGENT_LLM_MAP[agent]), _load_conf())
+    cache[agent] = llm
     return llm
 
 
+def reload_llms() -> None:
+    """
+    Reload ``.env`` and conf.yaml and swap the LLM instances of new calls.
+
+    The LLM types and agents used so far are rebuilt from the new configuration
+    before anything is swapped, so an invalid configuration raises and leaves
+    the current one in place, including the pools, rate limiters and hedgers.
+    Calls in flight keep the instances they hold.
+    """
+    global _llm_cache, _agent_llm_cache
+    with _reload_lock:
+        # Environment variables referenced as $NAME in conf.yaml, e.g. API keys
+        load_dotenv(override=True)
+        conf = read_yaml_config(CONF_PATH)
+        registries = _Registries.staged()
+        # Types without a section any more, e.g. old routing targets, are dropped
+        llms: dict[LLMType, BaseChatModel] = {
+            llm_type: _create_llm_use_conf(llm_type, conf, registries)
+            for llm_type in _llm_cache
+            if conf.get(f"{llm_type.upper()}_MODEL")
+        }
+        agent_llms: dict[str, BaseChatModel] = {}
+        for agent in _agent_llm_cache:
+            llm_type = AGENT_LLM_MAP[agent]
+            if llm_type not in llms:
+                llms[llm_type] = _create_llm_use_conf(llm_type, conf, registries)
+            agent_llms[agent] = _create_agent_llm(agent, llms[llm_type], conf)
+        cache_yaml_config(CONF_PATH, conf)
+        registries.commit()
+        _llm_cache, _agent_llm_cache = llms, agent_llms
+
+
 # In the future, we will use reasoning_llm and vl_llm for different purposes
 # reasoning_llm = get_llm_by_type("reasoning")
 # vl_llm = get_llm_by_type("vision")
@@ -0,0 +1,378 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Load balancing and failover across equivalent LLM endpoints.
+
+An LLM type configured with a list of ``endpoints`` in conf.yaml is served by a
+``PooledChatModel``. Each call is routed to the healthy endpoint with the
+fewest outstanding requests (``least_outstanding``) or the lowest latency EWMA
+scaled by its load (``latency_ewma``), both relative to the endpoint weight.
+Rate limited endpoints, and endpoints failing several times in a row, are
+ejected for a cool-down period, and a failed call is retried on the next
+endpoint as long as nothing has been streamed yet.
+"""
+
+import enum
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from .wrapper import ChatModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingPolicy(str, enum.Enum):
+    LEAST_OUTSTANDING = "least_outstanding"
+    LATENCY_EWMA = "latency_ewma"
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return (
+        getattr(error, "status_code", None) == 429
+        or "RateLimit" in type(error).__name__
+    )
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether another endpoint may succeed where this one failed."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        # Connection errors and timeouts carry no status code
+        return not isinstance(error, (ValueError, TypeError, KeyError))
+    return status_code == 429 or status_code >= 500
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    ejections: int = 0
+    outstanding: int = 0
+    consecutive_errors: int = 0
+    latency_ewma: Optional[float] = None
+    ejected_until: float = 0.0
+
+
+@dataclass
+class Endpoint:
+    name: str
+    client: ChatModelWrapper
+    weight: float = 1.0
+    stats: EndpointStats = field(default_factory=EndpointStats)
+
+    def is_healthy(self, now: float) -> bool:
+        return self.stats.ejected_until <= now
+
+
+class LLMPool:
+    """Routing state and per-endpoint statistics of a pool of chat models."""
+
+    def __init__(
+        self,
+        name: str,
+        endpoints: list[Endpoint],
+        routing: RoutingPolicy = RoutingPolicy.LEAST_OUTSTANDING,
+        max_consecutive_errors: int = 3,
+        ejection_seconds: float = 30.0,
+        ewma_decay: float = 0.3,
+    ):
+        if not endpoints:
+            raise ValueError(f"LLM pool {name} has no endpoints")
+        self.name = name
+        self.endpoints = endpoints
+        self.routing = routing
+        self.max_consecutive_errors = max_consecutive_errors
+        self.ejection_seconds = ejection_seconds
+        self.ewma_decay = ewma_decay
+        self._lock = threading.Lock()
+
+    def _score(self, endpoint: Endpoint) -> tuple[float, float]:
+        stats = endpoint.stats
+        if self.routing == RoutingPolicy.LATENCY_EWMA:
+            # Endpoints without samples score 0 so that they get probed first
+            load = (
+                (stats.outstanding + 1) / endpoint.weight * (stats.latency_ewma or 0.0)
+            )
+        else:
+            load = stats.outstanding / endpoint.weight
+        # Spread sequential traffic in proportion to the weights
+        return load, stats.requests / endpoint.weight
+
+    def candidates(self) -> list[Endpoint]:
+        """Return the endpoints in the order they should be tried."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = sorted(
+                (e for e in self.endpoints if e.is_healthy(now)), key=self._score
+            )
+            ejected = sorted(
+                (e for e in self.endpoints if not e.is_healthy(now)),
+                key=lambda e: e.stats.ejected_until,
+            )
+        # Ejected endpoints are the last resort when no healthy endpoint is left
+        return healthy + ejected
+
+    def acquire(self, endpoint: Endpoint) -> float:
+        with self._lock:
+            endpoint.stats.requests += 1
+            endpoint.stats.outstanding += 1
+        return time.monotonic()
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        started_at: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stats = endpoint.stats
+            stats.outstanding -= 1
+            if error is None:
+                stats.consecutive_errors = 0
+                latency = now - started_at
+                stats.latency_ewma = (
+                    latency
+                    if stats.latency_ewma is None
+                    else self.ewma_decay * latency
+                    + (1 - self.ewma_decay) * stats.latency_ewma
+                )
+                return
+            if not is_retryable_error(error):
+                return
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            rate_limited = is_rate_limit_error(error)
+            if rate_limited:
+                stats.rate_limited += 1
+            if rate_limited or stats.consecutive_errors >= self.max_consecutive_errors:
+                stats.ejections += 1
+                stats.ejected_until = now + self.ejection_seconds
+                logger.warning(
+                    f"Ejected LLM endpoint {endpoint.name} of pool {self.name} "
+                    f"for {self.ejection_seconds}s after {error!r}"
+                )
+
+    def get_stats(self) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "endpoint": e.name,
+                    "weight": e.weight,
+                    "healthy": e.is_healthy(now),
+                    "requests": e.stats.requests,
+                    "outstanding": e.stats.outstanding,
+                    "errors": e.stats.errors,
+                    "rate_limited": e.stats.rate_limited,
+                    "ejections": e.stats.ejections,
+                    "latency_ewma": e.stats.latency_ewma,
+                }
+                for e in self.endpoints
+            ]
+
+
+class PooledChatModel(ChatModelWrapper):
+    """
+    A chat model that spreads calls over the endpoints of an ``LLMPool``.
+
+    ``model`` is the first endpoint, it defines tool binding, structured output
+    and the cache key, so all endpoints of a pool must be equivalent models.
+    """
+
+    pool: LLMPool
+
+    def _failed(self, endpoint: Endpoint, started_at: float, error: Exception):
+        self.pool.release(endpoint, started_at, error)
+        if not is_retryable_error(error):
+            raise error
+        logger.warning(
+            f"LLM endpoint {endpoint.name} of pool {self.pool.name} failed: {error!r}"
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        last_error = None
+        for endpoint in self.pool.candidates():
+            started_at = self.pool.acquire(endpoint)
+            try:
+                result = endpoint.client._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                self._failed(endpoint, started_at, e)
+                last_error = e
+                continue
+            self.pool.release(endpoint, started_at)
+            return result
+        raise last_error
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        last_error = None
+        for endpoint in self.pool.candidates():
+            started_at = self.pool.acquire(endpoint)
+            try:
+                result = await endpoint.client._agenerate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+            except Exception as e:
+                self._failed(endpoint, started_at, e)
+                last_error = e
+                continue
+            self.pool.release(endpoint, started_at)
+            return result
+        raise last_error
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        last_error = None
+        for endpoint in self.pool.candidates():
+            started_at = self.pool.acquire(endpoint)
+            streamed = False
+            try:
+                for chunk in endpoint.client._stream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                if streamed:
+                    # Part of the answer is already out, it cannot be retried
+                    self.pool.release(endpoint, started_at, e)
+                    raise
+                self._failed(endpoint, started_at, e)
+                last_error = e
+                continue
+            except BaseException:
+                self.pool.release(endpoint, started_at)
+                raise
+            self.pool.release(endpoint, started_at)
+            return
+        raise last_error
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        last_error = None
+        for endpoint in self.pool.candidates():
+            started_at = self.pool.acquire(endpoint)
+            streamed = False
+            try:
+                async for chunk in endpoint.client._astream(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                ):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                if streamed:
+                    self.pool.release(endpoint, started_at, e)
+                    raise
+                self._failed(endpoint, started_at, e)
+                last_error = e
+                continue
+            except BaseException:
+                # Cancelled or closed by the consumer
+                self.pool.release(endpoint, started_at)
+                raise
+            self.pool.release(endpoint, started_at)
+            return
+        raise last_error
+
+
+_pools: dict[str, LLMPool] = {}
+
+
+def create_llm_pool(
+    name: str,
+    pool_conf: dict[str, Any],
+    create_model: Callable[[dict[str, Any], str], BaseChatModel],
+    pools: Optional[dict[str, LLMPool]] = None,
+) -> PooledChatModel:
+    """
+    Create a pooled chat model from an LLM section with ``endpoints``.
+
+    Args:
+        name: The LLM type the pool serves, used in logs and stats
+        pool_conf: The LLM section of conf.yaml
+        create_model: Factory turning an endpoint config and name into a chat model
+        pools: The pools to add the pool to, default those of the process
+
+    Returns:
+        The pooled chat model
+    """
+    endpoints = []
+    for index, endpoint_conf in enumerate(pool_conf.get("endpoints") or []):
+        if not isinstance(endpoint_conf, dict):
+            raise ValueError(f"Invalid endpoint {index} of LLM pool {name}")
+        endpoint_conf = dict(endpoint_conf)
+        weight = float(endpoint_conf.pop("weight", 1.0))
+        if weight <= 0:
+            raise ValueError(
+                f"Endpoint {index} of LLM pool {name} needs a positive weight"
+            )
+        endpoint_name = endpoint_conf.pop(
+            "name",
+            f"{endpoint_conf.get('model')}@{endpoint_conf.get('base_url', 'default')}",
+        )
+        endpoints.append(
+            Endpoint(
+                name=endpoint_name,
+                client=ChatModelWrapper(
+                    model=create_model(endpoint_conf, f"{name}/{endpoint_name}")
+                ),
+                weight=weight,
+            )
+        )
+    try:
+        routing = RoutingPolicy(pool_conf.get("routing", "least_outstanding"))
+    except ValueError:
+        raise ValueError(f"Invalid routing policy of LLM pool {name}")
+    pool = LLMPool(
+        name,
+        endpoints,
+        routing=routing,
+        max_consecutive_errors=int(pool_conf.get("max_consecutive_errors", 3)),
+        ejection_seconds=float(pool_conf.get("ejection_seconds", 30)),
+    )
+    if pools is None:
+        pools = _pools
+    pools[name] = pool
+    return PooledChatModel(model=endpoints[0].client.model, pool=pool)
+
+
+def get_pool_stats() -> dict[str, list[dict[str, Any]]]:
+    """Return the per-endpoint statistics of every LLM pool."""
+    return {name: pool.get_stats() for name, pool in _pools.items()}
@@ -0,0 +1,318 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Client-side rate limiting of LLM calls against provider RPM/TPM quotas.
+
+Every call takes one request and its estimated prompt tokens from token
+buckets refilled at the configured per-minute rates. Calls that do not fit wait
+in a queue ordered by priority, so interactive chat traffic is served before
+batch work. The priority is read from the ``llm_priority`` run metadata.
+"""
+
+import asyncio
+import enum
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from .tokens import estimate_tokens
+from .wrapper import ChatModelWrapper, run_metadata
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_METADATA_KEY = "llm_priority"
+
+
+class RequestPriority(str, enum.Enum):
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+    @property
+    def rank(self) -> int:
+        return 0 if self == RequestPriority.INTERACTIVE else 1
+
+
+class TokenBucket:
+    """A bucket holding up to one minute of quota, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        if per_minute <= 0:
+            raise ValueError(f"Invalid rate limit: {per_minute} per minute")
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.refill_per_second = self.capacity / 60
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.refill_per_second,
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available, capped at the bucket size."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+@dataclass
+class RateLimitStats:
+    requests: int = 0
+    queued: int = 0
+    delayed: int = 0
+    tokens: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    wait_seconds_by_priority: dict[str, float] = field(default_factory=dict)
+
+
+class RateLimiter:
+    """Request and token buckets shared by every call to an LLM type or endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        poll_interval: float = 0.05,
+    ):
+        self.name = name
+        self.quotas = (requests_per_minute, tokens_per_minute)
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self.poll_interval = poll_interval
+        self.stats = RateLimitStats()
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, priority: RequestPriority) -> tuple[int, int]:
+        ticket = (priority.rank, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            self.stats.queued += 1
+        return ticket
+
+    def _try_acquire(self, ticket: tuple[int, int], tokens: int) -> float:
+        """Take the quota if ``ticket`` is first in line, else return the delay."""
+        with self._lock:
+            if self._queue[0] != ticket:
+                return self.poll_interval
+            now = time.monotonic()
+            wait = max(
+                self.request_bucket.wait_time(1, now) if self.request_bucket else 0.0,
+                self.token_bucket.wait_time(tokens, now) if self.token_bucket else 0.0,
+            )
+            if wait > 0:
+                # Wake up early enough to yield to a later, more urgent call
+                return min(wait, 1.0)
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+            heapq.heappop(self._queue)
+            self.stats.queued -= 1
+            return 0.0
+
+    def _leave(self, ticket: tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self.stats.queued -= 1
+
+    def _record(self, priority: RequestPriority, tokens: int, wait: float) -> None:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.tokens += tokens
+            if wait > 0.001:
+                self.stats.delayed += 1
+            self.stats.total_wait_seconds += wait
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+            by_priority = self.stats.wait_seconds_by_priority
+            by_priority[priority.value] = by_priority.get(priority.value, 0.0) + wait
+        if wait > 1.0:
+            logger.info(
+                f"LLM call waited {wait:.2f}s for the {self.name} rate limit "
+                f"({priority.value}, {tokens} tokens)"
+            )
+
+    def acquire(
+        self, tokens: int, priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> float:
+        """Block until the call fits the quota, return the time spent waiting."""
+        started_at = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (delay := self._try_acquire(ticket, tokens)) > 0:
+                time.sleep(delay)
+        finally:
+            self._leave(ticket)
+        wait = time.monotonic() - started_at
+        self._record(priority, tokens, wait)
+        return wait
+
+    async def aacquire(
+        self, tokens: int, priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> float:
+        """Wait until the call fits the quota, return the time spent waiting."""
+        started_at = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while (delay := self._try_acquire(ticket, tokens)) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._leave(ticket)
+        wait = time.monotonic() - started_at
+        self._record(priority, tokens, wait)
+        return wait
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.stats.requests,
+                "queued": self.stats.queued,
+                "delayed": self.stats.delayed,
+                "tokens": self.stats.tokens,
+                "total_wait_seconds": self.stats.total_wait_seconds,
+                "max_wait_seconds": self.stats.max_wait_seconds,
+                "wait_seconds_by_priority": dict(self.stats.wait_seconds_by_priority),
+            }
+
+
+def _priority(run_manager: Any) -> RequestPriority:
+    value = run_metadata(run_manager).get(PRIORITY_METADATA_KEY)
+    try:
+        return RequestPriority(value) if value else RequestPriority.INTERACTIVE
+    except ValueError:
+        logger.warning(f"Unknown LLM priority {value}, using interactive")
+        return RequestPriority.INTERACTIVE
+
+
+class RateLimitedChatModel(ChatModelWrapper):
+    """A chat model whose calls wait for quota from a shared ``RateLimiter``."""
+
+    limiter: RateLimiter
+
+    def _tokens(self, messages: list[BaseMessage], **kwargs: Any) -> int:
+        return estimate_tokens(messages, kwargs.get("tools"))
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.limiter.acquire(self._tokens(messages, **kwargs), _priority(run_manager))
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await self.limiter.aacquire(
+            self._tokens(messages, **kwargs), _priority(run_manager)
+        )
+        return await super()._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self.limiter.acquire(self._tokens(messages, **kwargs), _priority(run_manager))
+        yield from super()._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await self.limiter.aacquire(
+            self._tokens(messages, **kwargs), _priority(run_manager)
+        )
+        async for chunk in super()._astream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            yield chunk
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def wrap_with_rate_limit(
+    llm: BaseChatModel,
+    rate_limit_conf: Optional[dict],
+    name: str,
+    limiters: Optional[dict[str, RateLimiter]] = None,
+) -> BaseChatModel:
+    """
+    Wrap a chat model with the rate limit described by a ``rate_limit`` section.
+
+    Args:
+        llm: The chat model to wrap
+        rate_limit_conf: ``requests_per_minute`` and/or ``tokens_per_minute``
+        name: The LLM type or endpoint the quota belongs to
+        limiters: The limiters to reuse and add to, default those of the process
+
+    Returns:
+        The rate limited chat model, or the model itself without a rate limit
+    """
+    if not rate_limit_conf:
+        return llm
+    if not isinstance(rate_limit_conf, dict):
+        raise ValueError(f"Invalid rate limit of {name}")
+    if limiters is None:
+        limiters = _limiters
+    limiter = limiters.get(name)
+    quotas = (
+        rate_limit_conf.get("requests_per_minute"),
+        rate_limit_conf.get("tokens_per_minute"),
+    )
+    # Rebuilt models keep the quota state unless a reload changed the quotas
+    if limiter is None or limiter.quotas != quotas:
+        limiters[name] = RateLimiter(
+            name, requests_per_minute=quotas[0], tokens_per_minute=quotas[1]
+        )
+    return RateLimitedChatModel(model=llm, limiter=limiters[name])
+
+
+def get_rate_limit_stats() -> dict[str, dict[str, Any]]:
+    """Return request counts and queue wait times of the LLM rate limiters."""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items()}
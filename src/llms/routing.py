@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Per-call model routing by agent, prompt size and request tier.
+
+The ``MODEL_ROUTING`` rules of conf.yaml are checked in order for every call of
+an agent, and the first matching rule picks the model section the call is sent
+to. Calls matching no rule use the agent's model from ``AGENT_LLM_MAP``. The
+request tier is read from the ``request_tier`` run metadata. Tiers select more
+expensive models, so the server decides them: requests get ``default_tier``
+and clients may only pick one of the ``request_tiers`` of the section.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from .tokens import estimate_tokens
+from .wrapper import ChatModelWrapper, run_metadata
+
+logger = logging.getLogger(__name__)
+
+TIER_METADATA_KEY = "request_tier"
+
+
+@dataclass
+class RoutingRule:
+    model: str
+    agents: Optional[list[str]] = None
+    tiers: Optional[list[str]] = None
+    min_prompt_tokens: Optional[int] = None
+    max_prompt_tokens: Optional[int] = None
+
+    def applies_to(self, agent: str) -> bool:
+        return self.agents is None or agent in self.agents
+
+    def matches(self, agent: str, prompt_tokens: int, tier: Optional[str]) -> bool:
+        return (
+            self.applies_to(agent)
+            and (self.tiers is None or tier in self.tiers)
+            and (
+                self.min_prompt_tokens is None
+                or prompt_tokens >= self.min_prompt_tokens
+            )
+            and (
+                self.max_prompt_tokens is None
+                or prompt_tokens <= self.max_prompt_tokens
+            )
+        )
+
+
+def parse_routing_rules(routing_conf: Optional[dict]) -> list[RoutingRule]:
+    """
+    Parse the ``MODEL_ROUTING`` section of conf.yaml.
+
+    Args:
+        routing_conf: The section, with a ``rules`` list
+
+    Returns:
+        The routing rules in evaluation order
+    """
+    rules = []
+    for index, rule_conf in enumerate((routing_conf or {}).get("rules") or []):
+        if not isinstance(rule_conf, dict) or not rule_conf.get("model"):
+            raise ValueError(f"Routing rule {index} needs a model")
+        try:
+            rules.append(RoutingRule(**rule_conf))
+        except TypeError as e:
+            raise ValueError(f"Invalid routing rule {index}: {e}")
+    return rules
+
+
+def resolve_request_tier(
+    routing_conf: Optional[dict], requested: Optional[str]
+) -> Optional[str]:
+    """
+    Return the tier of a request, checked against the ``MODEL_ROUTING`` section.
+
+    Args:
+        routing_conf: The section, with optional ``default_tier`` and
+            ``request_tiers`` entries
+        requested: The tier the client asked for, if any
+
+    Returns:
+        The requested tier, or ``default_tier`` if the client asked for none
+
+    Raises:
+        ValueError: Clients may not pick the requested tier
+    """
+    routing_conf = routing_conf or {}
+    if requested is None:
+        return routing_conf.get("default_tier")
+    if requested not in (routing_conf.get("request_tiers") or []):
+        raise ValueError(f"Unknown request tier: {requested}")
+    return requested
+
+
+_decisions: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+_decisions_lock = threading.Lock()
+
+
+class RoutedChatModel(ChatModelWrapper):
+    """
+    A chat model that sends each call of an agent to the model picked by rules.
+
+    ``model`` is the agent's default model, it defines tool binding and
+    structured output, so routing targets must accept the same formats.
+    """
+
+    agent: str
+    default_model_name: str
+    rules: list[RoutingRule]
+    resolve: Callable[[str], BaseChatModel]
+
+    def _route(
+        self, messages: list[BaseMessage], run_manager: Any, **kwargs: Any
+    ) -> ChatModelWrapper:
+        prompt_tokens = estimate_tokens(messages, kwargs.get("tools"))
+        tier = run_metadata(run_manager).get(TIER_METADATA_KEY)
+        model_name, reason = self.default_model_name, "default"
+        for index, rule in enumerate(self.rules):
+            if rule.matches(self.agent, prompt_tokens, tier):
+                model_name, reason = rule.model, f"rule {index}"
+                break
+        logger.info(
+            f"Model routing: agent={self.agent} prompt_tokens={prompt_tokens} "
+            f"tier={tier} model={model_name} reason={reason}"
+        )
+        with _decisions_lock:
+            _decisions[self.agent][model_name] += 1
+        model = self.model if model_name == self.default_model_name else None
+        return ChatModelWrapper(model=model or self.resolve(model_name))
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self._route(messages, run_manager, **kwargs)._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await self._route(messages, run_manager, **kwargs)._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self._route(messages, run_manager, **kwargs)._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self._route(messages, run_manager, **kwargs)._astream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            yield chunk
+
+
+def get_routing_stats() -> dict[str, dict[str, int]]:
+    """Return how many calls of each agent were routed to each model."""
+    with _decisions_lock:
+        return {agent: dict(models) for agent, models in _decisions.items()}
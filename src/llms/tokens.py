@@ -0,0 +1,118 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+from typing import Any, Sequence
+
+from langchain_core.messages import BaseMessage
+
+# Rough average for English text and code with BPE tokenizers
+CHARS_PER_TOKEN = 4
+# Role markers and separators added around each message
+TOKENS_PER_MESSAGE = 4
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text without running a tokenizer."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+        )
+    return str(content)
+
+
+def estimate_tokens(
+    messages: Sequence[BaseMessage | dict], tools: Sequence[dict] | None = None
+) -> int:
+    """
+    Estimate the prompt tokens of a message list.
+
+    Args:
+        messages: Chat messages, as message objects or role/content dicts
+        tools: Tool schemas bound to the call, they are part of the prompt too
+
+    Returns:
+        The estimated number of prompt tokens
+    """
+    total = 0
+    for message in messages:
+        content = (
+            message.get("content", "") if isinstance(message, dict) else message.content
+        )
+        total += TOKENS_PER_MESSAGE + estimate_text_tokens(_content_text(content))
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            total += estimate_text_tokens(json.dumps(tool_call.get("args", {})))
+    if tools:
+        total += estimate_text_tokens(json.dumps(tools, default=str))
+    return total
+
+
+def _role(message: BaseMessage | dict) -> str:
+    role = message.get("role", "") if isinstance(message, dict) else message.type
+    return {"user": "human", "assistant": "ai"}.get(role, role)
+
+
+def _turns(messages: Sequence[BaseMessage | dict]) -> list[list[BaseMessage | dict]]:
+    """Group messages so that tool results stay with the AI message calling them."""
+    turns: list[list[BaseMessage | dict]] = []
+    for message in messages:
+        if _role(message) == "tool" and turns and _role(turns[-1][0]) == "ai":
+            turns[-1].append(message)
+        else:
+            turns.append([message])
+    return turns
+
+
+def trim_to_token_budget(
+    messages: Sequence[BaseMessage | dict], max_tokens: int, reserved_tokens: int = 0
+) -> list[BaseMessage | dict]:
+    """
+    Drop the oldest turns of a conversation until it fits a token budget.
+
+    The latest user message and the last turn are always kept, so the result
+    can still exceed the budget. Dropped turns are replaced by a note.
+
+    Args:
+        messages: The conversation, without the system prompt
+        max_tokens: The token budget of the whole prompt
+        reserved_tokens: Tokens of the budget taken by the system prompt
+
+    Returns:
+        The messages that fit, or ``messages`` itself when nothing is dropped
+    """
+    turns = _turns(messages)
+    sizes = [estimate_tokens(turn) for turn in turns]
+    total = reserved_tokens + sum(sizes)
+    if total <= max_tokens:
+        return list(messages)
+    human_turns = [i for i, turn in enumerate(turns) if _role(turn[0]) == "human"]
+    pinned = {len(turns) - 1, *human_turns[-1:]}
+    # Older turns go first, then the turns following the latest user message
+    dropped = set()
+    for i in range(len(turns)):
+        if total <= max_tokens:
+            break
+        if i not in pinned:
+            dropped.add(i)
+            total -= sizes[i]
+    if not dropped:
+        return list(messages)
+    note = {
+        "role": "user",
+        "content": f"[{sum(len(turns[i]) for i in dropped)} earlier messages "
+        "were omitted to fit the context budget]",
+    }
+    trimmed: list[BaseMessage | dict] = []
+    for i, turn in enumerate(turns):
+        if i == min(dropped):
+            trimmed.append(note)
+        if i not in dropped:
+            trimmed.extend(turn)
+    return trimmed
@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+import logging
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import (
+    Runnable,
+    RunnableBinding,
+    RunnableSequence,
+    ensure_config,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_metadata(run_manager: Any) -> dict[str, Any]:
+    """Return the metadata of the current LLM run, e.g. set per request."""
+    metadata = getattr(run_manager, "metadata", None)
+    if metadata is None:
+        # Streaming calls get no run manager, read the config of the caller
+        metadata = ensure_config().get("metadata") or {}
+    return metadata
+
+
+def message_to_chunk(message: BaseMessage) -> ChatGenerationChunk:
+    """Convert a complete AI message into a single stream chunk."""
+    tool_call_chunks = [
+        {
+            "name": tool_call["name"],
+            "args": json.dumps(tool_call["args"], ensure_ascii=False),
+            "id": tool_call["id"],
+            "index": index,
+            "type": "tool_call_chunk",
+        }
+        for index, tool_call in enumerate(getattr(message, "tool_calls", []))
+    ]
+    return ChatGenerationChunk(
+        message=AIMessageChunk(
+            content=message.content,
+            additional_kwargs=message.additional_kwargs,
+            response_metadata=message.response_metadata,
+            usage_metadata=getattr(message, "usage_metadata", None),
+            tool_call_chunks=tool_call_chunks,
+            id=message.id,
+        )
+    )
+
+
+class ChatModelWrapper(BaseChatModel):
+    """
+    A chat model that delegates every call to another chat model.
+
+    Subclasses override the ``_generate``/``_stream`` family to add behaviour
+    around the wrapped model. Tool binding and structured output are routed
+    through the wrapper, so bound tools and response formats reach the wrapped
+    model as call kwargs.
+    """
+
+    model: BaseChatModel
+
+    def __init__(self, **kwargs: Any):
+        if "disable_streaming" not in kwargs and "model" in kwargs:
+            kwargs["disable_streaming"] = kwargs["model"].disable_streaming
+        super().__init__(**kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return self.model._llm_type
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return self.model._identifying_params
+
+    def _get_llm_string(self, stop: Optional[list[str]] = None, **kwargs: Any) -> str:
+        return self.model._get_llm_string(stop=stop, **kwargs)
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> Runnable:
+        binding = self.model.bind_tools(tools, **kwargs)
+        return self.bind(**binding.kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        structured = self.model.with_structured_output(schema, **kwargs)
+        # The wrapped model returns `model.bind(...) | parser`, swap the bound
+        # model for the wrapper so that the call goes through it.
+        if (
+            isinstance(structured, RunnableSequence)
+            and isinstance(structured.first, RunnableBinding)
+            and structured.first.bound is self.model
+        ):
+            return RunnableSequence(
+                self.bind(**structured.first.kwargs),
+                *structured.middle,
+                structured.last,
+            )
+        logger.warning(
+            f"Structured output of {self.model._llm_type} bypasses {type(self).__name__}"
+        )
+        return structured
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.model._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await self.model._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        if type(self.model)._stream == BaseChatModel._stream:
+            result = self.model._generate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            yield message_to_chunk(result.generations[0].message)
+            return
+        yield from self.model._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if (
+            type(self.model)._astream == BaseChatModel._astream
+            and type(self.model)._stream == BaseChatModel._stream
+        ):
+            result = await self.model._agenerate(
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            yield message_to_chunk(result.generations[0].message)
+            return
+        async for chunk in self.model._astream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            yield chunk
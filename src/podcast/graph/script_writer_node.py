@@ -5,8 +5,7 @@ import logging
 
 from langchain.schema import HumanMessage, SystemMessage
 
-from src.config.agents import AGENT_LLM_MAP
-from src.llms.llm import get_llm_by_type
+from src.llms.llm import get_llm_for_agent
 from src.prompts.template import get_prompt_template
 
 from ..types import Script
@@ -17,9 +16,9 @@ logger = logging.getLogger(__name__)
 
 def script_writer_node(state: PodcastState):
     logger.info("Generating script for podcast...")
-    model = get_llm_by_type(
-        AGENT_LLM_MAP["podcast_script_writer"]
-    ).with_structured_output(Script, method="json_mode")
+    model = get_llm_for_agent("podcast_script_writer").with_structured_output(
+        Script, method="json_mode"
+    )
     script = model.invoke(
         [
             SystemMessage(content=get_prompt_template("podcast/podcast_script_writer")),
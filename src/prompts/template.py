@@ -3,12 +3,41 @@
 
 import os
 import dataclasses
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Union
+from enum import Enum
+from typing import Any, Dict, Optional, Union
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    meta,
+    select_autoescape,
+)
 from langgraph.prebuilt.chat_agent_executor import AgentState
 from src.config.configuration import Configuration
+from src.llms.tokens import estimate_tokens, trim_to_token_budget
+from src.storage import resolve_message
+
+logger = logging.getLogger(__name__)
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    directory = os.getenv("PROMPT_BYTECODE_CACHE_DIR", ".cache/prompt_bytecode")
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Prompt bytecode cache disabled: {e}")
+        return None
+    return FileSystemBytecodeCache(directory)
+
 
 # Initialize Jinja2 environment
 env = Environment(
@@ -16,9 +45,158 @@ env = Environment(
     autoescape=select_autoescape(),
     trim_blocks=True,
     lstrip_blocks=True,
+    # Templates ship with the code, don't stat the file on every lookup
+    auto_reload=False,
 )
 
 
+@dataclass
+class TemplateStats:
+    renders: int = 0
+    cache_hits: int = 0
+    render_seconds: float = 0.0
+    max_render_seconds: float = 0.0
+
+
+_template_variables: dict[str, frozenset[str]] = {}
+_template_stats: dict[str, TemplateStats] = {}
+# Rendered prompts by template and the values of the variables it uses
+_render_cache: OrderedDict[tuple, str] = OrderedDict()
+_RENDER_CACHE_SIZE = 256
+_render_lock = threading.Lock()
+
+
+def _variables(template_name: str) -> frozenset[str]:
+    """Return the names of the variables a template references."""
+    variables = _template_variables.get(template_name)
+    if variables is None:
+        source = env.loader.get_source(env, template_name)[0]
+        variables = frozenset(meta.find_undeclared_variables(env.parse(source)))
+        _template_variables[template_name] = variables
+    return variables
+
+
+def precompile_prompt_templates() -> int:
+    """
+    Compile every prompt template, e.g. at server startup.
+
+    The compiled templates are kept in ``PROMPT_BYTECODE_CACHE_DIR`` to survive
+    restarts. The directory is created here rather than on import, so that
+    importing the prompts has no side effects on the working directory.
+
+    Returns:
+        The number of compiled templates
+    """
+    if env.bytecode_cache is None:
+        env.bytecode_cache = _bytecode_cache()
+    names = env.list_templates(extensions=["md"])
+    for name in names:
+        env.get_template(name)
+        _variables(name)
+    return len(names)
+
+
+def render_prompt_template(prompt_name: str, variables: Dict[str, Any]) -> str:
+    """
+    Render a prompt template, reusing earlier renders with the same values.
+
+    Args:
+        prompt_name: Name of the prompt template file (without .md extension)
+        variables: Template variables, only those the template uses matter
+
+    Returns:
+        The rendered prompt
+    """
+    template_name = f"{prompt_name}.md"
+    key: Optional[tuple] = (
+        template_name,
+        tuple(
+            sorted(
+                (name, variables[name])
+                for name in _variables(template_name)
+                if name in variables
+            )
+        ),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        key = None
+    with _render_lock:
+        stats = _template_stats.setdefault(prompt_name, TemplateStats())
+        if key is not None and key in _render_cache:
+            _render_cache.move_to_end(key)
+            stats.cache_hits += 1
+            return _render_cache[key]
+
+    started_at = time.perf_counter()
+    rendered = env.get_template(template_name).render(**variables)
+    elapsed = time.perf_counter() - started_at
+    with _render_lock:
+        stats.renders += 1
+        stats.render_seconds += elapsed
+        stats.max_render_seconds = max(stats.max_render_seconds, elapsed)
+        if key is not None:
+            _render_cache[key] = rendered
+            if len(_render_cache) > _RENDER_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+    return rendered
+
+
+def get_prompt_template_stats() -> dict[str, dict[str, Any]]:
+    """Return render counts, cache hits and render times per prompt template."""
+    with _render_lock:
+        return {
+            name: {
+                "renders": stats.renders,
+                "cache_hits": stats.cache_hits,
+                "mean_render_ms": 1000 * stats.render_seconds / max(stats.renders, 1),
+                "max_render_ms": 1000 * stats.max_render_seconds,
+            }
+            for name, stats in _template_stats.items()
+        }
+
+
+class PromptLayout(str, Enum):
+    # Volatile values are rendered into the system prompt
+    INLINE = "inline"
+    # The system prompt is byte-stable, volatile values follow it in a message
+    PREFIX_CACHE = "prefix_cache"
+
+
+# Template variables that change between calls of the same prompt
+VOLATILE_PROMPT_VARIABLES = ("CURRENT_TIME", "locale")
+
+
+def get_prompt_layout() -> PromptLayout:
+    """Return the prompt layout set by ``PROMPT_LAYOUT``."""
+    value = os.getenv("PROMPT_LAYOUT", PromptLayout.INLINE.value)
+    try:
+        return PromptLayout(value.lower())
+    except ValueError:
+        raise ValueError(f"Invalid prompt layout: {value}")
+
+
+def get_prompt_token_budget(prompt_name: str) -> int:
+    """
+    Return the prompt token budget of an agent, 0 for no budget.
+
+    ``PROMPT_TOKEN_BUDGET_<PROMPT NAME>``, e.g. ``PROMPT_TOKEN_BUDGET_PLANNER``,
+    overrides ``PROMPT_TOKEN_BUDGET`` for a single prompt.
+    """
+    name = f"PROMPT_TOKEN_BUDGET_{prompt_name.upper()}"
+    value = os.getenv(name, os.getenv("PROMPT_TOKEN_BUDGET", "0"))
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid prompt token budget of {prompt_name}: {value}")
+
+
+def _runtime_context_message(volatile_vars: Dict[str, Any]) -> dict:
+    lines = [f"- {name}: {value}" for name, value in volatile_vars.items()]
+    return {"role": "user", "content": "Runtime Context:\n" + "\n".join(lines)}
+
+
 def get_prompt_template(prompt_name: str) -> str:
     """
     Load and return a prompt template using Jinja2.
@@ -30,8 +208,7 @@ def get_prompt_template(prompt_name: str) -> str:
         The template string with proper variable substitution syntax
     """
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        return template.render()
+        return render_prompt_template(prompt_name, {})
     except Exception as e:
         raise ValueError(f"Error loading template {prompt_name}: {e}")
 
@@ -48,21 +225,59 @@ def apply_prompt_template(
         configurable: Configuration object with additional settings
 
     Returns:
-        List of messages with the system prompt as the first message
+        List of messages with the system prompt as the first message, followed
+        by a runtime context message with the ``PREFIX_CACHE`` layout and the
+        messages of the state
     """
+    layout = get_prompt_layout()
+    if layout == PromptLayout.PREFIX_CACHE:
+        # Hour resolution, so the runtime context repeats within the hour
+        current_time = datetime.now().strftime("%a %b %d %Y %H:00 %z")
+    else:
+        current_time = datetime.now().strftime("%a %b %d %Y %H:%M:%S %z")
+
     # Convert state to dict for template rendering
     state_vars = {
-        "CURRENT_TIME": datetime.now().strftime("%a %b %d %Y %H:%M:%S %z"),
+        "CURRENT_TIME": current_time,
         **state,
     }
 
-    # Add configurable variables
+    # Add configurable variables, without the deep copy of dataclasses.asdict
     if configurable:
-        state_vars.update(dataclasses.asdict(configurable))
+        state_vars.update(
+            (field.name, getattr(configurable, field.name))
+            for field in dataclasses.fields(configurable)
+        )
+
+    volatile_vars = {}
+    if layout == PromptLayout.PREFIX_CACHE:
+        # Keep the system prompt identical across calls for provider prefix
+        # caching, the templates refer to the runtime context message instead
+        for name in VOLATILE_PROMPT_VARIABLES:
+            if name in state_vars:
+                volatile_vars[name] = state_vars.pop(name)
+        state_vars["runtime_context"] = True
 
     try:
-        template = env.get_template(f"{prompt_name}.md")
-        system_prompt = template.render(**state_vars)
-        return [{"role": "system", "content": system_prompt}] + state["messages"]
+        system_prompt = render_prompt_template(prompt_name, state_vars)
+        messages = [resolve_message(message) for message in state["messages"]]
+        context = [_runtime_context_message(volatile_vars)] if volatile_vars else []
+        system_message = {"role": "system", "content": system_prompt}
+        reserved_tokens = estimate_tokens([system_message] + context)
+        prompt_tokens = reserved_tokens + estimate_tokens(messages)
+        budget = get_prompt_token_budget(prompt_name)
+        if budget and prompt_tokens > budget:
+            untrimmed_tokens = prompt_tokens
+            messages = trim_to_token_budget(messages, budget, reserved_tokens)
+            prompt_tokens = reserved_tokens + estimate_tokens(messages)
+            logger.info(
+                f"{prompt_name} prompt: ~{prompt_tokens} tokens, trimmed from "
+                f"~{untrimmed_tokens} to fit the budget of {budget}"
+            )
+        else:
+            logger.info(f"{prompt_name} prompt: ~{prompt_tokens} tokens")
+        # The context precedes the conversation, so that the last message is
+        # still the latest turn
+        return [system_message] + context + messages
     except Exception as e:
         raise ValueError(f"Error applying template {prompt_name}: {e}")
@@ -5,8 +5,7 @@ import logging
 
 from langchain.schema import HumanMessage, SystemMessage
 
-from src.config.agents import AGENT_LLM_MAP
-from src.llms.llm import get_llm_by_type
+from src.llms.llm import get_llm_for_agent
 from src.prompts.template import get_prompt_template
 from src.prose.graph.state import ProseState
 
@@ -15,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 def prose_fix_node(state: ProseState):
     logger.info("Generating prose fix content...")
-    model = get_llm_by_type(AGENT_LLM_MAP["prose_writer"])
+    model = get_llm_for_agent("prose_writer")
     prose_content = model.invoke(
         [
             SystemMessage(content=get_prompt_template("prose/prose_fix")),
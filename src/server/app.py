@@ -1,11 +1,12 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import json
 import logging
 import os
-from typing import List, cast
+from typing import List, Optional, cast
 from uuid import uuid4
 
 from fastapi import FastAPI, HTTPException
@@ -14,9 +15,23 @@ from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, ToolMessage, BaseMessage
 from langgraph.types import Command
 
+from src.config.reload import ConfigReloader
+from src.crawler import (
+    get_crawl_cache_stats,
+    get_crawl_scheduler_stats,
+    get_process_pool_stats,
+    shutdown_process_pool,
+)
 from src.graph.builder import build_graph_with_memory
+from src.llms.cache import get_cache_stats
+from src.llms.hedge import get_hedge_stats
+from src.llms.llm import CONF_PATH, get_request_tier, reload_llms
+from src.llms.pool import get_pool_stats
+from src.llms.rate_limit import PRIORITY_METADATA_KEY, get_rate_limit_stats
+from src.llms.routing import TIER_METADATA_KEY, get_routing_stats
 from src.podcast.graph.builder import build_graph as build_podcast_graph
 from src.ppt.graph.builder import build_graph as build_ppt_graph
+from src.prompts.template import get_prompt_template_stats, precompile_prompt_templates
 from src.prose.graph.builder import build_graph as build_prose_graph
 from src.server.chat_request import (
     ChatMessage,
@@ -29,6 +44,17 @@ from src.server.chat_request import (
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
 from src.server.mcp_utils import load_mcp_tools
 from src.tools import VolcengineTTS
+from src.tools.fetch_registry import get_fetch_registry_stats
+from src.tools.search_cache import get_search_cache_stats
+from src.tracing import (
+    AGENT_METADATA_KEY,
+    ChromeTraceCallback,
+    PromptCacheCallback,
+    get_prompt_cache_stats,
+    should_trace,
+    wait_for_trace_writes,
+)
+from src.utils.http_client import close_http_clients, get_http_client_stats
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +76,40 @@ app.add_middleware(
 graph = build_graph_with_memory()
 
 
+config_reloader = ConfigReloader(CONF_PATH, reload_llms)
+
+
+@app.on_event("startup")
+async def startup():
+    precompile_prompt_templates()
+    # Reload conf.yaml on SIGHUP, and on changes when CONFIG_WATCH_INTERVAL is set
+    config_reloader.install_signal_handler()
+    watch_interval = float(os.getenv("CONFIG_WATCH_INTERVAL", "0"))
+    if watch_interval > 0:
+        app.state.config_watch = asyncio.create_task(
+            config_reloader.watch(watch_interval)
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if getattr(app.state, "config_watch", None):
+        app.state.config_watch.cancel()
+    await close_http_clients()
+    await asyncio.to_thread(shutdown_process_pool)
+    await asyncio.to_thread(wait_for_trace_writes)
+
+
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     thread_id = request.thread_id
     if thread_id == "__default__":
         thread_id = str(uuid4())
+    try:
+        # Tiers pick more expensive models, clients only get those allowed
+        tier = get_request_tier(request.tier)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return StreamingResponse(
         _astream_workflow_generator(
             request.model_dump()["messages"],
@@ -66,6 +121,9 @@ async def chat_stream(request: ChatRequest):
             request.interrupt_feedback,
             request.mcp_settings,
             request.enable_background_investigation,
+            request.enable_tracing,
+            request.priority,
+            tier,
         ),
         media_type="text/event-stream",
     )
@@ -81,6 +139,9 @@ async def _astream_workflow_generator(
     interrupt_feedback: str,
     mcp_settings: dict,
     enable_background_investigation,
+    enable_tracing: Optional[bool] = None,
+    priority: Optional[str] = None,
+    tier: Optional[str] = None,
 ):
     input_ = {
         "messages": messages,
@@ -97,7 +158,10 @@ async def _astream_workflow_generator(
         if messages:
             resume_msg += f" {messages[-1]['content']}"
         input_ = Command(resume=resume_msg)
-    async for agent, _, event_data in graph.astream(
+    callbacks = [PromptCacheCallback()]
+    if should_trace(thread_id, enable_tracing):
+        callbacks.append(ChromeTraceCallback(thread_id))
+    async for agent, stream_mode, event_data in graph.astream(
         input_,
         config={
             "thread_id": thread_id,
@@ -105,10 +169,38 @@ async def _astream_workflow_generator(
             "max_step_num": max_step_num,
             "max_search_results": max_search_results,
             "mcp_settings": mcp_settings,
+            "callbacks": callbacks,
+            "metadata": {
+                PRIORITY_METADATA_KEY: priority or "interactive",
+                TIER_METADATA_KEY: tier,
+            },
         },
-        stream_mode=["messages", "updates"],
+        stream_mode=["messages", "updates", "custom"],
         subgraphs=True,
     ):
+        if stream_mode == "custom":
+            if event_data.get("type") == "plan_update":
+                # Partial plan parsed from the planner's streamed output
+                yield _make_event(
+                    "plan_update",
+                    {
+                        "thread_id": thread_id,
+                        "agent": "planner",
+                        "id": event_data["id"],
+                        "role": "assistant",
+                        "plan": event_data["plan"],
+                    },
+                )
+            elif event_data.get("type") == "crawl_progress":
+                # A url of a crawl_many_tool call finished
+                yield _make_event(
+                    "crawl_progress",
+                    {
+                        "thread_id": thread_id,
+                        **{k: v for k, v in event_data.items() if k != "type"},
+                    },
+                )
+            continue
         if isinstance(event_data, dict):
             if "__interrupt__" in event_data:
                 yield _make_event(
@@ -131,7 +223,8 @@ async def _astream_workflow_generator(
         )
         event_stream_message: dict[str, any] = {
             "thread_id": thread_id,
-            "agent": agent[0].split(":")[0],
+            "agent": message_metadata.get(AGENT_METADATA_KEY)
+            or agent[0].split(":")[0],
             "id": message_chunk.id,
             "role": "assistant",
             "content": message_chunk.content,
@@ -162,6 +255,8 @@ async def _astream_workflow_generator(
             else:
                 # AI Message - Raw message tokens
                 yield _make_event("message_chunk", event_stream_message)
+    if fetch_stats := get_fetch_registry_stats(thread_id):
+        logger.info(f"Searches and crawls of thread {thread_id}: {fetch_stats}")
 
 
 def _make_event(event_type: str, data: dict[str, any]):
@@ -320,3 +415,49 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
             logger.exception(f"Error in MCP server metadata endpoint: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
         raise
+
+
+@app.get("/api/llm/stats")
+async def llm_stats():
+    """Get statistics of the LLM pools, limits, hedging, routing, caches, reloads."""
+    return {
+        "pools": get_pool_stats(),
+        "rate_limits": get_rate_limit_stats(),
+        "hedging": get_hedge_stats(),
+        "routing": get_routing_stats(),
+        "cache": get_cache_stats(),
+        "config_reloads": config_reloader.get_stats(),
+        "prompt_cache": get_prompt_cache_stats(),
+        "prompt_templates": get_prompt_template_stats(),
+    }
+
+
+@app.get("/api/http/stats")
+async def http_stats():
+    """Get request counts and connection pool utilization of the HTTP clients."""
+    return get_http_client_stats()
+
+
+@app.get("/api/crawl/stats")
+async def crawl_stats():
+    """Get the crawl cache counters, the scheduler queues and the process pool."""
+    return {
+        "cache": get_crawl_cache_stats(),
+        "scheduler": get_crawl_scheduler_stats(),
+        "process_pool": get_process_pool_stats(),
+    }
+
+
+@app.get("/api/search/stats")
+async def search_stats():
+    """Get hit/miss counters and the size of the search cache."""
+    return get_search_cache_stats()
+
+
+@app.get("/api/chat/{thread_id}/fetch/stats")
+async def fetch_stats(thread_id: str):
+    """Get the searches and crawls of a conversation and how many were repeated."""
+    stats = get_fetch_registry_stats(thread_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Unknown thread")
+    return stats
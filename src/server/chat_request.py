@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -53,6 +53,18 @@ class ChatRequest(BaseModel):
     enable_background_investigation: Optional[bool] = Field(
         True, description="Whether to get background investigation before plan"
     )
+    enable_tracing: Optional[bool] = Field(
+        None,
+        description="Whether to write a timeline trace of the run, defaults to sampling by TRACE_SAMPLE_RATE",
+    )
+    priority: Optional[Literal["interactive", "batch"]] = Field(
+        "interactive",
+        description="Queue priority of the LLM calls when a rate limit is reached, interactive is the highest and the default, so clients can only lower it",
+    )
+    tier: Optional[str] = Field(
+        None,
+        description="Request tier matched by the MODEL_ROUTING rules, one of its request_tiers, defaults to its default_tier",
+    )
 
 
 class TTSRequest(BaseModel):
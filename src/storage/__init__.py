@@ -0,0 +1,20 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from .blob_store import (
+    BlobStore,
+    get_blob_store,
+    is_blob_ref,
+    offload,
+    resolve,
+    resolve_message,
+)
+
+__all__ = [
+    "BlobStore",
+    "get_blob_store",
+    "is_blob_ref",
+    "offload",
+    "resolve",
+    "resolve_message",
+]
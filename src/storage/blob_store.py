@@ -0,0 +1,188 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Content-addressed blob store for large payloads kept out of graph state.
+
+Step results, observations and raw search results can be tens of kilobytes each
+and are re-serialized into every checkpoint. Instead of keeping them inline, the
+graph stores them here and only keeps a short reference (``blob://sha256/<hex>``)
+in its state. Identical payloads are written once.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Any, Optional, Union
+
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+BLOB_REF_PREFIX = "blob://sha256/"
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+
+class BlobStore:
+    """
+    Filesystem-backed, content-addressed blob store.
+
+    Blobs are stored under ``<root>/<first two hex chars>/<digest>`` and are
+    immutable, so concurrent writers of the same content are harmless.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize the blob store.
+
+        Args:
+            root: Directory in which blobs are stored, created on demand
+        """
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, data: Union[str, bytes]) -> str:
+        """
+        Store data and return its reference. Existing content is not rewritten.
+
+        Args:
+            data: The payload to store, strings are encoded as UTF-8
+
+        Returns:
+            The blob reference for the payload
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return f"{BLOB_REF_PREFIX}{digest}"
+
+    def get_bytes(self, ref: str) -> bytes:
+        """
+        Read the raw bytes of a blob.
+
+        Args:
+            ref: A blob reference returned by ``put``
+
+        Returns:
+            The stored payload
+
+        Raises:
+            ValueError: If the reference is malformed
+            FileNotFoundError: If the blob does not exist
+        """
+        if not is_blob_ref(ref):
+            raise ValueError(f"Invalid blob reference: {ref}")
+        with open(self._path(ref.removeprefix(BLOB_REF_PREFIX)), "rb") as f:
+            return f.read()
+
+    def get(self, ref: str) -> str:
+        """Read a blob as UTF-8 text."""
+        return self.get_bytes(ref).decode("utf-8")
+
+    def exists(self, ref: str) -> bool:
+        """Check whether a blob exists."""
+        return is_blob_ref(ref) and os.path.exists(
+            self._path(ref.removeprefix(BLOB_REF_PREFIX))
+        )
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def _is_enabled() -> bool:
+    return os.getenv("BLOB_STORE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def _min_size() -> int:
+    try:
+        return int(os.getenv("BLOB_STORE_MIN_SIZE", "2048"))
+    except ValueError:
+        logger.warning("Invalid BLOB_STORE_MIN_SIZE, using default value 2048.")
+        return 2048
+
+
+def get_blob_store() -> BlobStore:
+    """Get the process-wide blob store configured by ``BLOB_STORE_DIR``."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(os.getenv("BLOB_STORE_DIR", ".cache/blobs"))
+    return _blob_store
+
+
+def offload(content: Any) -> Any:
+    """
+    Move a large string payload into the blob store.
+
+    Args:
+        content: The payload, only strings of at least ``BLOB_STORE_MIN_SIZE``
+            bytes are offloaded
+
+    Returns:
+        A blob reference, or the original content if it was not offloaded
+    """
+    if not _is_enabled() or not isinstance(content, str) or is_blob_ref(content):
+        return content
+    if len(content.encode("utf-8")) < _min_size():
+        return content
+    try:
+        return get_blob_store().put(content)
+    except OSError as e:
+        logger.warning(f"Failed to offload payload to blob store: {e}")
+        return content
+
+
+def resolve(content: Any) -> Any:
+    """
+    Resolve a blob reference back to its payload.
+
+    Args:
+        content: A blob reference or any other value
+
+    Returns:
+        The stored payload for references, otherwise the value unchanged
+    """
+    if not is_blob_ref(content):
+        return content
+    try:
+        return get_blob_store().get(content)
+    except FileNotFoundError:
+        logger.error(f"Blob not found: {content}")
+        return content
+
+
+def resolve_message(message: Any) -> Any:
+    """
+    Return a copy of a message whose blob reference content is resolved.
+
+    Args:
+        message: A LangChain message or a message dict
+
+    Returns:
+        The message itself if its content is not a blob reference
+    """
+    if isinstance(message, BaseMessage):
+        if is_blob_ref(message.content):
+            return message.model_copy(update={"content": resolve(message.content)})
+    elif isinstance(message, dict) and is_blob_ref(message.get("content")):
+        return {**message, "content": resolve(message["content"])}
+    return message
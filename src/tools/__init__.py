@@ -3,13 +3,14 @@
 
 import os
 
-from .crawl import crawl_tool
+from .crawl import crawl_many_tool, crawl_tool
 from .python_repl import python_repl_tool
 from .search import get_web_search_tool
 from .tts import VolcengineTTS
 
 __all__ = [
     "crawl_tool",
+    "crawl_many_tool",
     "python_repl_tool",
     "get_web_search_tool",
     "VolcengineTTS",
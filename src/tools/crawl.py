@@ -2,27 +2,126 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from typing import Annotated
+import os
+from typing import Annotated, Optional
 
+from langchain_core.runnables import ensure_config
 from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
 from .decorators import log_io
 
-from src.crawler import Crawler
+from src.crawler import Article, Crawler, crawl_many
+from src.crawler.passages import CRAWL_QUERY_METADATA_KEY, relevant_content
+from src.crawler.process_pool import arun_cpu_bound, run_cpu_bound
+from src.tracing import AGENT_METADATA_KEY
+
+from .fetch_registry import FetchRecord, earlier_result_note, get_fetch_registry
 
 logger = logging.getLogger(__name__)
 
 
+def _crawl_query(query: Optional[str]) -> Optional[str]:
+    """Return the query, or the task of the step the tool was called for."""
+    return query or ensure_config().get("metadata", {}).get(CRAWL_QUERY_METADATA_KEY)
+
+
+def _content_args(article: Article, query: Optional[str]) -> tuple:
+    """Return the arguments of ``relevant_content`` for a crawled article."""
+    return (
+        article,
+        query,
+        int(os.getenv("CRAWL_CONTENT_CHARS", "1000")),
+        int(os.getenv("CRAWL_PASSAGE_CHARS", "400")),
+        int(os.getenv("CRAWL_PASSAGE_SCAN_CHARS", "100000")),
+    )
+
+
+def _registered_entry(url: str, record: FetchRecord) -> dict:
+    """Return the result of a url that was crawled before in the research run."""
+    logger.info(f"{url} was already crawled by step '{record.step}'")
+    if note := earlier_result_note(record):
+        return {"url": url, "note": note}
+    return {"url": url, "crawled_content": record.result}
+
+
 @tool
 @log_io
 def crawl_tool(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[
+        Optional[str], "What to look for on the page, defaults to the current task."
+    ] = None,
 ) -> str:
-    """Use this to crawl a url and get a readable content in markdown format."""
+    """Use this to crawl a url and get the passages of its content relevant to the query in markdown format."""
     try:
+        query = _crawl_query(query)
+        registry = get_fetch_registry()
+        # A page is crawled again when it is read for something else
+        if registry and (record := registry.lookup_crawl(url, query)):
+            return _registered_entry(url, record)
         crawler = Crawler()
         article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        content = run_cpu_bound(
+            relevant_content,
+            *_content_args(article, query),
+            size=len(article.html_content or ""),
+        )
+        if registry:
+            registry.record_crawl(url, query, content)
+        return {"url": url, "crawled_content": content}
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+@tool
+@log_io
+async def crawl_many_tool(
+    urls: Annotated[list[str], "The urls to crawl."],
+    query: Annotated[
+        Optional[str], "What to look for on the pages, defaults to the current task."
+    ] = None,
+) -> list[dict]:
+    """Use this to crawl several urls at once and get the passages of their content relevant to the query in markdown format."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        # Called outside of a graph run
+        writer = None
+    query = _crawl_query(query)
+    registry = get_fetch_registry()
+    results = []
+    pending = []
+    for url in dict.fromkeys(urls):
+        if registry and (record := registry.lookup_crawl(url, query)):
+            results.append({**_registered_entry(url, record), "latency_ms": 0})
+        else:
+            pending.append(url)
+    async for result in crawl_many(pending):
+        entry = {"url": result.url, "latency_ms": round(result.latency_seconds * 1000)}
+        if result.article is not None:
+            entry["crawled_content"] = await arun_cpu_bound(
+                relevant_content,
+                *_content_args(result.article, query),
+                size=len(result.article.html_content or ""),
+            )
+            if registry:
+                registry.record_crawl(result.url, query, entry["crawled_content"])
+        else:
+            entry["error"] = f"Failed to crawl. Error: {result.error}"
+        results.append(entry)
+        if writer:
+            # Progress of the batch while the other urls are still crawled
+            writer(
+                {
+                    "type": "crawl_progress",
+                    "agent": ensure_config()["metadata"].get(AGENT_METADATA_KEY),
+                    "url": result.url,
+                    "latency_ms": entry["latency_ms"],
+                    "error": result.error,
+                    "completed": len(results),
+                    "total": len(set(urls)),
+                }
+            )
+    return results
@@ -1,14 +1,22 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
 import functools
-from typing import Any, Callable, Type, TypeVar
+import inspect
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Type, TypeVar
+
+from .fetch_registry import FetchRegistry, earlier_result_note, get_fetch_registry
+from .search_cache import get_search_cache, search_cache_key, search_params
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+_searching_async: ContextVar[bool] = ContextVar("searching_async", default=False)
+
 
 def log_io(func: Callable) -> Callable:
     """
@@ -21,20 +29,33 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    def log_call(args: tuple, kwargs: dict) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
-        logger.info(f"Tool {func_name} called with parameters: {params}")
+        logger.info(f"Tool {func.__name__} called with parameters: {params}")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_call(args, kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func.__name__} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_call(args, kwargs)
 
         # Execute the function
         result = func(*args, **kwargs)
 
         # Log the output
-        logger.info(f"Tool {func_name} returned: {result}")
+        logger.info(f"Tool {func.__name__} returned: {result}")
 
         return result
 
@@ -79,3 +100,135 @@ def create_logged_tool(base_tool_class: Type[T]) -> Type[T]:
     # Set a more descriptive name for the class
     LoggedTool.__name__ = f"Logged{base_tool_class.__name__}"
     return LoggedTool
+
+
+def _found(tool: Any, result: Any) -> bool:
+    """Return whether a search result is worth keeping."""
+    # Searches with an artifact return an empty one when they failed
+    return tool.response_format != "content_and_artifact" or bool(result[1])
+
+
+class DeduplicatedSearchMixin:
+    """
+    A mixin class that answers repeated searches of a research run from its
+    fetch registry.
+    """
+
+    def _registered(self, registry: FetchRegistry, query: str) -> Any:
+        record = registry.lookup_search(self.name, query)
+        if record is None:
+            return None
+        logger.info(f"Search '{query}' was already made by step '{record.step}'")
+        note = earlier_result_note(record)
+        if note is None:
+            return record.result
+        return (note, []) if self.response_format == "content_and_artifact" else note
+
+    def _register(self, registry: FetchRegistry, query: str, result: Any) -> None:
+        if _found(self, result):
+            registry.record_search(self.name, query, result)
+
+    def _run(self, query: str, run_manager: Any = None, **kwargs: Any) -> Any:
+        # Async searches of tools without _arun run _run in a thread
+        registry = None if _searching_async.get() else get_fetch_registry()
+        if registry is None:
+            return super()._run(query, run_manager=run_manager, **kwargs)
+        result = self._registered(registry, query)
+        if result is None:
+            result = super()._run(query, run_manager=run_manager, **kwargs)
+            self._register(registry, query, result)
+        return result
+
+    async def _arun(self, query: str, run_manager: Any = None, **kwargs: Any) -> Any:
+        registry = get_fetch_registry()
+        if registry is not None:
+            result = self._registered(registry, query)
+            if result is not None:
+                return result
+        token = _searching_async.set(True)
+        try:
+            result = await super()._arun(query, run_manager=run_manager, **kwargs)
+        finally:
+            _searching_async.reset(token)
+        if registry is not None:
+            self._register(registry, query, result)
+        return result
+
+
+def create_deduplicated_tool(base_tool_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class that does not
+    repeat the searches of a research run.
+
+    Args:
+        base_tool_class: The search tool class, whose first argument is the query
+
+    Returns:
+        A new class that inherits from both DeduplicatedSearchMixin and the base
+        tool class
+    """
+
+    class DeduplicatedTool(DeduplicatedSearchMixin, base_tool_class):
+        pass
+
+    DeduplicatedTool.__name__ = base_tool_class.__name__
+    return DeduplicatedTool
+
+
+class CachedSearchMixin:
+    """A mixin class that serves search results from the search cache."""
+
+    def _cached(self, query: str) -> tuple[Optional[str], Any]:
+        cache = get_search_cache()
+        if cache is None:
+            return None, None
+        key = search_cache_key(type(self).__name__, query, search_params(self))
+        result = cache.get(key)
+        if result is not None and self.response_format == "content_and_artifact":
+            result = tuple(result)
+        return key, result
+
+    def _cache(self, key: Optional[str], result: Any) -> None:
+        if key is not None and _found(self, result):
+            get_search_cache().put(key, result)
+
+    def _run(self, query: str, run_manager: Any = None, **kwargs: Any) -> Any:
+        if _searching_async.get():
+            return super()._run(query, run_manager=run_manager, **kwargs)
+        key, result = self._cached(query)
+        if result is None:
+            result = super()._run(query, run_manager=run_manager, **kwargs)
+            self._cache(key, result)
+        return result
+
+    async def _arun(self, query: str, run_manager: Any = None, **kwargs: Any) -> Any:
+        # SQLite lookups and writes would block the event loop
+        key, result = await asyncio.to_thread(self._cached, query)
+        if result is not None:
+            return result
+        token = _searching_async.set(True)
+        try:
+            result = await super()._arun(query, run_manager=run_manager, **kwargs)
+        finally:
+            _searching_async.reset(token)
+        await asyncio.to_thread(self._cache, key, result)
+        return result
+
+
+def create_cached_tool(base_tool_class: Type[T]) -> Type[T]:
+    """
+    Factory function to create a version of a search tool class that serves its
+    results from the search cache.
+
+    Args:
+        base_tool_class: The search tool class, whose first argument is the query
+
+    Returns:
+        A new class that inherits from both CachedSearchMixin and the base tool class
+    """
+
+    class CachedTool(CachedSearchMixin, base_tool_class):
+        pass
+
+    CachedTool.__name__ = base_tool_class.__name__
+    return CachedTool
@@ -0,0 +1,59 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+An offline web search, the ``fake`` search engine of ``SEARCH_API``.
+"""
+
+import asyncio
+import time
+from typing import Optional, Type
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.utils.synthetic import env_float, synthetic_text
+
+
+class _SearchInput(BaseModel):
+    query: str = Field(description="search query to look up")
+
+
+class FakeSearchTool(BaseTool):
+    """A web search tool that returns synthetic results after ``latency`` seconds."""
+
+    name: str = "web_search"
+    description: str = "A search engine. Input should be a search query."
+    args_schema: Type[BaseModel] = _SearchInput
+    max_results: int = 3
+    latency: float = Field(
+        default_factory=lambda: env_float("FAKE_SEARCH_LATENCY", 0.0)
+    )
+    content_tokens: int = 200
+
+    def _results(self, query: str) -> list[dict]:
+        return [
+            {
+                "type": "page",
+                "title": f"Result {i + 1} for {query}",
+                "url": f"https://example.com/{abs(hash(query)) % 1000}/{i}",
+                "content": synthetic_text(self.content_tokens, i),
+            }
+            for i in range(self.max_results)
+        ]
+
+    def _run(
+        self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
+    ) -> list[dict]:
+        time.sleep(self.latency)
+        return self._results(query)
+
+    async def _arun(
+        self, query: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None
+    ) -> list[dict]:
+        await asyncio.sleep(self.latency)
+        return self._results(query)
@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+The searches and crawls of a research run, so that they are not repeated.
+
+Researchers of different plan steps often search near-identical queries and
+crawl the same URLs. The search and crawl tools record their results in the
+``FetchRegistry`` of the conversation (the ``thread_id`` of the run) and look
+it up before they go to the network. A repeated call in the same step gets a
+short note, since its result is already in the agent's messages. A call of a
+later step gets the recorded result, as the agent of that step only sees the
+findings of the earlier steps. Crawls are recorded per URL and query, as their
+result holds the passages of the page relevant to the query.
+
+Registries are kept in memory for the ``FETCH_REGISTRY_MAX_THREADS`` most
+recently used conversations (default 100).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from langchain_core.runnables import ensure_config
+
+from src.crawler.cache import normalize_url
+from src.tracing import STEP_METADATA_KEY
+
+
+def normalize_query(query: str) -> str:
+    """
+    Return a key that is the same for queries that only differ in case or spacing.
+
+    Word order, repeated words and symbols are kept, as "C++ tutorial" and
+    "C# tutorial" or "python vs rust" and "rust vs python" are different searches.
+    """
+    return " ".join(query.casefold().split())
+
+
+def _crawl_key(url: str, query: Optional[str]) -> tuple[str, str]:
+    return normalize_url(url), normalize_query(query or "")
+
+
+@dataclass
+class FetchRecord:
+    result: Any
+    # The plan step (or graph node) that fetched the result
+    step: Optional[str]
+
+
+@dataclass
+class FetchRegistryStats:
+    searches: int = 0
+    search_hits: int = 0
+    crawls: int = 0
+    crawl_hits: int = 0
+
+
+@dataclass
+class FetchRegistry:
+    searches: dict[str, FetchRecord] = field(default_factory=dict)
+    # Keyed by the url and the query that the passages of the page were taken for
+    crawls: dict[tuple[str, str], FetchRecord] = field(default_factory=dict)
+    stats: FetchRegistryStats = field(default_factory=FetchRegistryStats)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def lookup_search(self, tool: str, query: str) -> Optional[FetchRecord]:
+        """Return the recorded result of a search, counting it as a hit or a miss."""
+        with self.lock:
+            self.stats.searches += 1
+            record = self.searches.get(f"{tool}:{normalize_query(query)}")
+            if record is not None:
+                self.stats.search_hits += 1
+            return record
+
+    def record_search(self, tool: str, query: str, result: Any) -> None:
+        with self.lock:
+            self.searches[f"{tool}:{normalize_query(query)}"] = FetchRecord(
+                result, current_step()
+            )
+
+    def lookup_crawl(self, url: str, query: Optional[str]) -> Optional[FetchRecord]:
+        """Return the recorded content of a crawl, counting it as a hit or a miss."""
+        with self.lock:
+            self.stats.crawls += 1
+            record = self.crawls.get(_crawl_key(url, query))
+            if record is not None:
+                self.stats.crawl_hits += 1
+            return record
+
+    def record_crawl(self, url: str, query: Optional[str], content: str) -> None:
+        with self.lock:
+            self.crawls[_crawl_key(url, query)] = FetchRecord(content, current_step())
+
+    def get_stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                **vars(self.stats),
+                "searched_queries": len(self.searches),
+                "crawled_urls": len({key[0] for key in self.crawls}),
+            }
+
+
+_registries: OrderedDict[str, FetchRegistry] = OrderedDict()
+_lock = threading.Lock()
+
+
+def current_step() -> Optional[str]:
+    """Return the title of the plan step, or the graph node, of the current run."""
+    metadata = ensure_config().get("metadata", {})
+    return metadata.get(STEP_METADATA_KEY) or metadata.get("langgraph_node")
+
+
+def earlier_result_note(record: FetchRecord) -> Optional[str]:
+    """
+    Return a note for a repeated call in the step that made the first one.
+
+    Returns:
+        The note, or None if the first call was made by another step
+    """
+    if record.step != current_step():
+        return None
+    return "Already fetched in this step, see the earlier result of this call."
+
+
+def get_fetch_registry() -> Optional[FetchRegistry]:
+    """Return the registry of the current conversation, None outside of a graph run."""
+    thread_id = ensure_config().get("configurable", {}).get("thread_id")
+    if not thread_id:
+        return None
+    with _lock:
+        registry = _registries.get(thread_id)
+        if registry is None:
+            registry = _registries[thread_id] = FetchRegistry()
+            while len(_registries) > int(
+                os.getenv("FETCH_REGISTRY_MAX_THREADS", "100")
+            ):
+                _registries.popitem(last=False)
+        _registries.move_to_end(thread_id)
+        return registry
+
+
+def get_fetch_registry_stats(thread_id: str) -> Optional[dict[str, int]]:
+    """Return the searches, crawls and hits of a conversation, None if unknown."""
+    with _lock:
+        registry = _registries.get(thread_id)
+    return registry.get_stats() if registry is not None else None
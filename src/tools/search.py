@@ -14,7 +14,12 @@ from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchResultsWithImages,
 )
 
-from src.tools.decorators import create_logged_tool
+from src.tools.decorators import (
+    create_cached_tool,
+    create_deduplicated_tool,
+    create_logged_tool,
+)
+from src.tools.fake_search import FakeSearchTool
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +29,23 @@ LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
 LoggedBraveSearch = create_logged_tool(BraveSearch)
 LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
 
+# Versions of the search tools that serve repeated queries from the search cache
+CachedTavilySearch = create_cached_tool(LoggedTavilySearch)
+CachedDuckDuckGoSearch = create_cached_tool(LoggedDuckDuckGoSearch)
+CachedBraveSearch = create_cached_tool(LoggedBraveSearch)
+CachedArxivSearch = create_cached_tool(LoggedArxivSearch)
+
+# Versions of the search tools that don't repeat the searches of a research run
+DeduplicatedTavilySearch = create_deduplicated_tool(CachedTavilySearch)
+DeduplicatedDuckDuckGoSearch = create_deduplicated_tool(CachedDuckDuckGoSearch)
+DeduplicatedBraveSearch = create_deduplicated_tool(CachedBraveSearch)
+DeduplicatedArxivSearch = create_deduplicated_tool(CachedArxivSearch)
+
 
 # Get the selected search tool
 def get_web_search_tool(max_search_results: int):
     if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
-        return LoggedTavilySearch(
+        return DeduplicatedTavilySearch(
             name="web_search",
             max_results=max_search_results,
             include_raw_content=True,
@@ -36,9 +53,11 @@ def get_web_search_tool(max_search_results: int):
             include_image_descriptions=True,
         )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.DUCKDUCKGO.value:
-        return LoggedDuckDuckGoSearch(name="web_search", max_results=max_search_results)
+        return DeduplicatedDuckDuckGoSearch(
+            name="web_search", max_results=max_search_results
+        )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.BRAVE_SEARCH.value:
-        return LoggedBraveSearch(
+        return DeduplicatedBraveSearch(
             name="web_search",
             search_wrapper=BraveSearchWrapper(
                 api_key=os.getenv("BRAVE_SEARCH_API_KEY", ""),
@@ -46,7 +65,7 @@ def get_web_search_tool(max_search_results: int):
             ),
         )
     elif SELECTED_SEARCH_ENGINE == SearchEngine.ARXIV.value:
-        return LoggedArxivSearch(
+        return DeduplicatedArxivSearch(
             name="web_search",
             api_wrapper=ArxivAPIWrapper(
                 top_k_results=max_search_results,
@@ -54,6 +73,10 @@ def get_web_search_tool(max_search_results: int):
                 load_all_available_meta=True,
             ),
         )
+    elif SELECTED_SEARCH_ENGINE == SearchEngine.FAKE.value:
+        return create_deduplicated_tool(FakeSearchTool)(
+            name="web_search", max_results=max_search_results
+        )
     else:
         raise ValueError(f"Unsupported search engine: {SELECTED_SEARCH_ENGINE}")
 
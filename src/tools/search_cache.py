@@ -0,0 +1,221 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Memory and disk cache of web search results.
+
+Results are cached by search engine, normalized query and the parameters of the
+search tool (``max_results``, ``include_raw_content``, ...) for
+``SEARCH_CACHE_TTL`` seconds. The most recently used results are kept in memory
+in front of a size-capped ``DiskLRUCache``, which evicts the least recently used
+results first and keeps them across restarts.
+
+Settings are read from the environment:
+    SEARCH_CACHE_ENABLED: Default true
+    SEARCH_CACHE_PATH: Default .cache/search_cache.sqlite
+    SEARCH_CACHE_MAX_SIZE_MB: Default 64
+    SEARCH_CACHE_MEMORY_ENTRIES: Results kept in memory, default 256
+    SEARCH_CACHE_TTL: Seconds a result is served, default 3600
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from src.storage.disk_cache import DiskLRUCache
+
+from .fetch_registry import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Fields of tools that don't change their results
+_IGNORED_FIELDS = {
+    "name",
+    "description",
+    "args_schema",
+    "return_direct",
+    "verbose",
+    "callbacks",
+    "callback_manager",
+    "tags",
+    "metadata",
+    "handle_tool_error",
+    "handle_validation_error",
+    "response_format",
+    "extras",
+}
+_SECRET_FIELD = re.compile(r"key|secret|token|password", re.IGNORECASE)
+
+
+def search_params(tool: BaseModel) -> dict[str, Any]:
+    """
+    Return the parameters of a search tool and of its API wrapper.
+
+    Fields that hold credentials or that can't be serialized are left out.
+    """
+    params = {}
+    for name in type(tool).model_fields:
+        if name in _IGNORED_FIELDS or _SECRET_FIELD.search(name):
+            continue
+        value = getattr(tool, name, None)
+        if isinstance(value, BaseModel):
+            params[name] = search_params(value)
+            continue
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        params[name] = value
+    return params
+
+
+def search_cache_key(engine: str, query: str, params: dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"engine": engine, "query": normalize_query(query), "params": params},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SearchCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    # Entries older than the TTL, counted as misses too
+    expired: int = 0
+
+
+class SearchCache:
+    """Search results by engine, query and parameters, with a TTL."""
+
+    def __init__(
+        self,
+        store: DiskLRUCache,
+        ttl_seconds: float = 3600,
+        memory_entries: int = 256,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.stats = SearchCacheStats()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up the result of a search.
+
+        Args:
+            key: The ``search_cache_key`` of the search
+
+        Returns:
+            The result if it is fresh, else None
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+        counter = "memory_hits"
+        if value is None:
+            value = self.store.get(key)
+            counter = "disk_hits"
+        if value is None:
+            self._count("misses")
+            return None
+        try:
+            data = json.loads(zlib.decompress(value))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Dropping unreadable search cache entry {key}: {e}")
+            self._count("misses")
+            return None
+        if time.time() - data["stored_at"] >= self.ttl_seconds:
+            with self._lock:
+                self._memory.pop(key, None)
+            self._count("expired")
+            self._count("misses")
+            return None
+        if counter == "disk_hits":
+            self._remember(key, value)
+        self._count(counter)
+        return data["result"]
+
+    def put(self, key: str, result: Any) -> None:
+        """Cache the result of a search made just now."""
+        try:
+            value = zlib.compress(
+                json.dumps({"stored_at": time.time(), "result": result}).encode()
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Search result of {key} can't be cached: {e}")
+            return
+        self._remember(key, value)
+        try:
+            self.store.set(key, value)
+        except Exception as e:
+            logger.warning(f"Failed to cache the search result {key}: {e}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = SearchCacheStats(**vars(self.stats))
+            memory_entries = len(self._memory)
+        hits = stats.memory_hits + stats.disk_hits
+        lookups = hits + stats.misses
+        return {
+            **vars(stats),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "entries": len(self.store),
+            "size_bytes": self.store.size(),
+            "evictions": self.store.stats.evictions,
+        }
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the search cache configured by the environment, None when disabled."""
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() not in ("true", "1", "yes"):
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache(
+                DiskLRUCache(
+                    os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite"),
+                    int(
+                        float(os.getenv("SEARCH_CACHE_MAX_SIZE_MB", "64")) * 1024 * 1024
+                    ),
+                ),
+                ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+                memory_entries=int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "256")),
+            )
+        return _search_cache
+
+
+def get_search_cache_stats() -> dict[str, Any]:
+    """Return hit/miss counters and the size of the search cache."""
+    return _search_cache.get_stats() if _search_cache is not None else {}
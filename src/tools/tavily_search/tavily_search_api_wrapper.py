@@ -1,13 +1,13 @@
 import json
 from typing import Dict, List, Optional
 
-import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.utils.http_client import get_async_http_client, get_http_client
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -34,8 +34,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
-            # type: ignore
+        response = get_http_client(TAVILY_API_URL).post(
             f"{TAVILY_API_URL}/search",
             json=params,
         )
@@ -70,13 +69,13 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 "include_images": include_images,
                 "include_image_descriptions": include_image_descriptions,
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+            res = await get_async_http_client(TAVILY_API_URL).post(
+                f"{TAVILY_API_URL}/search", json=params
+            )
+            if res.status_code == 200:
+                return res.text
+            else:
+                raise Exception(f"Error {res.status_code}: {res.reason_phrase}")
 
         results_json_str = await fetch()
         return json.loads(results_json_str)
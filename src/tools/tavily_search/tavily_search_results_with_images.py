@@ -8,11 +8,20 @@ from langchain.callbacks.manager import (
 from langchain_community.tools.tavily_search.tool import TavilySearchResults
 from pydantic import Field
 
+from src.storage import is_blob_ref, offload
 from src.tools.tavily_search.tavily_search_api_wrapper import (
     EnhancedTavilySearchAPIWrapper,
 )
 
 
+def _store_raw_results(raw_results: Dict) -> Dict:
+    """Keep the raw API response out of the message history when it is large."""
+    ref = offload(json.dumps(raw_results, ensure_ascii=False))
+    if is_blob_ref(ref):
+        return {"raw_results_ref": ref}
+    return raw_results
+
+
 class TavilySearchResultsWithImages(TavilySearchResults):  # type: ignore[override, override]
     """Tool that queries the Tavily Search API and gets back json.
 
@@ -121,7 +130,7 @@ class TavilySearchResultsWithImages(TavilySearchResults):  # type: ignore[overri
             return repr(e), {}
         cleaned_results = self.api_wrapper.clean_results_with_images(raw_results)
         print("sync", json.dumps(cleaned_results, indent=2, ensure_ascii=False))
-        return cleaned_results, raw_results
+        return cleaned_results, _store_raw_results(raw_results)
 
     async def _arun(
         self,
@@ -145,4 +154,4 @@ class TavilySearchResultsWithImages(TavilySearchResults):  # type: ignore[overri
             return repr(e), {}
         cleaned_results = self.api_wrapper.clean_results_with_images(raw_results)
         print("async", json.dumps(cleaned_results, indent=2, ensure_ascii=False))
-        return cleaned_results, raw_results
+        return cleaned_results, _store_raw_results(raw_results)
@@ -8,9 +8,10 @@ Text-to-Speech module using volcengine TTS API.
 import json
 import uuid
 import logging
-import requests
 from typing import Optional, Dict, Any
 
+from src.utils.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,8 +104,8 @@ class VolcengineTTS:
 
         try:
             logger.debug(f"Sending TTS request for text: {text[:50]}...")
-            response = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
+            response = get_http_client(self.api_url).post(
+                self.api_url, content=json.dumps(request_json), headers=self.header
             )
             response_json = response.json()
 
@@ -0,0 +1,24 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from .chrome_trace import (
+    STEP_METADATA_KEY,
+    ChromeTraceCallback,
+    should_trace,
+    wait_for_trace_writes,
+)
+from .prompt_cache import (
+    AGENT_METADATA_KEY,
+    PromptCacheCallback,
+    get_prompt_cache_stats,
+)
+
+__all__ = [
+    "AGENT_METADATA_KEY",
+    "ChromeTraceCallback",
+    "PromptCacheCallback",
+    "STEP_METADATA_KEY",
+    "get_prompt_cache_stats",
+    "should_trace",
+    "wait_for_trace_writes",
+]
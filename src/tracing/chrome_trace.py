@@ -0,0 +1,376 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Timeline tracing of research runs in the Chrome Trace Event format.
+
+``ChromeTraceCallback`` records a span for every graph node, agent iteration,
+LLM call (with its time to first token) and tool call, and appends them to
+``<TRACE_DIR>/<thread_id>.json`` when the run finishes. The files load in
+Perfetto (https://ui.perfetto.dev) or chrome://tracing. Each request of a
+thread, e.g. the resume after a plan review, is added as its own process.
+
+Files are written by a background thread in the JSON Array Format, one event per
+line. The closing bracket, which is optional in this format, is left out so
+that the events of a request are appended without rewriting the file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+_GRAPH_LANE = 0
+
+# Trace files whose number of requests is remembered by the writer
+_MAX_TRACE_FILES = 1000
+
+# Run metadata naming the plan step a run works on, for steps whose node input
+# does not show it
+STEP_METADATA_KEY = "plan_step"
+
+
+@dataclass
+class _Span:
+    name: str
+    category: str
+    lane: int
+    start_us: float
+    args: dict[str, Any] = field(default_factory=dict)
+    first_token_us: Optional[float] = None
+    namespace: Optional[str] = None
+
+
+def _top_level_namespace(metadata: Optional[dict]) -> Optional[str]:
+    namespace = (metadata or {}).get("langgraph_checkpoint_ns")
+    return namespace.split("|")[0] if namespace else None
+
+
+def _current_step_title(inputs: Any) -> Optional[str]:
+    """Return the title of the first unfinished step of the plan in ``inputs``."""
+    if not isinstance(inputs, dict):
+        return None
+    for step in getattr(inputs.get("current_plan"), "steps", None) or []:
+        if not step.execution_res:
+            return step.title
+    return None
+
+
+def should_trace(thread_id: str, enabled: Optional[bool] = None) -> bool:
+    """
+    Decide whether a request is traced.
+
+    Args:
+        thread_id: The conversation identifier
+        enabled: Explicit per request choice, overrides the sampling rate
+
+    Returns:
+        True when the request should be traced
+    """
+    if enabled is not None:
+        return enabled
+    try:
+        rate = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+    except ValueError:
+        logger.warning("Invalid TRACE_SAMPLE_RATE, tracing is disabled")
+        return False
+    if rate <= 0:
+        return False
+    # Sample by thread so every request of a conversation ends up in one trace
+    bucket = int(hashlib.sha256(thread_id.encode("utf-8")).hexdigest()[:8], 16)
+    return bucket / 0xFFFFFFFF < rate
+
+
+def read_trace(path: Path) -> list[dict[str, Any]]:
+    """Return the events of a trace file."""
+    text = path.read_text().rstrip().rstrip(",")
+    return json.loads(text if text.endswith("]") else text + "]")
+
+
+class _TraceWriter:
+    """Append the events of finished requests to trace files in a thread."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Number of requests in every trace file, counted once per process
+        self._requests: OrderedDict[Path, int] = OrderedDict()
+
+    def submit(self, path: Path, thread_id: str, events: list[dict]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-writer", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((path, thread_id, events))
+
+    def join(self) -> None:
+        """Block until every submitted trace is written."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, thread_id, events = self._queue.get()
+            try:
+                self._write(path, events)
+                logger.info(f"Wrote trace of thread {thread_id} to {path}")
+            except Exception as e:
+                logger.warning(f"Failed to write trace of thread {thread_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _request_count(self, path: Path) -> int:
+        count = self._requests.get(path)
+        if count is None:
+            count = 0
+            if path.exists():
+                with path.open() as f:
+                    count = sum('"process_name"' in line for line in f)
+        self._requests[path] = count
+        self._requests.move_to_end(path)
+        while len(self._requests) > _MAX_TRACE_FILES:
+            self._requests.popitem(last=False)
+        return count
+
+    def _write(self, path: Path, events: list[dict]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pid = self._request_count(path) + 1
+        lines = [] if path.exists() else ["["]
+        lines.append(
+            json.dumps(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"name": f"request {pid}"},
+                }
+            )
+            + ","
+        )
+        lines.extend(
+            json.dumps({**event, "pid": pid}, ensure_ascii=False, default=str) + ","
+            for event in events
+        )
+        with path.open("a") as f:
+            f.write("\n".join(lines) + "\n")
+        self._requests[path] = pid
+
+
+_writer = _TraceWriter()
+
+
+def wait_for_trace_writes() -> None:
+    """Block until the traces of finished runs are written."""
+    _writer.join()
+
+
+class ChromeTraceCallback(BaseCallbackHandler):
+    """Record the spans of one graph run and write them as a Chrome trace."""
+
+    run_inline = True
+
+    def __init__(self, thread_id: str, trace_dir: Optional[str] = None):
+        self.thread_id = thread_id
+        self.trace_dir = Path(trace_dir or os.getenv("TRACE_DIR", ".cache/traces"))
+        self.events: list[dict[str, Any]] = []
+        self._spans: dict[UUID, _Span] = {}
+        self._lanes: dict[str, int] = {}
+        self._step_titles: dict[str, str] = {}
+        self._active_namespaces: set[str] = set()
+        self._root_run_id: Optional[UUID] = None
+        self._lock = threading.Lock()
+        # Wall clock timestamps so the requests of a thread line up in one file
+        self._epoch = time.time() - time.perf_counter()
+
+    @property
+    def path(self) -> Path:
+        name = re.sub(r"[^\w.-]", "_", self.thread_id)
+        return self.trace_dir / f"{name}.json"
+
+    def _now_us(self) -> float:
+        return (self._epoch + time.perf_counter()) * 1_000_000
+
+    def _lane(self, namespace: Optional[str]) -> int:
+        # One lane per top-level node, executions of a node never overlap
+        if not namespace:
+            return _GRAPH_LANE
+        node = namespace.split(":")[0]
+        if node not in self._lanes:
+            self._lanes[node] = len(self._lanes) + 1
+            self.events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "tid": self._lanes[node],
+                    "args": {"name": node},
+                }
+            )
+        return self._lanes[node]
+
+    def _start(
+        self,
+        run_id: UUID,
+        name: str,
+        category: str,
+        metadata: Optional[dict],
+        namespace: Optional[str] = None,
+        **args: Any,
+    ) -> None:
+        top_level = _top_level_namespace(metadata)
+        with self._lock:
+            args = {"thread_id": self.thread_id, **args}
+            metadata_step = (metadata or {}).get(STEP_METADATA_KEY)
+            if step := metadata_step or self._step_titles.get(top_level):
+                args["step"] = step
+            lane = self._lane(top_level)
+            self._spans[run_id] = _Span(
+                name, category, lane, self._now_us(), args, namespace=namespace
+            )
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **args):
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+            if span is None:
+                return
+            if span.namespace is not None:
+                self._active_namespaces.discard(span.namespace)
+            end_us = self._now_us()
+            span.args.update(args)
+            if error is not None:
+                span.args["error"] = repr(error)
+            if span.first_token_us is not None:
+                span.args["ttft_ms"] = round(
+                    (span.first_token_us - span.start_us) / 1000, 3
+                )
+                self.events.append(
+                    {
+                        "name": "first token",
+                        "cat": span.category,
+                        "ph": "i",
+                        "s": "t",
+                        "ts": span.first_token_us,
+                        "tid": span.lane,
+                    }
+                )
+            self.events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start_us,
+                    "dur": end_us - span.start_us,
+                    "tid": span.lane,
+                    "args": span.args,
+                }
+            )
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs
+    ):
+        if parent_run_id is None:
+            self._root_run_id = run_id
+            self._start(run_id, kwargs.get("name") or "graph", "run", None)
+            return
+        node = (metadata or {}).get("langgraph_node")
+        namespace = (metadata or {}).get("langgraph_checkpoint_ns", "")
+        if not node or kwargs.get("name") != node:
+            return
+        with self._lock:
+            # Agents named after their node share its namespace, only record the node
+            if namespace in self._active_namespaces:
+                return
+            self._active_namespaces.add(namespace)
+            top_level = namespace.split("|")[0]
+            if "|" not in namespace:
+                if step := _current_step_title(inputs):
+                    self._step_titles[top_level] = step
+                else:
+                    self._step_titles.pop(top_level, None)
+        category = "node" if "|" not in namespace else "agent"
+        self._start(run_id, node, category, metadata, namespace=namespace, node=node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+        if run_id == self._root_run_id:
+            self.flush()
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+        if run_id == self._root_run_id:
+            self.flush()
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        params = kwargs.get("invocation_params") or {}
+        model = (
+            (metadata or {}).get("ls_model_name")
+            or params.get("model")
+            or params.get("model_name")
+            or params.get("_type")
+            or "llm"
+        )
+        self._start(
+            run_id,
+            f"llm {model}",
+            "llm",
+            metadata,
+            model=model,
+            prompt_messages=sum(len(batch) for batch in messages),
+        )
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "llm", "llm", metadata)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        span = self._spans.get(run_id)
+        if span is not None and span.first_token_us is None:
+            span.first_token_us = self._now_us()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        usage = {}
+        generations = response.generations[0] if response.generations else []
+        message = getattr(generations[0], "message", None) if generations else None
+        if getattr(message, "usage_metadata", None):
+            usage = {
+                "input_tokens": message.usage_metadata.get("input_tokens"),
+                "output_tokens": message.usage_metadata.get("output_tokens"),
+            }
+        self._end(run_id, **usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, f"tool {name}", "tool", metadata, tool=name)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def flush(self) -> Optional[Path]:
+        """Queue the recorded events to be appended to the trace file of the thread."""
+        with self._lock:
+            events, self.events = self.events, []
+        if not events:
+            return None
+        _writer.submit(self.path, self.thread_id, events)
+        return self.path
@@ -0,0 +1,116 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cached prompt token counts of LLM calls, per agent.
+
+Providers with prefix caching report how many input tokens were served from
+the cache in the usage of a response. ``PromptCacheCallback`` adds them up per
+agent so the effect of the prompt layout can be checked in
+``GET /api/llm/stats``.
+"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# Run metadata naming the agent of a run whose graph node does not show it
+AGENT_METADATA_KEY = "agent_name"
+
+
+@dataclass
+class PromptCacheStats:
+    calls: int = 0
+    # Calls whose response reported input token usage
+    calls_with_usage: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+_stats: dict[str, PromptCacheStats] = defaultdict(PromptCacheStats)
+_stats_lock = threading.Lock()
+
+
+def _agent(metadata: Optional[dict]) -> str:
+    metadata = metadata or {}
+    if agent := metadata.get(AGENT_METADATA_KEY):
+        return agent
+    namespace = metadata.get("langgraph_checkpoint_ns")
+    if namespace:
+        return namespace.split("|")[0].split(":")[0]
+    return metadata.get("langgraph_node") or "other"
+
+
+def _usage(response: LLMResult) -> Optional[tuple[int, int]]:
+    """Return the input and cached input tokens of a response, if reported."""
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if usage and usage.get("input_tokens"):
+                details = usage.get("input_token_details") or {}
+                return usage["input_tokens"], details.get("cache_read") or 0
+            token_usage = (getattr(message, "response_metadata", None) or {}).get(
+                "token_usage"
+            ) or {}
+            if token_usage.get("prompt_tokens"):
+                # DeepSeek reports cache hits next to the prompt tokens
+                return (
+                    token_usage["prompt_tokens"],
+                    token_usage.get("prompt_cache_hit_tokens") or 0,
+                )
+    return None
+
+
+class PromptCacheCallback(BaseCallbackHandler):
+    """Count input and cached input tokens of the LLM calls of a run."""
+
+    run_inline = True
+
+    def __init__(self):
+        self._agents: dict[UUID, str] = {}
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        self._agents[run_id] = _agent(metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        agent = self._agents.pop(run_id, None)
+        if agent is None:
+            return
+        usage = _usage(response)
+        with _stats_lock:
+            stats = _stats[agent]
+            stats.calls += 1
+            if usage:
+                stats.calls_with_usage += 1
+                stats.input_tokens += usage[0]
+                stats.cached_tokens += usage[1]
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._agents.pop(run_id, None)
+
+
+def get_prompt_cache_stats() -> dict[str, dict[str, Any]]:
+    """Return input tokens, cached input tokens and their ratio per agent."""
+    with _stats_lock:
+        return {
+            agent: {
+                "calls": stats.calls,
+                "calls_with_usage": stats.calls_with_usage,
+                "input_tokens": stats.input_tokens,
+                "cached_tokens": stats.cached_tokens,
+                "cached_ratio": stats.cached_ratio,
+            }
+            for agent, stats in _stats.items()
+        }
@@ -0,0 +1,208 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Shared pooled HTTP clients for outbound integrations.
+
+The crawler, search, TTS and OpenAI-compatible LLM clients get their HTTP
+clients from this registry instead of opening a new connection (and TLS
+handshake) per request. There is one sync and one async client per host, so
+connection limits apply per host and connections are kept alive between calls.
+Clients that talk to many different hosts, like the direct crawler, share a
+named pool instead.
+
+Settings are read from the environment:
+    HTTP_MAX_CONNECTIONS_PER_HOST: Connections per host and client, default 100
+    HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open, default 30
+    HTTP_TIMEOUT: Request timeout in seconds, default 60
+    HTTP2: Negotiate HTTP/2 when set to true, requires the ``h2`` package
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    in_flight: int = 0
+    errors: int = 0
+
+
+def _pool_stats(pool: Any, stats: TransportStats, limit: int) -> dict[str, Any]:
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "requests": stats.requests,
+        "in_flight": stats.in_flight,
+        "errors": stats.errors,
+        "connections": len(connections),
+        "idle_connections": idle,
+        "max_connections": limit,
+        "utilization": (len(connections) - idle) / limit,
+    }
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """An HTTP transport that counts the requests sent through its pool."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.stats = TransportStats()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.in_flight += 1
+        try:
+            return super().handle_request(request)
+        except Exception:
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.stats.in_flight -= 1
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    """An async HTTP transport that counts the requests sent through its pool."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.stats = TransportStats()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+
+
+def _host(url: str) -> str:
+    """Return ``scheme://host[:port]`` of a URL, the key clients are shared by."""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _max_connections() -> int:
+    return int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "100"))
+
+
+def _client_kwargs() -> dict[str, Any]:
+    return {
+        "timeout": float(os.getenv("HTTP_TIMEOUT", "60")),
+        # Same as requests, which these integrations used before
+        "follow_redirects": True,
+    }
+
+
+def _transport_kwargs() -> dict[str, Any]:
+    max_connections = _max_connections()
+    http2 = os.getenv("HTTP2", "false").lower() == "true"
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2 is enabled but h2 is not installed, using HTTP/1.1")
+        http2 = False
+    return {
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        ),
+    }
+
+
+_clients: dict[str, httpx.Client] = {}
+_async_clients: dict[str, httpx.AsyncClient] = {}
+_transports: dict[
+    tuple[str, str], Union[_CountingTransport, _AsyncCountingTransport]
+] = {}
+_lock = threading.Lock()
+
+
+def get_http_client(url: str, pool: Optional[str] = None) -> httpx.Client:
+    """
+    Get the shared sync HTTP client of a host.
+
+    Args:
+        url: A URL (or host name) the client is used for
+        pool: Name of a pool shared by all hosts, instead of the host's own pool
+
+    Returns:
+        The pooled client of the URL's host
+    """
+    host = pool or _host(url)
+    with _lock:
+        if host not in _clients:
+            transport = _CountingTransport(**_transport_kwargs())
+            _transports[(host, "sync")] = transport
+            _clients[host] = httpx.Client(transport=transport, **_client_kwargs())
+        return _clients[host]
+
+
+def get_async_http_client(url: str, pool: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client of a host.
+
+    The connections of an async client belong to the event loop of the server,
+    like the default clients of the LLM SDKs.
+
+    Args:
+        url: A URL (or host name) the client is used for
+        pool: Name of a pool shared by all hosts, instead of the host's own pool
+
+    Returns:
+        The pooled async client of the URL's host
+    """
+    host = pool or _host(url)
+    with _lock:
+        if host not in _async_clients:
+            transport = _AsyncCountingTransport(**_transport_kwargs())
+            _transports[(host, "async")] = transport
+            _async_clients[host] = httpx.AsyncClient(
+                transport=transport, **_client_kwargs()
+            )
+        return _async_clients[host]
+
+
+def get_http_client_stats() -> dict[str, dict[str, dict[str, Any]]]:
+    """Return request counts and pool utilization per host or named pool."""
+    limit = _max_connections()
+    stats: dict[str, dict[str, dict[str, Any]]] = {}
+    with _lock:
+        transports = list(_transports.items())
+    for (host, kind), transport in transports:
+        stats.setdefault(host, {})[kind] = _pool_stats(
+            transport._pool, transport.stats, limit
+        )
+    return stats
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients and their connections."""
+    with _lock:
+        clients = list(_clients.values())
+        async_clients = list(_async_clients.values())
+        _clients.clear()
+        _async_clients.clear()
+        _transports.clear()
+    for client in clients:
+        client.close()
+    for async_client in async_clients:
+        await async_client.aclose()
@@ -4,6 +4,7 @@
 import logging
 import json
 import json_repair
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -37,3 +38,91 @@ def repair_json_output(content: str) -> str:
         except Exception as e:
             logger.warning(f"JSON repair failed: {e}")
     return content
+
+
+class PartialJSONParser:
+    """
+    Incrementally scan a streamed JSON object and parse it at value boundaries.
+
+    Chunks are scanned once as they arrive. Whenever a value of the root object,
+    or an object directly inside one of its arrays, has been completed, the text
+    so far is parsed with its open containers closed, so unfinished values are
+    left out. Text before the first ``{``, such as a code fence, is skipped.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._length = 0
+        self._stack: list[str] = []
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._key_expected = False
+        self._last: Optional[dict] = None
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """
+        Scan the next chunk of the stream.
+
+        Args:
+            chunk: The next piece of the streamed text
+
+        Returns:
+            The object parsed so far if the chunk completed a value and changed
+            the result, None otherwise
+        """
+        if not self._started:
+            start = chunk.find("{")
+            if start < 0:
+                return None
+            chunk = chunk[start:]
+            self._started = True
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        boundary = None
+        for index, char in enumerate(chunk):
+            if not self._stack and offset + index > 0:
+                # The root object is complete, ignore trailing text
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1 and not self._string_is_key:
+                        boundary = (offset + index + 1, "}")
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_is_key = self._stack[-1] == "{" and self._key_expected
+            elif char in "{[":
+                self._stack.append(char)
+                self._key_expected = char == "{"
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    boundary = (offset + index + 1, "")
+                elif char == "}" and self._stack == ["{", "["]:
+                    boundary = (offset + index + 1, "]}")
+            elif char == ",":
+                self._key_expected = self._stack[-1] == "{"
+                if len(self._stack) == 1:
+                    boundary = (offset + index, "}")
+            elif char == ":":
+                self._key_expected = False
+        if boundary is None:
+            return None
+        end, closing = boundary
+        try:
+            parsed = json.loads("".join(self._chunks)[:end] + closing)
+        except json.JSONDecodeError as e:
+            logger.debug(f"Failed to parse partial JSON: {e}")
+            return None
+        if parsed == self._last:
+            return None
+        self._last = parsed
+        return parsed
@@ -0,0 +1,25 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Synthetic text and settings of the offline stand-ins for the model, search and crawler.
+"""
+
+import os
+
+_WORDS = (
+    "research shows that the market for renewable energy continues to grow "
+    "as costs fall and governments expand incentives for adoption across regions"
+).split()
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def synthetic_text(num_tokens: int, seed: int = 0) -> str:
+    """Return ``num_tokens`` words of filler text, starting at word ``seed``."""
+    return " ".join(_WORDS[(seed + i) % len(_WORDS)] for i in range(num_tokens))
@@ -1,6 +1,7 @@
+import asyncio
 import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 # 在这里 mock 掉 get_llm_by_type，避免 ValueError
 with patch("src.llms.llm.get_llm_by_type", return_value=MagicMock()):
@@ -48,9 +49,10 @@ def patch_config_from_runnable_config(mock_configurable):
 
 @pytest.fixture
 def mock_tavily_search():
-    with patch("src.graph.nodes.LoggedTavilySearch") as mock:
+    with patch("src.graph.nodes.CachedTavilySearch") as mock:
         instance = mock.return_value
-        instance.invoke.return_value = [
+        instance.ainvoke = AsyncMock()
+        instance.ainvoke.return_value = [
             {"title": "Test Title 1", "content": "Test Content 1"},
             {"title": "Test Title 2", "content": "Test Content 2"},
         ]
@@ -61,7 +63,8 @@ def mock_tavily_search():
 def mock_web_search_tool():
     with patch("src.graph.nodes.get_web_search_tool") as mock:
         instance = mock.return_value
-        instance.invoke.return_value = [
+        instance.ainvoke = AsyncMock()
+        instance.ainvoke.return_value = [
             {"title": "Test Title 1", "content": "Test Content 1"},
             {"title": "Test Title 2", "content": "Test Content 2"},
         ]
@@ -79,7 +82,7 @@ def test_background_investigation_node_tavily(
 ):
     """Test background_investigation_node with Tavily search engine"""
     with patch("src.graph.nodes.SELECTED_SEARCH_ENGINE", search_engine):
-        result = background_investigation_node(mock_state, mock_config)
+        result = asyncio.run(background_investigation_node(mock_state, mock_config))
 
         # Verify the result structure
         assert isinstance(result, Command)
@@ -94,14 +97,14 @@ def test_background_investigation_node_tavily(
         assert isinstance(results, list)
 
         if search_engine == SearchEngine.TAVILY:
-            mock_tavily_search.return_value.invoke.assert_called_once_with(
+            mock_tavily_search.return_value.ainvoke.assert_awaited_once_with(
                 {"query": "test query"}
             )
             assert len(results) == 2
             assert results[0]["title"] == "Test Title 1"
             assert results[0]["content"] == "Test Content 1"
         else:
-            mock_web_search_tool.return_value.invoke.assert_called_once_with(
+            mock_web_search_tool.return_value.ainvoke.assert_awaited_once_with(
                 "test query"
             )
             assert len(results) == 2
@@ -113,9 +116,9 @@ def test_background_investigation_node_malformed_response(
     """Test background_investigation_node with malformed Tavily response"""
     with patch("src.graph.nodes.SELECTED_SEARCH_ENGINE", SearchEngine.TAVILY):
         # Mock a malformed response
-        mock_tavily_search.return_value.invoke.return_value = "invalid response"
+        mock_tavily_search.return_value.ainvoke.return_value = "invalid response"
 
-        result = background_investigation_node(mock_state, mock_config)
+        result = asyncio.run(background_investigation_node(mock_state, mock_config))
 
         # Verify the result structure
         assert isinstance(result, Command)
@@ -45,7 +45,7 @@ class TestVolcengineTTS:
         assert tts.host == "openspeech.bytedance.com"
         assert tts.api_url == "https://openspeech.bytedance.com/api/v1/tts"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_http_client")
     def test_text_to_speech_success(self, mock_post):
         """Test successful text-to-speech conversion."""
         # Mock response
@@ -58,7 +58,7 @@ class TestVolcengineTTS:
             "message": "success",
             "data": mock_audio_data,
         }
-        mock_post.return_value = mock_response
+        mock_post.return_value.post.return_value = mock_response
 
         # Create TTS client
         tts = VolcengineTTS(
@@ -75,12 +75,12 @@ class TestVolcengineTTS:
         assert "response" in result
 
         # Verify the request
-        mock_post.assert_called_once()
-        args, _ = mock_post.call_args
+        mock_post.return_value.post.assert_called_once()
+        args, kwargs = mock_post.return_value.post.call_args
         assert args[0] == "https://openspeech.bytedance.com/api/v1/tts"
 
-        # Verify request JSON - the data is passed as the second positional argument
-        request_json = json.loads(args[1])
+        # Verify request JSON - the data is passed as the request content
+        request_json = json.loads(kwargs["content"])
         assert request_json["app"]["appid"] == "test_appid"
         assert request_json["app"]["token"] == "test_token"
         assert request_json["app"]["cluster"] == "volcano_tts"
@@ -88,7 +88,7 @@ class TestVolcengineTTS:
         assert request_json["audio"]["encoding"] == "mp3"
         assert request_json["request"]["text"] == "Hello, world!"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_http_client")
     def test_text_to_speech_api_error(self, mock_post):
         """Test error handling when API returns an error."""
         # Mock response
@@ -98,7 +98,7 @@ class TestVolcengineTTS:
             "code": 400,
             "message": "Bad request",
         }
-        mock_post.return_value = mock_response
+        mock_post.return_value.post.return_value = mock_response
 
         # Create TTS client
         tts = VolcengineTTS(
@@ -114,7 +114,7 @@ class TestVolcengineTTS:
         assert result["error"] == {"code": 400, "message": "Bad request"}
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_http_client")
     def test_text_to_speech_no_data(self, mock_post):
         """Test error handling when API response doesn't contain data."""
         # Mock response
@@ -125,7 +125,7 @@ class TestVolcengineTTS:
             "message": "success",
             # No data field
         }
-        mock_post.return_value = mock_response
+        mock_post.return_value.post.return_value = mock_response
 
         # Create TTS client
         tts = VolcengineTTS(
@@ -141,7 +141,7 @@ class TestVolcengineTTS:
         assert result["error"] == "No audio data returned"
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_http_client")
     def test_text_to_speech_with_custom_parameters(self, mock_post):
         """Test text_to_speech with custom parameters."""
         # Mock response
@@ -154,7 +154,7 @@ class TestVolcengineTTS:
             "message": "success",
             "data": mock_audio_data,
         }
-        mock_post.return_value = mock_response
+        mock_post.return_value.post.return_value = mock_response
 
         # Create TTS client
         tts = VolcengineTTS(
@@ -179,9 +179,9 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify request JSON - the data is passed as the second positional argument
-        args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        # Verify request JSON - the data is passed as the request content
+        args, kwargs = mock_post.return_value.post.call_args
+        request_json = json.loads(kwargs["content"])
         assert request_json["audio"]["encoding"] == "wav"
         assert request_json["audio"]["speed_ratio"] == 1.2
         assert request_json["audio"]["volume_ratio"] == 0.8
@@ -192,7 +192,7 @@ class TestVolcengineTTS:
         assert request_json["request"]["frontend_type"] == "custom"
         assert request_json["user"]["uid"] == "custom-uid"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_http_client")
     @patch("src.tools.tts.uuid.uuid4")
     def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_post):
         """Test that UUID is auto-generated if not provided."""
@@ -210,7 +210,7 @@ class TestVolcengineTTS:
             "message": "success",
             "data": mock_audio_data,
         }
-        mock_post.return_value = mock_response
+        mock_post.return_value.post.return_value = mock_response
 
         # Create TTS client
         tts = VolcengineTTS(
@@ -225,7 +225,7 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify the request JSON - the data is passed as the second positional argument
-        args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        # Verify the request JSON - the data is passed as the request content
+        args, kwargs = mock_post.return_value.post.call_args
+        request_json = json.loads(kwargs["content"])
         assert request_json["user"]["uid"] == str(mock_uuid_value)
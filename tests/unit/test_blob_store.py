@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import workflow
+from src.graph.nodes import _execute_agent_step
+from src.prompts.planner_model import Plan, Step
+from src.storage import blob_store
+from src.storage.blob_store import BlobStore, is_blob_ref
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path))
+    monkeypatch.setenv("BLOB_STORE_MIN_SIZE", "16")
+    monkeypatch.setattr(blob_store, "_blob_store", None)
+    yield blob_store.get_blob_store()
+    monkeypatch.setattr(blob_store, "_blob_store", None)
+
+
+def test_put_and_get_roundtrip(tmp_path):
+    store = BlobStore(str(tmp_path))
+    ref = store.put("hello world")
+    assert is_blob_ref(ref)
+    assert store.exists(ref)
+    assert store.get(ref) == "hello world"
+
+
+def test_put_deduplicates_identical_content(tmp_path):
+    store = BlobStore(str(tmp_path))
+    assert store.put("same") == store.put(b"same")
+    assert len(list(tmp_path.rglob("*"))) == 2  # one shard dir, one blob
+
+
+def test_get_rejects_invalid_ref(tmp_path):
+    with pytest.raises(ValueError):
+        BlobStore(str(tmp_path)).get("not a ref")
+
+
+def test_offload_keeps_small_content_inline(store):
+    assert blob_store.offload("short") == "short"
+    assert blob_store.offload(None) is None
+
+
+def test_offload_and_resolve_large_content(store):
+    content = "x" * 100
+    ref = blob_store.offload(content)
+    assert is_blob_ref(ref)
+    assert blob_store.offload(ref) == ref
+    assert blob_store.resolve(ref) == content
+    assert blob_store.resolve("plain text") == "plain text"
+
+
+def test_offload_disabled(store, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_ENABLED", "false")
+    assert blob_store.offload("x" * 100) == "x" * 100
+
+
+def test_resolve_message(store):
+    ref = blob_store.offload("y" * 100)
+    message = blob_store.resolve_message(HumanMessage(content=ref, name="researcher"))
+    assert message.content == "y" * 100
+    assert message.name == "researcher"
+    assert blob_store.resolve_message({"role": "user", "content": ref}) == {
+        "role": "user",
+        "content": "y" * 100,
+    }
+
+
+def test_cli_prints_step_results_inline(store, monkeypatch, capsys):
+    finding = "Tidal power supplies 2% of UK electricity. " * 5
+
+    class _Agent:
+        async def ainvoke(self, input, config):
+            return {"messages": [AIMessage(content=finding)]}
+
+    plan = Plan(
+        locale="en-US",
+        thought="",
+        title="Tidal power",
+        steps=[
+            Step(
+                need_web_search=True,
+                title="Output",
+                description="Find the output",
+                step_type="research",
+            )
+        ],
+    )
+    command = asyncio.run(
+        _execute_agent_step({"current_plan": plan}, _Agent(), "researcher")
+    )
+    # The state copies are offloaded, the message is not
+    assert is_blob_ref(plan.steps[0].execution_res)
+    assert is_blob_ref(command.update["observations"][0])
+
+    class _Graph:
+        async def astream(self, input, config, stream_mode):
+            messages = [HumanMessage(content="tidal power")]
+            yield {"messages": messages}
+            yield {"messages": messages + command.update["messages"]}
+
+    monkeypatch.setattr(workflow, "graph", _Graph())
+    asyncio.run(workflow.run_agent_workflow_async("tidal power"))
+    output = capsys.readouterr().out
+    assert finding.strip() in output
+    assert blob_store.BLOB_REF_PREFIX not in output
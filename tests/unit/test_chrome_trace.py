@@ -0,0 +1,82 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from src.benchmark.fakes import FakeChatModel
+from src.benchmark.graph_benchmark import offline_backends
+from src.graph.builder import build_graph_with_memory
+from src.tracing import ChromeTraceCallback, should_trace, wait_for_trace_writes
+from src.tracing.chrome_trace import read_trace
+
+
+async def _run(graph, thread_id: str, tracer: ChromeTraceCallback):
+    async for _ in graph.astream(
+        {
+            "messages": [{"role": "user", "content": "question"}],
+            "auto_accepted_plan": True,
+            "enable_background_investigation": False,
+        },
+        config={
+            "thread_id": thread_id,
+            "max_step_num": 2,
+            "recursion_limit": 40,
+            "callbacks": [tracer],
+        },
+        stream_mode=["messages", "updates"],
+        subgraphs=True,
+    ):
+        pass
+
+
+def test_trace_of_research_run(tmp_path):
+    graph = build_graph_with_memory()
+    with offline_backends(FakeChatModel(plan_steps=2)):
+        asyncio.run(
+            _run(graph, "thread-1", ChromeTraceCallback("thread-1", str(tmp_path)))
+        )
+
+    wait_for_trace_writes()
+    spans = [e for e in read_trace(tmp_path / "thread-1.json") if e["ph"] == "X"]
+    nodes = [e for e in spans if e["cat"] == "node"]
+    # The first step of an accepted plan is researched inside the planner node
+    assert [e["name"] for e in nodes].count("researcher") == 1
+    assert {e["args"]["step"] for e in nodes if e["name"] == "researcher"} == {"Step 2"}
+    assert any(e["cat"] == "agent" for e in spans)
+    llm_spans = [e for e in spans if e["cat"] == "llm"]
+    assert llm_spans and all("ttft_ms" in e["args"] for e in llm_spans)
+    tools = [e for e in spans if e["cat"] == "tool"]
+    assert {e["args"]["step"] for e in tools} == {"Step 1", "Step 2"}
+    assert all(e["args"]["thread_id"] == "thread-1" for e in spans)
+    assert all(e["dur"] >= 0 and e["pid"] == 1 for e in spans)
+
+
+def test_requests_are_appended_to_the_trace_of_the_thread(tmp_path):
+    for request in range(2):
+        tracer = ChromeTraceCallback("thread/2", str(tmp_path))
+        tracer.events.append({"name": f"span {request}", "ph": "X", "ts": 0})
+        assert tracer.flush() == tmp_path / "thread_2.json"
+    wait_for_trace_writes()
+    lines = (tmp_path / "thread_2.json").read_text().splitlines()
+    assert lines[0] == "[" and lines[-1].endswith(",")
+    events = read_trace(tmp_path / "thread_2.json")
+    assert [(e["name"], e["pid"]) for e in events] == [
+        ("process_name", 1),
+        ("span 0", 1),
+        ("process_name", 2),
+        ("span 1", 2),
+    ]
+    assert ChromeTraceCallback("thread/2", str(tmp_path)).flush() is None
+
+
+def test_should_trace(monkeypatch):
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "0")
+    assert should_trace("a") is False
+    assert should_trace("a", enabled=True) is True
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "1")
+    assert should_trace("a") is True
+    assert should_trace("a", enabled=False) is False
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "0.5")
+    sampled = [should_trace(f"thread-{i}") for i in range(200)]
+    assert sampled == [should_trace(f"thread-{i}") for i in range(200)]
+    assert 50 < sum(sampled) < 150
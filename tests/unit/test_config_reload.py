@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+import signal
+
+import pytest
+
+from src.config.loader import cache_yaml_config, load_yaml_config, read_yaml_config
+from src.config.reload import ConfigReloader
+from src.llms import hedge, llm, pool, rate_limit
+
+
+@pytest.fixture
+def conf_path(tmp_path):
+    path = tmp_path / "conf.yaml"
+    path.write_text("BASIC_MODEL:\n  model: a\n")
+    return str(path)
+
+
+def test_reload_swaps_the_cached_config(conf_path):
+    assert load_yaml_config(conf_path)["BASIC_MODEL"]["model"] == "a"
+    with open(conf_path, "w") as f:
+        f.write("BASIC_MODEL:\n  model: b\n")
+    # The cache is kept until a reload replaces it
+    assert load_yaml_config(conf_path)["BASIC_MODEL"]["model"] == "a"
+    cache_yaml_config(conf_path, read_yaml_config(conf_path))
+    assert load_yaml_config(conf_path)["BASIC_MODEL"]["model"] == "b"
+
+
+def test_rejected_reload_keeps_pools_limiters_and_hedgers(tmp_path, monkeypatch):
+    path = tmp_path / "conf.yaml"
+    section = """BASIC_MODEL:
+  endpoints:
+    - {{name: a, model: fake, model_provider: fake, rate_limit: {{requests_per_minute: {rpm}}}}}
+  hedging: {{percentile: {percentile}}}
+"""
+    path.write_text(section.format(rpm=60, percentile=95))
+    monkeypatch.setattr(llm, "CONF_PATH", str(path))
+    monkeypatch.setattr(llm, "_llm_cache", {})
+    monkeypatch.setattr(llm, "_agent_llm_cache", {})
+    monkeypatch.setattr(pool, "_pools", {})
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setattr(hedge, "_hedgers", {})
+    monkeypatch.setattr(llm, "load_dotenv", lambda override: None)
+    llm.get_llm_by_type("basic")
+    # A type used so far whose section the new configuration breaks
+    llm._llm_cache["reasoning"] = llm._llm_cache["basic"]
+    pools, limiters, hedgers = pool._pools, rate_limit._limiters, hedge._hedgers
+    current = (pools["basic"], limiters["basic/a"], hedgers["basic"])
+
+    # The basic model builds with new quotas, the reasoning model does not
+    path.write_text(
+        section.format(rpm=120, percentile=90) + "REASONING_MODEL: invalid\n"
+    )
+    with pytest.raises(ValueError, match="Invalid LLM Conf: reasoning"):
+        llm.reload_llms()
+    assert pool._pools is pools and pools["basic"] is current[0]
+    assert rate_limit._limiters is limiters and limiters["basic/a"] is current[1]
+    assert hedge._hedgers is hedgers and hedgers["basic"] is current[2]
+
+    path.write_text(section.format(rpm=120, percentile=90))
+    del llm._llm_cache["reasoning"]
+    llm.reload_llms()
+    assert rate_limit._limiters["basic/a"] is not current[1]
+    assert hedge._hedgers["basic"] is not current[2]
+    assert pool._pools["basic"] is not current[0]
+
+
+def test_reloader_records_failures(conf_path):
+    calls = []
+
+    def reload():
+        calls.append(1)
+        if len(calls) == 2:
+            raise ValueError("Invalid LLM Conf: basic")
+
+    reloader = ConfigReloader(conf_path, reload)
+    assert reloader.reload("signal").error is None
+    assert reloader.reload("signal").error == "ValueError: Invalid LLM Conf: basic"
+    stats = reloader.get_stats()
+    assert stats["reloads"] == 1
+    assert stats["failures"] == 1
+    assert [event["trigger"] for event in stats["events"]] == ["signal", "signal"]
+
+
+def test_reloader_watches_the_file(conf_path):
+    calls = []
+    reloader = ConfigReloader(conf_path, lambda: calls.append(1))
+
+    async def run():
+        watch = asyncio.create_task(reloader.watch(0.01))
+        await asyncio.sleep(0.05)
+        assert calls == []
+        os.utime(conf_path, (0, 0))
+        await asyncio.sleep(0.1)
+        watch.cancel()
+
+    asyncio.run(run())
+    assert calls == [1]
+    assert reloader.get_stats()["events"][0]["trigger"] == "file"
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP")
+def test_reloader_handles_sighup(conf_path):
+    calls = []
+    reloader = ConfigReloader(conf_path, lambda: calls.append(1))
+
+    async def run():
+        assert reloader.install_signal_handler()
+        os.kill(os.getpid(), signal.SIGHUP)
+        await asyncio.sleep(0.1)
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+
+    asyncio.run(run())
+    assert calls == [1]
@@ -0,0 +1,142 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.cache import CrawlCache, normalize_url
+from src.crawler.scheduler import CrawlScheduler
+from src.storage.disk_cache import DiskLRUCache
+from src.utils.http_client import close_http_clients
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    etag = '"v1"'
+    requests: list[str] = []
+
+    def do_GET(self):
+        _Handler.requests.append("GET")
+        body = f"<p>{self.path} {_Handler.etag}</p>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", _Handler.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        _Handler.requests.append("HEAD")
+        if self.headers.get("If-None-Match") == _Handler.etag:
+            self.send_response(304)
+        else:
+            self.send_response(200)
+        self.send_header("ETag", _Handler.etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeJinaClient:
+    crawls: list[str] = []
+
+    def crawl(self, url: str, return_format: str) -> str:
+        self.crawls.append(url)
+        return f"<p>{url}</p>"
+
+    async def acrawl(self, url: str, return_format: str) -> str:
+        return self.crawl(url, return_format)
+
+
+@pytest.fixture
+def server_url(monkeypatch):
+    monkeypatch.setenv("CRAWL_ALLOW_PRIVATE_HOSTS", "true")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.etag = '"v1"'
+    _Handler.requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    asyncio.run(close_http_clients())
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = CrawlCache(DiskLRUCache(str(tmp_path / "crawl.sqlite"), 10 * 1024 * 1024))
+    _FakeJinaClient.crawls = []
+    monkeypatch.setattr("src.crawler.crawler.SELECTED_CRAWLER_ENGINE", "jina")
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", _FakeJinaClient)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_cache", lambda: cache)
+    scheduler = CrawlScheduler(min_delay=0)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_scheduler", lambda: scheduler)
+    monkeypatch.setattr(
+        Crawler,
+        "_extract",
+        lambda self, url, html: Article(title=url, html_content=html),
+    )
+    return cache
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&utm_source=x&a=1#top") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_sync_and_async_crawls_share_the_cache(cache, server_url):
+    url = f"{server_url}/page"
+    article = Crawler().crawl(url)
+    assert asyncio.run(Crawler().acrawl(f"{url}#section")).to_markdown() == (
+        article.to_markdown()
+    )
+    assert _FakeJinaClient.crawls == [url]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_pages_crawled_by_jina_are_not_requested_from_their_site(cache, server_url):
+    url = f"{server_url}/page"
+    Crawler().crawl(url)
+    cache.ttl_seconds = 0
+    asyncio.run(Crawler().acrawl(url))
+    assert _FakeJinaClient.crawls == [url, url]
+    assert _Handler.requests == []
+    assert cache.get_stats()["expired"] == 1
+
+
+@pytest.mark.parametrize("crawl_async", [False, True])
+def test_expired_pages_are_revalidated(cache, server_url, monkeypatch, crawl_async):
+    monkeypatch.setattr("src.crawler.crawler.SELECTED_CRAWLER_ENGINE", "direct")
+    url = f"{server_url}/page"
+
+    async def crawl() -> str:
+        if crawl_async:
+            return (await Crawler().acrawl(url)).html_content
+        return Crawler().crawl(url).html_content
+
+    async def run():
+        # The validators come with the crawled page
+        await crawl()
+        assert _Handler.requests == ["GET"]
+        cache.ttl_seconds = 0
+        # The page is unchanged, the cached article is served
+        assert '"v1"' in await crawl()
+        assert _Handler.requests == ["GET", "HEAD"]
+        # The page changed, it is crawled again
+        _Handler.etag = '"v2"'
+        assert '"v2"' in await crawl()
+        assert _Handler.requests == ["GET", "HEAD", "HEAD", "GET"]
+        # Async clients belong to the event loop
+        await close_http_clients()
+
+    asyncio.run(run())
+    assert _FakeJinaClient.crawls == []
+    stats = cache.get_stats()
+    assert (stats["revalidated"], stats["expired"]) == (1, 1)
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler import Article, Crawler, crawl_many
+from src.crawler.scheduler import CrawlScheduler
+from src.tools import crawl_many_tool
+
+_DELAYS = {
+    "https://a.com/slow": 0.2,
+    "https://a.com/1": 0.05,
+    "https://a.com/2": 0.05,
+    "https://a.com/3": 0.05,
+    "https://b.com/fast": 0.01,
+    "https://b.com/hang": 10,
+}
+
+
+async def _delayed_fetch(self, url: str) -> tuple[Article, dict]:
+    await asyncio.sleep(_DELAYS[url])
+    if url.endswith("/3"):
+        raise ValueError("bad page")
+    article = Article(title=url, html_content=f"<p>{url}</p>")
+    article.url = url
+    return article, {}
+
+
+@pytest.fixture(autouse=True)
+def scheduler(monkeypatch):
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    monkeypatch.setattr("src.crawler.crawler.SELECTED_CRAWLER_ENGINE", "jina")
+    monkeypatch.setattr(Crawler, "_afetch", _delayed_fetch)
+    scheduler = CrawlScheduler(max_per_domain=2, min_delay=0, poll_interval=0.005)
+    monkeypatch.setattr("src.crawler.crawler.get_crawl_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def test_crawl_many_yields_results_as_they_complete():
+    async def run():
+        urls = ["https://a.com/slow", "https://a.com/1", "https://b.com/fast"]
+        return [result async for result in crawl_many(urls + urls)]
+
+    results = asyncio.run(run())
+    assert [result.url for result in results] == [
+        "https://b.com/fast",
+        "https://a.com/1",
+        "https://a.com/slow",
+    ]
+    assert results[-1].latency_seconds >= 0.2
+    assert all(result.article is not None for result in results)
+
+
+def test_crawl_many_times_out_after_the_slot_is_granted(scheduler):
+    scheduler.max_per_domain = 1
+
+    async def run():
+        urls = ["https://a.com/1", "https://a.com/2", "https://a.com/3"]
+        urls.append("https://b.com/hang")
+        return {result.url: result async for result in crawl_many(urls, timeout=0.1)}
+
+    results = asyncio.run(run())
+    # The pages of a.com wait for each other longer than the timeout
+    assert results["https://a.com/3"].latency_seconds >= 0.1
+    assert results["https://a.com/3"].error == "ValueError('bad page')"
+    assert results["https://b.com/hang"].error == "Timed out after 0.1s"
+    assert results["https://a.com/2"].article is not None
+    stats = scheduler.get_stats()
+    assert stats["domains"]["a.com"]["requests"] == 3
+    assert stats["active"] == stats["queued"] == 0
+
+
+def test_crawl_many_tool_returns_latency_and_errors():
+    results = asyncio.run(
+        crawl_many_tool.ainvoke({"urls": ["https://a.com/1", "https://a.com/3"]})
+    )
+    assert {result["url"] for result in results} == {
+        "https://a.com/1",
+        "https://a.com/3",
+    }
+    by_url = {result["url"]: result for result in results}
+    assert "a.com/1" in by_url["https://a.com/1"]["crawled_content"]
+    assert by_url["https://a.com/3"]["error"].startswith("Failed to crawl")
+    assert all(result["latency_ms"] >= 0 for result in results)
@@ -0,0 +1,103 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from langchain_core.runnables.config import var_child_runnable_config
+
+from src.crawler.jina_client import JINA_READER_URL
+from src.crawler.scheduler import CrawlScheduler
+
+
+def _throttled(url: str, retry_after: str = "") -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", url)
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError(
+        "Too Many Requests", request=request, response=response
+    )
+
+
+def test_scheduler_limits_concurrency_and_spaces_requests():
+    scheduler = CrawlScheduler(
+        max_concurrency=2, max_per_domain=1, min_delay=0.1, poll_interval=0.01
+    )
+    active: dict[str, int] = {}
+    peak = {"total": 0}
+    starts: dict[str, list[float]] = {}
+
+    async def crawl(url: str):
+        domain = url.split("/")[2]
+        async with scheduler.aslot(url):
+            starts.setdefault(domain, []).append(time.monotonic())
+            active[domain] = active.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), active[domain])
+            peak["total"] = max(peak["total"], sum(active.values()))
+            await asyncio.sleep(0.02)
+            active[domain] -= 1
+
+    async def run():
+        urls = [f"https://{domain}/{i}" for domain in "abc" for i in range(3)]
+        await asyncio.gather(*(crawl(url) for url in urls))
+
+    asyncio.run(run())
+    assert peak == {"total": 2, "a": 1, "b": 1, "c": 1}
+    for times in starts.values():
+        assert all(b - a >= 0.09 for a, b in zip(times, times[1:]))
+    stats = scheduler.get_stats()
+    assert stats["active"] == stats["queued"] == 0
+    assert stats["domains"]["a"]["requests"] == 3
+    assert stats["domains"]["a"]["max_wait_seconds"] >= 0.18
+
+
+def test_scheduler_is_fair_across_runs():
+    scheduler = CrawlScheduler(
+        max_concurrency=1, max_per_domain=1, min_delay=0, poll_interval=0.005
+    )
+    order = []
+
+    async def crawl(run: str, url: str):
+        var_child_runnable_config.set({"configurable": {"thread_id": run}})
+        async with scheduler.aslot(url):
+            order.append(run)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        busy = [asyncio.create_task(crawl("A", f"https://a.com/{i}")) for i in range(4)]
+        await asyncio.sleep(0.005)
+        others = [
+            asyncio.create_task(crawl("B", f"https://b.com/{i}")) for i in range(2)
+        ]
+        await asyncio.gather(*busy, *others)
+
+    asyncio.run(run())
+    # The second run does not wait for the four crawls of the first
+    assert order.index("B") <= 2
+    assert order[-1] == "A"
+
+
+def test_scheduler_backs_off_throttled_domains():
+    scheduler = CrawlScheduler(min_delay=0, poll_interval=0.01)
+    with pytest.raises(httpx.HTTPStatusError):
+        with scheduler.slot("https://a.com/1"):
+            raise _throttled("https://a.com/1", retry_after="0.2")
+    started_at = time.monotonic()
+    with scheduler.slot("https://a.com/2"):
+        assert time.monotonic() - started_at >= 0.15
+    with scheduler.slot("https://b.com/1"):
+        pass
+    domains = scheduler.get_stats()["domains"]
+    assert domains["a.com"]["throttled"] == 1
+    assert domains["a.com"]["backoff_seconds"] == 0.0
+    assert domains["b.com"]["max_wait_seconds"] < 0.1
+
+    # Without Retry-After the backoff doubles, and Jina throttling pauses every domain
+    assert scheduler.record_error(_throttled("https://c.com/1"))
+    assert scheduler.record_error(_throttled("https://c.com/2"))
+    assert scheduler.get_stats()["domains"]["c.com"]["backoff_seconds"] == 2.0
+    assert not scheduler.record_error(ValueError("not throttled"))
+    assert scheduler.record_error(_throttled(JINA_READER_URL, retry_after="5"))
+    assert scheduler.get_stats()["paused_seconds"] > 4
@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.benchmark.fakes import FakeSite
+from src.crawler import Article, Crawler
+from src.crawler.direct_client import DirectClient
+from src.utils.http_client import close_http_clients
+
+
+class _FakeJinaClient:
+    crawls: list[str] = []
+
+    def crawl(self, url: str, return_format: str) -> str:
+        self.crawls.append(url)
+        return "<p>from jina</p>"
+
+    async def acrawl(self, url: str, return_format: str) -> str:
+        return self.crawl(url, return_format)
+
+
+@pytest.fixture
+def site(monkeypatch):
+    # The site is served on the loopback address
+    monkeypatch.setenv("CRAWL_ALLOW_PRIVATE_HOSTS", "true")
+    with FakeSite(paragraphs=5) as site:
+        yield site
+        asyncio.run(close_http_clients())
+
+
+@pytest.fixture
+def direct_crawler(monkeypatch):
+    _FakeJinaClient.crawls = []
+    monkeypatch.setenv("CRAWL_CACHE_ENABLED", "false")
+    monkeypatch.setattr("src.crawler.crawler.SELECTED_CRAWLER_ENGINE", "direct")
+    monkeypatch.setattr("src.crawler.crawler.JinaClient", _FakeJinaClient)
+    # Readability needs Node.js, keep the article body as is
+    monkeypatch.setattr(
+        Crawler,
+        "_extract",
+        lambda self, url, html: Article(title=url, html_content=html),
+    )
+    return Crawler()
+
+
+def test_direct_client_follows_redirects_and_cuts_off(site, monkeypatch):
+    html = DirectClient().crawl(f"{site.url}/redirect/2/page")
+    assert "Article at /page" in html
+    assert site.requests == 3
+    with pytest.raises(httpx.TooManyRedirects):
+        DirectClient().crawl(f"{site.url}/redirect/6/page")
+    monkeypatch.setenv("CRAWL_MAX_BYTES", "100")
+    assert len(asyncio.run(DirectClient().acrawl(f"{site.url}/page"))) == 100
+
+
+def test_direct_crawl_falls_back_to_jina(site, direct_crawler):
+    article = direct_crawler.crawl(f"{site.url}/page")
+    assert "Article at /page" in article.html_content
+    pdf = asyncio.run(direct_crawler.acrawl(f"{site.url}/paper.pdf"))
+    assert pdf.html_content == "<p>from jina</p>"
+    assert _FakeJinaClient.crawls == [f"{site.url}/paper.pdf"]
+
+
+def test_direct_crawl_without_fallback_raises(site, direct_crawler, monkeypatch):
+    monkeypatch.setenv("CRAWLER_FALLBACK_TO_JINA", "false")
+    with pytest.raises(ValueError, match="not HTML"):
+        direct_crawler.crawl(f"{site.url}/paper.pdf")
+    assert _FakeJinaClient.crawls == []
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/admin",
+        "http://localhost:8000/api",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.1/",
+        "http://[::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "file:///etc/passwd",
+    ],
+)
+def test_direct_client_refuses_non_public_urls(url):
+    with pytest.raises(ValueError):
+        DirectClient().crawl(url)
+    with pytest.raises(ValueError):
+        asyncio.run(DirectClient().ahead(url, {}))
+
+
+def test_direct_client_checks_every_redirect(site, monkeypatch):
+    checked = []
+    monkeypatch.setattr(
+        "src.crawler.direct_client._check_addresses",
+        lambda url, addresses: checked.append(url.path),
+    )
+    monkeypatch.setenv("CRAWL_ALLOW_PRIVATE_HOSTS", "false")
+    DirectClient().head(f"{site.url}/redirect/2/page", {})
+    assert checked == ["/redirect/2/page", "/redirect/1/page", "/page"]
+
+    async def head_too_many_redirects():
+        try:
+            with pytest.raises(httpx.TooManyRedirects):
+                await DirectClient().ahead(f"{site.url}/redirect/6/page", {})
+        finally:
+            # The clients are bound to the event loop of this run
+            await close_http_clients()
+
+    asyncio.run(head_too_many_redirects())
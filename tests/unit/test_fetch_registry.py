@@ -0,0 +1,122 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import uuid
+
+from langchain_core.tools import BaseTool
+
+from src.tools.fake_search import FakeSearchTool
+from src.crawler import Article
+from src.crawler.passages import CRAWL_QUERY_METADATA_KEY
+from src.tools import crawl_many_tool, crawl_tool
+from src.tools.decorators import create_deduplicated_tool
+from src.tools.fetch_registry import get_fetch_registry_stats, normalize_query
+from src.tracing import STEP_METADATA_KEY
+
+
+def _config(thread_id: str, step: str, task: str = None) -> dict:
+    return {
+        "configurable": {"thread_id": thread_id},
+        "metadata": {STEP_METADATA_KEY: step, CRAWL_QUERY_METADATA_KEY: task},
+    }
+
+
+class _SyncSearch(BaseTool):
+    name: str = "web_search"
+    description: str = "A search engine without an async implementation."
+    calls: int = 0
+
+    def _run(self, query: str, run_manager=None) -> str:
+        self.calls += 1
+        return f"results for {query}"
+
+
+def test_normalize_query_ignores_case_and_spacing_only():
+    assert normalize_query(" Tidal  power UK ") == normalize_query("tidal POWER uk")
+    assert normalize_query("tidal power") != normalize_query("tidal power 2024")
+    for query, other in [
+        ("C++ tutorial", "C# tutorial"),
+        ("C++ tutorial", "c tutorial"),
+        ("python vs rust", "rust vs python"),
+        (".NET", "NET"),
+        ("go go", "go"),
+    ]:
+        assert normalize_query(query) != normalize_query(other)
+
+
+def test_repeated_searches_are_answered_from_the_registry():
+    thread_id = str(uuid.uuid4())
+    search = create_deduplicated_tool(FakeSearchTool)(max_results=2)
+    results = search.invoke("tidal power UK", _config(thread_id, "Step 1"))
+    assert len(results) == 2
+    note = asyncio.run(search.ainvoke("Tidal Power UK", _config(thread_id, "Step 1")))
+    assert note.startswith("Already fetched in this step")
+    assert search.invoke("tidal  power uk", _config(thread_id, "Step 2")) == results
+    # A different search is made
+    search.invoke("UK tidal power", _config(thread_id, "Step 2"))
+    assert get_fetch_registry_stats(thread_id) == {
+        "searches": 4,
+        "search_hits": 2,
+        "crawls": 0,
+        "crawl_hits": 0,
+        "searched_queries": 2,
+        "crawled_urls": 0,
+    }
+
+    # Tools without _arun search in a thread, the query is looked up once
+    sync_search = create_deduplicated_tool(_SyncSearch)()
+    asyncio.run(sync_search.ainvoke("wave power", _config(thread_id, "Step 2")))
+    asyncio.run(sync_search.ainvoke("wave power", _config(thread_id, "Step 3")))
+    assert sync_search.calls == 1
+    assert get_fetch_registry_stats(thread_id)["searches"] == 6
+
+    # Outside of a graph run every search is made
+    sync_search.invoke("wave power")
+    assert sync_search.calls == 2
+
+
+def test_repeated_crawls_are_answered_from_the_registry(monkeypatch):
+    crawled = []
+
+    def crawl(self, url):
+        crawled.append(url)
+        return Article(title=url, html_content=f"<p>Content of {url}</p>")
+
+    async def acrawl(self, url, timeout=None):
+        article = crawl(self, url)
+        article.url = url
+        return article
+
+    monkeypatch.setattr("src.tools.crawl.Crawler.crawl", crawl)
+    monkeypatch.setattr("src.crawler.batch.Crawler.acrawl", acrawl)
+    thread_id = str(uuid.uuid4())
+    url = "https://example.com/page"
+    first = crawl_tool.invoke({"url": url}, _config(thread_id, "Step 1", "tides"))
+    assert "Content of" in first["crawled_content"]
+    again = crawl_tool.invoke(
+        {"url": url + "#top"}, _config(thread_id, "Step 1", "tides")
+    )
+    assert again["note"].startswith("Already fetched in this step")
+
+    results = asyncio.run(
+        crawl_many_tool.ainvoke(
+            {"urls": [url, "https://example.com/other"]},
+            _config(thread_id, "Step 2", "Tides"),
+        )
+    )
+    assert results[0] == {
+        "url": url,
+        "crawled_content": first["crawled_content"],
+        "latency_ms": 0,
+    }
+    assert "other" in results[1]["crawled_content"]
+    assert crawled == [url, "https://example.com/other"]
+
+    # The passages of a page read for another task, or query, are taken again
+    crawl_tool.invoke({"url": url}, _config(thread_id, "Step 3", "waves"))
+    crawl_tool.invoke({"url": url, "query": "tides"}, _config(thread_id, "Step 3"))
+    crawl_tool.invoke({"url": url, "query": "costs"}, _config(thread_id, "Step 3"))
+    assert crawled == [url, "https://example.com/other", url, url]
+    stats = get_fetch_registry_stats(thread_id)
+    assert (stats["crawls"], stats["crawl_hits"], stats["crawled_urls"]) == (7, 3, 2)
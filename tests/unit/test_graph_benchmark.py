@@ -0,0 +1,41 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.messages import SystemMessage
+
+from src.benchmark.fakes import FakeChatModel, FakeSearchTool
+from src.benchmark.graph_benchmark import run_scenario
+
+
+def test_fake_chat_model_plays_planner():
+    model = FakeChatModel(plan_steps=4)
+    response = model.invoke([SystemMessage(content="interface Plan {}"), ("user", "q")])
+    assert '"Step 4"' in response.content
+
+
+def test_fake_search_tool_returns_results():
+    results = FakeSearchTool(max_results=2).invoke({"query": "panda"})
+    assert len(results) == 2
+    assert results[0]["title"] == "Result 1 for panda"
+
+
+def test_run_scenario_completes_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path))
+    result = asyncio.run(run_scenario(steps=2, concurrency=2, model_kwargs={}))
+    assert result.errors == 0
+    assert len(result.run_seconds) == 2
+    # The first step of each run is researched while the plan is generated
+    assert result.node_stats["researcher"].calls == 2
+    assert result.node_stats["reporter"].calls == 2
+
+
+def test_nodes_do_not_block_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setenv("BLOB_STORE_DIR", str(tmp_path))
+    result = asyncio.run(
+        run_scenario(steps=1, concurrency=5, model_kwargs={"latency": 0.2})
+    )
+    assert result.errors == 0
+    # Blocking LLM calls would hold the loop for the whole 0.2s latency
+    assert max(result.loop_lag_seconds) < 0.15
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.llms import llm
+from src.utils.http_client import (
+    close_http_clients,
+    get_async_http_client,
+    get_http_client,
+    get_http_client_stats,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        _Handler.connections.add(self.client_address)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _Handler.connections = set()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    asyncio.run(close_http_clients())
+    server.shutdown()
+
+
+def test_sync_client_reuses_connections(server_url):
+    client = get_http_client(f"{server_url}/a")
+    assert get_http_client(f"{server_url}/b") is client
+    for _ in range(5):
+        assert client.post(f"{server_url}/search", json={}).text == "ok"
+    assert len(_Handler.connections) == 1
+    stats = get_http_client_stats()[server_url]["sync"]
+    assert stats["requests"] == 5
+    assert stats["connections"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_async_client_is_separate_and_pooled(server_url):
+    async def run():
+        client = get_async_http_client(server_url)
+        for _ in range(3):
+            assert (await client.post(f"{server_url}/search", json={})).text == "ok"
+        stats = get_http_client_stats()[server_url]
+        # Async connections belong to the loop, close them before it ends
+        await close_http_clients()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["async"]["requests"] == 3
+    assert stats["async"]["connections"] == 1
+    assert "sync" not in stats
+
+
+def test_openai_models_share_clients_unless_proxied(server_url, monkeypatch):
+    monkeypatch.delenv("OPENAI_PROXY", raising=False)
+    conf = {
+        "model": "gpt-4o",
+        "model_provider": "openai",
+        "base_url": server_url,
+        "api_key": "sk-test",
+    }
+    shared = llm._create_chat_model(conf, "basic")
+    assert shared.http_client is get_http_client(server_url)
+    assert shared.http_async_client is get_async_http_client(server_url)
+
+    proxied = llm._create_chat_model({**conf, "openai_proxy": server_url}, "basic")
+    assert proxied.openai_proxy == server_url
+    assert proxied.http_client is not get_http_client(server_url)
+    monkeypatch.setenv("OPENAI_PROXY", server_url)
+    assert llm._create_chat_model(conf, "basic").openai_proxy == server_url
@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+
+import pytest
+from langchain_core.language_models.fake_chat_models import (
+    FakeMessagesListChatModel,
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.llms.cache import (
+    CachedChatModel,
+    LLMCacheMissError,
+    LLMCacheMode,
+    parse_cache_mode,
+    wrap_with_cache,
+)
+from src.storage.disk_cache import DiskLRUCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DiskLRUCache(str(tmp_path / "llm_cache.sqlite"))
+    yield store
+    store.close()
+
+
+def _fake_model():
+    return FakeMessagesListChatModel(
+        responses=[AIMessage(content="first"), AIMessage(content="second")]
+    )
+
+
+def test_read_through_records_and_replays(store):
+    llm = CachedChatModel(model=_fake_model(), store=store)
+    assert llm.invoke("hello").content == "first"
+    assert llm.invoke("hello").content == "first"
+    assert llm.invoke("other").content == "second"
+    assert store.stats.hits == 1
+    assert len(store) == 2
+
+
+def test_key_ignores_message_ids(store):
+    llm = CachedChatModel(model=_fake_model(), store=store)
+    llm.invoke([HumanMessage(content="hello", id="a")])
+    assert llm.invoke([HumanMessage(content="hello", id="b")]).content == "first"
+
+
+def test_key_includes_bound_kwargs(store):
+    llm = CachedChatModel(model=_fake_model(), store=store)
+    assert llm.invoke("hello").content == "first"
+    assert llm.bind(tools=[{"name": "x"}]).invoke("hello").content == "second"
+
+
+def test_replay_mode_raises_on_miss(store):
+    CachedChatModel(model=_fake_model(), store=store).invoke("hello")
+    replay = CachedChatModel(model=_fake_model(), store=store, mode=LLMCacheMode.REPLAY)
+    assert replay.invoke("hello").content == "first"
+    with pytest.raises(LLMCacheMissError):
+        replay.invoke("unknown")
+
+
+def test_stream_is_recorded(store):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="streamed reply")]))
+    llm = CachedChatModel(model=model, store=store)
+    assert "".join(chunk.content for chunk in llm.stream("hello")) == "streamed reply"
+    chunks = list(llm.stream("hello"))
+    assert len(chunks) == 1
+    assert chunks[0].content == "streamed reply"
+
+
+def test_async_calls_use_the_store_off_the_event_loop(store, monkeypatch):
+    threads = []
+    get, set_ = store.get, store.set
+
+    def record_thread(method):
+        def wrapper(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(store, "get", record_thread(get))
+    monkeypatch.setattr(store, "set", record_thread(set_))
+    llm = CachedChatModel(model=_fake_model(), store=store)
+
+    async def run():
+        await llm.ainvoke("hello")
+        assert (await llm.ainvoke("hello")).content == "first"
+        chunks = [chunk async for chunk in llm.astream("other")]
+        assert "".join(chunk.content for chunk in chunks) == "second"
+
+    asyncio.run(run())
+    assert len(threads) == 5
+    assert threading.main_thread() not in threads
+
+
+def test_lru_eviction(tmp_path):
+    store = DiskLRUCache(str(tmp_path / "cache.sqlite"), max_size_bytes=10)
+    store.set("a", b"12345")
+    store.set("b", b"12345")
+    store.get("a")
+    store.set("c", b"12345")
+    assert store.get("a") == b"12345"
+    assert store.get("b") is None
+    assert store.stats.evictions == 1
+    store.close()
+
+
+def test_parse_cache_mode():
+    assert parse_cache_mode(False) == LLMCacheMode.OFF
+    assert parse_cache_mode(None) == LLMCacheMode.OFF
+    assert parse_cache_mode("read-through") == LLMCacheMode.READ_THROUGH
+    assert parse_cache_mode("REPLAY") == LLMCacheMode.REPLAY
+    with pytest.raises(ValueError):
+        parse_cache_mode("sometimes")
+
+
+def test_wrap_with_cache_off_returns_model():
+    model = _fake_model()
+    assert wrap_with_cache(model, None) is model
+    assert wrap_with_cache(model, {"mode": "off"}) is model
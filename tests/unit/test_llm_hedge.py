@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.llms.hedge import HedgedChatModel, Hedger
+
+
+class DelayedChatModel(BaseChatModel):
+    """Answers call ``i`` with ``answer-i`` after ``delays[i]`` seconds."""
+
+    delays: list[float]
+    calls: list[int] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "delayed"
+
+    def _next(self) -> tuple[str, float]:
+        index = len(self.calls)
+        self.calls.append(index)
+        return f"answer-{index}", self.delays[index]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        answer, delay = self._next()
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(answer))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        answer, delay = self._next()
+        time.sleep(delay)
+        for token in (answer, "!"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        answer, delay = self._next()
+        await asyncio.sleep(delay)
+        for token in (answer, "!"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def _hedged(delays: list[float], budget: float = 1.0) -> HedgedChatModel:
+    hedger = Hedger("test", percentile=90, budget=budget, min_samples=5)
+    for streaming in (True, False):
+        for _ in range(5):
+            hedger.record(streaming, 0.01, hedge_won=False)
+    hedger.min_delay_seconds = 0.05
+    return HedgedChatModel(model=DelayedChatModel(delays=delays), hedger=hedger)
+
+
+def test_slow_call_is_hedged():
+    llm = _hedged([2.0, 0.0])
+    started_at = time.monotonic()
+    assert llm.invoke("hi").content == "answer-1"
+    assert time.monotonic() - started_at < 1.0
+    stats = llm.hedger.get_stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_fast_call_is_not_hedged():
+    llm = _hedged([0.0, 0.0])
+    assert llm.invoke("hi").content == "answer-0"
+    assert llm.hedger.get_stats()["hedged"] == 0
+    assert len(llm.model.calls) == 1
+
+
+def test_hedge_budget():
+    llm = _hedged([0.3, 0.0], budget=0.0)
+    assert llm.invoke("hi").content == "answer-0"
+    stats = llm.hedger.get_stats()
+    assert stats["hedged"] == 0
+    assert stats["budget_exhausted"] == 1
+
+
+def test_sync_stream_is_hedged():
+    llm = _hedged([2.0, 0.0])
+    chunks = [chunk.content for chunk in llm.stream("hi")]
+    assert chunks == ["answer-1", "!"]
+
+
+def test_async_stream_is_hedged_and_loser_cancelled():
+    llm = _hedged([2.0, 0.0])
+    started_at = time.monotonic()
+
+    async def stream():
+        return [chunk.content async for chunk in llm.astream("hi")]
+
+    assert asyncio.run(stream()) == ["answer-1", "!"]
+    assert time.monotonic() - started_at < 1.0
+    assert llm.hedger.get_stats()["hedge_wins"] == 1
+
+
+def test_async_primary_wins_when_hedge_is_slower():
+    llm = _hedged([0.2, 2.0])
+
+    async def invoke():
+        started_at = time.monotonic()
+        answer = await llm.ainvoke("hi")
+        return answer, time.monotonic() - started_at
+
+    answer, seconds = asyncio.run(invoke())
+    assert answer.content == "answer-0"
+    # The slower hedge is cancelled, not awaited. asyncio.run itself waits
+    # for the thread of the sync fake model to finish.
+    assert seconds < 1.0
+    stats = llm.hedger.get_stats()
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 0
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from collections import Counter
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.llms.pool import create_llm_pool, get_pool_stats
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FailingChatModel(GenericFakeChatModel):
+    """Answers with its label, after raising ``error`` ``fail_times`` times."""
+
+    label: str
+    error: Any = None
+    fail_times: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise self.error
+        self.messages = iter([AIMessage(content=self.label)])
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+@pytest.fixture
+def endpoints():
+    return {label: FailingChatModel(messages=iter([]), label=label) for label in "ab"}
+
+
+def _make_pool(models, routing="least_outstanding", weights=None):
+    weights = weights or {}
+    return create_llm_pool(
+        "basic",
+        {
+            "routing": routing,
+            "ejection_seconds": 60,
+            "endpoints": [
+                {"name": label, "model": label, "weight": weights.get(label, 1)}
+                for label in models
+            ],
+        },
+        lambda conf, name: models[conf["model"]],
+    )
+
+
+def _stats() -> dict[str, dict]:
+    return {s["endpoint"]: s for s in get_pool_stats()["basic"]}
+
+
+@pytest.mark.parametrize("routing", ["least_outstanding", "latency_ewma"])
+def test_weighted_routing(endpoints, routing):
+    llm = _make_pool(endpoints, routing=routing, weights={"a": 2, "b": 1})
+    answers = Counter(llm.invoke("hi").content for _ in range(30))
+    assert set(answers) == {"a", "b"}
+    if routing == "least_outstanding":
+        assert answers == {"a": 20, "b": 10}
+    assert _stats()["a"]["outstanding"] == 0
+    assert _stats()["a"]["latency_ewma"] is not None
+
+
+def test_rate_limited_endpoint_is_ejected(endpoints):
+    endpoints["a"].error, endpoints["a"].fail_times = StatusError(429), 1
+    llm = _make_pool(endpoints)
+    assert [llm.invoke("hi").content for _ in range(3)] == ["b", "b", "b"]
+    assert _stats()["a"]["healthy"] is False
+    assert _stats()["a"]["rate_limited"] == 1
+
+
+def test_endpoint_is_ejected_after_consecutive_errors(endpoints):
+    endpoints["a"].error, endpoints["a"].fail_times = StatusError(500), 3
+    llm = _make_pool(endpoints, weights={"a": 100})
+    assert [llm.invoke("hi").content for _ in range(4)] == ["b"] * 4
+    assert _stats()["a"]["errors"] == 3
+    assert _stats()["a"]["healthy"] is False
+
+
+def test_non_retryable_error_is_raised(endpoints):
+    endpoints["a"].error, endpoints["a"].fail_times = StatusError(400), 1
+    llm = _make_pool(endpoints)
+    with pytest.raises(StatusError):
+        llm.invoke("hi")
+    assert _stats()["a"]["healthy"] is True
+    assert _stats()["b"]["requests"] == 0
+
+
+def test_stream_fails_over_before_first_chunk(endpoints):
+    endpoints["a"].error, endpoints["a"].fail_times = StatusError(503), 1
+    llm = _make_pool(endpoints)
+
+    async def stream():
+        return [chunk.content async for chunk in llm.astream("hi")]
+
+    assert "".join(asyncio.run(stream())) == "b"
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from src.benchmark.load_test import _parse_sse, run_session
+
+
+def _sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def test_parse_sse():
+    event_type, data = _parse_sse(["event: message_chunk", 'data: {"agent": "x"}'])
+    assert event_type == "message_chunk"
+    assert data == {"agent": "x"}
+
+
+def test_run_session_resumes_after_interrupt():
+    payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        payloads.append(payload)
+        if "interrupt_feedback" not in payload:
+            body = _sse("message_chunk", {"agent": "planner", "content": "{"})
+            body += _sse("interrupt", {"content": "Please review the plan."})
+        else:
+            body = _sse("message_chunk", {"agent": "reporter", "content": "Report"})
+        return httpx.Response(200, text=body)
+
+    args = argparse.Namespace(
+        url="http://test",
+        query="question",
+        max_step_num=1,
+        auto_accept=False,
+        interrupt_feedback="accepted",
+        max_resumes=3,
+    )
+
+    async def session():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await run_session(client, args)
+
+    result = asyncio.run(session())
+
+    assert result.error is None
+    assert result.events == 3
+    assert result.interrupts == 1
+    assert result.first_event is not None
+    assert result.first_report_token >= result.first_event
+    assert payloads[1]["interrupt_feedback"] == "accepted"
+    assert payloads[1]["thread_id"] == payloads[0]["thread_id"]
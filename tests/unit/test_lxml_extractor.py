@@ -0,0 +1,39 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.benchmark.extraction_benchmark import f1_score, load_corpus, text_of
+from src.crawler import Crawler
+from src.crawler.readability_extractor import ReadabilityExtractor
+
+_PAGES = {name: (html, expected) for name, html, expected in load_corpus()}
+
+
+@pytest.mark.parametrize("name", sorted(_PAGES))
+def test_lxml_extracts_the_articles_of_the_corpus(name):
+    html, expected = _PAGES[name]
+    article = ReadabilityExtractor().extract_article(html, "lxml")
+    assert f1_score(text_of(article.html_content), expected) > 0.9
+
+
+def test_lxml_drops_boilerplate_and_cleans_titles():
+    article = Crawler(extractor="lxml")._extract(
+        "https://example.com/news", _PAGES["news"][0]
+    )
+    assert article.url == "https://example.com/news"
+    assert article.title == "Council approves 2.3 billion dollar light rail expansion"
+    markdown = article.to_markdown()
+    assert "2.3 billion dollar expansion" in markdown
+    for boilerplate in ("cookies", "Related stories", "TransitFan88", "Most read"):
+        assert boilerplate not in markdown
+
+    zh_news = ReadabilityExtractor().extract_article(_PAGES["zh_news"][0], "lxml")
+    assert zh_news.title == "大模型推理价格一年降九成 效率提升是主因"
+
+
+def test_extractor_engine_selection(monkeypatch):
+    monkeypatch.setenv("CRAWL_EXTRACTOR", "lxml")
+    assert ReadabilityExtractor().extract_article("").html_content == ""
+    with pytest.raises(ValueError, match="Unsupported extractor engine"):
+        ReadabilityExtractor().extract_article("<p>text</p>", "node")
@@ -0,0 +1,52 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from markdownify import markdownify as md
+
+from src.benchmark.extraction_benchmark import load_corpus
+from src.crawler import Article, get_process_pool_stats, shutdown_process_pool
+from src.crawler.lxml_extractor import LxmlExtractor
+from src.crawler.markdown import html_to_markdown
+from src.crawler.process_pool import run_cpu_bound
+
+_ARTICLES = {
+    name: LxmlExtractor().extract_article(html) for name, html, _ in load_corpus()
+}
+
+
+@pytest.mark.parametrize("name", sorted(_ARTICLES))
+def test_html_to_markdown_matches_markdownify_within_budget(name):
+    html = _ARTICLES[name].html_content
+    assert html_to_markdown(html, 10**9) == md(html).strip()
+
+
+def test_to_markdown_stops_early_on_large_pages():
+    html = "".join(article.html_content for article in _ARTICLES.values()) * 200
+    article = Article(title="Large page", html_content=html)
+    markdown = article.to_markdown(max_chars=1000)
+    assert markdown.startswith("# Large page\n\n")
+    assert 1000 <= len(markdown) < 20_000
+    assert article.to_markdown().startswith(markdown[:1000])
+    assert html_to_markdown("  ", 1000) == ""
+
+
+@pytest.fixture
+def process_pool():
+    yield
+    shutdown_process_pool()
+
+
+def test_run_cpu_bound_uses_the_pool_for_large_inputs(monkeypatch, process_pool):
+    monkeypatch.setenv("CRAWL_PROCESS_POOL_SIZE", "1")
+    before = get_process_pool_stats()
+    assert run_cpu_bound(len, "small", size=5) == 5
+    monkeypatch.setenv("CRAWL_PROCESS_POOL_MIN_CHARS", "0")
+    article = _ARTICLES["wiki"]
+    assert run_cpu_bound(
+        article.to_markdown, True, 500, size=len(article.html_content)
+    ) == article.to_markdown(max_chars=500)
+    stats = get_process_pool_stats()
+    assert stats["inline"] == before["inline"] + 1
+    assert stats["submitted"] == before["submitted"] + 1
+    assert stats["workers"] == 1 and stats["pending"] == 0
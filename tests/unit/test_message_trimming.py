@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.config.configuration import Configuration
+from src.llms.tokens import estimate_tokens, trim_to_token_budget
+from src.prompts.template import apply_prompt_template
+
+
+def _research_transcript(tool_calls: int) -> list:
+    messages = [HumanMessage(content="task " * 50)]
+    for i in range(tool_calls):
+        messages.append(
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "search", "args": {"q": str(i)}, "id": str(i)}],
+            )
+        )
+        messages.append(ToolMessage(content="result " * 200, tool_call_id=str(i)))
+    return messages
+
+
+def test_trim_keeps_tool_results_with_their_calls():
+    messages = _research_transcript(5)
+    trimmed = trim_to_token_budget(messages, max_tokens=1000)
+    assert estimate_tokens(trimmed) <= 1000
+    # The task and the latest tool round are kept
+    assert trimmed[0] is messages[0]
+    assert trimmed[1]["content"].startswith("[6 earlier messages")
+    assert trimmed[-2:] == messages[-2:]
+    for i, message in enumerate(trimmed):
+        if isinstance(message, ToolMessage):
+            assert trimmed[i - 1].tool_calls[0]["id"] == message.tool_call_id
+
+
+def test_trim_drops_old_turns_of_a_chat():
+    messages = []
+    for i in range(10):
+        messages.append({"role": "user", "content": f"question {i} " * 100})
+        messages.append({"role": "assistant", "content": f"answer {i} " * 100})
+    messages.append({"role": "user", "content": "latest question"})
+    trimmed = trim_to_token_budget(messages, max_tokens=1000, reserved_tokens=200)
+    assert estimate_tokens(trimmed) <= 800
+    assert trimmed[-1]["content"] == "latest question"
+    assert trim_to_token_budget(messages, max_tokens=100_000) == messages
+
+
+def test_apply_prompt_template_trims_to_the_agent_budget(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger="src.prompts.template")
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "100000")
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET_RESEARCHER", "3000")
+    state = {"messages": _research_transcript(20), "locale": "en-US"}
+    researcher = apply_prompt_template("researcher", state, Configuration())
+    assert estimate_tokens(researcher) <= 3000
+    assert researcher[0]["role"] == "system"
+    assert researcher[1] is state["messages"][0]
+    coder = apply_prompt_template("coder", state, Configuration())
+    assert len(coder) == len(state["messages"]) + 1
+    # The size of every prompt is logged, trimmed or not
+    logged = [r.getMessage() for r in caplog.records if r.levelno == logging.INFO]
+    assert logged[0].startswith("researcher prompt: ~")
+    assert "trimmed from" in logged[0]
+    assert logged[1].startswith("coder prompt: ~")
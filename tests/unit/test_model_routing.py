@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import importlib
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+from src.llms.routing import (
+    RoutedChatModel,
+    RoutingRule,
+    get_routing_stats,
+    parse_routing_rules,
+    resolve_request_tier,
+)
+
+
+def _routed(agent: str, rules: list[RoutingRule]) -> RoutedChatModel:
+    models = {
+        name: FakeListChatModel(responses=[name] * 10)
+        for name in ("basic", "fast", "reasoning")
+    }
+    return RoutedChatModel(
+        model=models["basic"],
+        agent=agent,
+        default_model_name="basic",
+        rules=rules,
+        resolve=models.__getitem__,
+    )
+
+
+def test_parse_routing_rules():
+    rules = parse_routing_rules(
+        {"rules": [{"model": "fast", "agents": ["coordinator"]}]}
+    )
+    assert rules == [RoutingRule(model="fast", agents=["coordinator"])]
+    assert parse_routing_rules(None) == []
+    with pytest.raises(ValueError):
+        parse_routing_rules({"rules": [{"agents": ["coordinator"]}]})
+    with pytest.raises(ValueError):
+        parse_routing_rules({"rules": [{"model": "fast", "unknown": 1}]})
+
+
+def test_request_tiers_are_decided_by_the_server():
+    conf = {"default_tier": "standard", "request_tiers": ["standard", "trial"]}
+    assert resolve_request_tier(conf, None) == "standard"
+    assert resolve_request_tier(conf, "trial") == "trial"
+    with pytest.raises(ValueError, match="premium"):
+        resolve_request_tier(conf, "premium")
+    # Without request_tiers clients can't pick a tier
+    assert resolve_request_tier(None, None) is None
+    with pytest.raises(ValueError):
+        resolve_request_tier({"default_tier": "standard"}, "standard")
+
+
+def test_chat_stream_rejects_tiers_clients_may_not_pick(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    # src.server exports the FastAPI app under the name of the module
+    server = importlib.import_module("src.server.app")
+    # tests/test_fix.py may have replaced src.llms.llm, resolve with the rules here
+    monkeypatch.setattr(
+        server,
+        "get_request_tier",
+        lambda tier: resolve_request_tier({"request_tiers": ["standard"]}, tier),
+    )
+    response = TestClient(server.app).post(
+        "/api/chat/stream",
+        json={"messages": [{"role": "user", "content": "q"}], "tier": "premium"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown request tier: premium"
+
+
+def test_route_by_prompt_size():
+    llm = _routed("researcher", [RoutingRule(model="fast", max_prompt_tokens=100)])
+    assert llm.invoke("short question").content == "fast"
+    assert llm.invoke("x" * 1000).content == "basic"
+    assert get_routing_stats()["researcher"] == {"fast": 1, "basic": 1}
+
+
+def test_route_by_agent_and_tier():
+    rules = [
+        RoutingRule(model="reasoning", tiers=["premium"]),
+        RoutingRule(model="fast", agents=["coordinator"]),
+    ]
+    coordinator = _routed("coordinator", rules)
+    reporter = _routed("reporter", rules)
+    assert coordinator.invoke("hi").content == "fast"
+    assert reporter.invoke("hi").content == "basic"
+    premium = {"metadata": {"request_tier": "premium"}}
+    assert coordinator.invoke("hi", config=premium).content == "reasoning"
+    # Streaming calls read the tier from the config of the enclosing run, as
+    # in graph nodes
+    stream = RunnableLambda(
+        lambda text: "".join(chunk.content for chunk in reporter.stream(text))
+    )
+    assert stream.invoke("hi", config=premium) == "reasoning"
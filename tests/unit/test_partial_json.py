@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+from src.utils.json_utils import PartialJSONParser
+
+PLAN = {
+    "locale": "en-US",
+    "has_enough_context": False,
+    "thought": 'Quotes ", braces {} and commas, inside strings',
+    "title": "Plan",
+    "steps": [
+        {
+            "need_web_search": True,
+            "title": f"Step {i}",
+            "description": "Collect [data], {more}",
+            "step_type": "research",
+        }
+        for i in range(1, 3)
+    ],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_partial_plans_at_value_boundaries(chunk_size):
+    text = "```json\n" + json.dumps(PLAN, indent=2) + "\n```"
+    parser = PartialJSONParser()
+    updates = []
+    for i in range(0, len(text), chunk_size):
+        partial = parser.feed(text[i : i + chunk_size])
+        if partial is not None:
+            updates.append(partial)
+    assert updates[-1] == PLAN
+    # Only completed values and steps are ever reported
+    for partial in updates:
+        assert all(partial[key] == PLAN[key] for key in partial if key != "steps")
+        assert PLAN["steps"][: len(partial.get("steps", []))] == partial.get(
+            "steps", []
+        )
+    step_counts = [len(p["steps"]) for p in updates if "steps" in p]
+    if chunk_size == 1:
+        assert [list(p) for p in updates[:4]] == [
+            ["locale"],
+            ["locale", "has_enough_context"],
+            ["locale", "has_enough_context", "thought"],
+            ["locale", "has_enough_context", "thought", "title"],
+        ]
+        assert step_counts == [1, 2]
+
+
+def test_unchanged_and_incomplete_text_is_not_reported():
+    parser = PartialJSONParser()
+    assert parser.feed("Here is the plan: ") is None
+    assert parser.feed('{"title": "Pla') is None
+    assert parser.feed('n"') == {"title": "Plan"}
+    assert parser.feed(", ") is None
+    assert parser.feed('"steps": [{"title": "a"') is None
+    assert parser.feed("}]}") == {"title": "Plan", "steps": [{"title": "a"}]}
+    assert parser.feed(" trailing text {") is None
@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.crawler import Article
+from src.crawler.passages import (
+    CRAWL_QUERY_METADATA_KEY,
+    select_passages,
+    split_passages,
+)
+from src.tools import crawl_tool
+
+_FILLER = "Visitors can find opening hours and ticket prices on the website. "
+_MARKDOWN = "\n\n".join(
+    [
+        "Home | News | Contact",
+        _FILLER * 10,
+        "The museum was founded in 1874 by a group of local merchants.",
+        _FILLER * 10,
+        "The museum has 120 employees and welcomes 400,000 visitors a year.",
+        _FILLER * 10,
+    ]
+)
+
+
+def test_split_passages_merges_paragraphs_and_splits_long_ones():
+    passages = split_passages(_MARKDOWN, passage_chars=300)
+    assert all(len(passage) <= 300 for passage in passages)
+    assert "".join(passages).replace("\n", "").replace(" ", "") == _MARKDOWN.replace(
+        "\n", ""
+    ).replace(" ", "")
+    assert split_passages("a\n\nb\n\n\nc", passage_chars=300) == ["a\n\nb\n\nc"]
+
+
+def test_select_passages_returns_relevant_passages_within_budget():
+    content = select_passages(_MARKDOWN, "When was the museum founded?", 300, 200)
+    assert "founded in 1874" in content
+    assert "Home | News" not in content
+    assert len(content) <= 300
+
+    content = select_passages(_MARKDOWN, "museum founded employees", 500, 200)
+    assert content.index("1874") < content.index("120 employees")
+    assert "\n\n...\n\n" in content
+
+    # Without a query or a matching passage the page is cut off
+    assert select_passages(_MARKDOWN, None, 300) == _MARKDOWN[:300]
+    assert select_passages(_MARKDOWN, "volcano eruption", 300) == _MARKDOWN[:300]
+
+
+def test_select_passages_scores_cjk_by_bigrams():
+    markdown = "\n\n".join(["网站导航", "天气很好。" * 60, "推理价格一年下降了九成。"])
+    assert "九成" in select_passages(markdown, "推理价格", 100, 50)
+
+
+def test_crawl_tool_ranks_passages_against_the_current_task(monkeypatch):
+    html = "".join(f"<p>{paragraph}</p>" for paragraph in _MARKDOWN.split("\n\n"))
+    monkeypatch.setattr(
+        "src.tools.crawl.Crawler.crawl",
+        lambda self, url: Article(title="City museum", html_content=html),
+    )
+    monkeypatch.setenv("CRAWL_CONTENT_CHARS", "400")
+    result = crawl_tool.invoke(
+        {"url": "https://example.com/museum"},
+        config={"metadata": {CRAWL_QUERY_METADATA_KEY: "How many employees?"}},
+    )
+    assert result["crawled_content"].startswith("# City museum\n\n")
+    assert "120 employees" in result["crawled_content"]
+    assert len(result["crawled_content"]) <= 400
+
+    result = crawl_tool.invoke({"url": "https://example.com/museum"})
+    assert result["crawled_content"].startswith("# City museum\n\nHome")
@@ -0,0 +1,99 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.config.configuration import Configuration
+from src.prompts.template import (
+    apply_prompt_template,
+    get_prompt_template_stats,
+    precompile_prompt_templates,
+    render_prompt_template,
+)
+from src.tracing import AGENT_METADATA_KEY, PromptCacheCallback, get_prompt_cache_stats
+
+
+def _state(question: str, locale: str) -> dict:
+    return {"messages": [{"role": "user", "content": question}], "locale": locale}
+
+
+def test_prefix_cache_layout_keeps_the_system_prompt_stable(monkeypatch):
+    monkeypatch.setenv("PROMPT_LAYOUT", "prefix_cache")
+    first = apply_prompt_template("planner", _state("q1", "en-US"), Configuration())
+    second = apply_prompt_template("planner", _state("q2", "fr-FR"), Configuration())
+    assert first[0]["content"] == second[0]["content"]
+    assert "fr-FR" not in second[0]["content"]
+    # The context follows the system prompt, the question stays the last turn
+    context = second[1]["content"]
+    assert context.startswith("Runtime Context:")
+    assert "- locale: fr-FR" in context
+    assert second[-1]["content"] == "q2"
+    # Time is rounded down to the hour
+    assert ":00" in context.split("CURRENT_TIME: ")[1].split("\n")[0]
+
+
+@pytest.mark.parametrize(
+    "prompt_name", ["coder", "coordinator", "planner", "reporter", "researcher"]
+)
+def test_prefix_cache_prompts_refer_to_the_runtime_context(monkeypatch, prompt_name):
+    monkeypatch.setenv("PROMPT_LAYOUT", "prefix_cache")
+    system_prompt = apply_prompt_template(
+        prompt_name, _state("q", "fr-FR"), Configuration()
+    )[0]["content"]
+    assert "CURRENT_TIME: given in the Runtime Context message" in system_prompt
+    # No sentence is left with an empty or placeholder locale
+    for inline_phrase in ("locale = **", "locale=", "locale of **"):
+        assert inline_phrase not in system_prompt
+
+
+def test_inline_layout_renders_volatile_values(monkeypatch):
+    monkeypatch.delenv("PROMPT_LAYOUT", raising=False)
+    messages = apply_prompt_template("planner", _state("q", "fr-FR"), Configuration())
+    assert len(messages) == 2
+    assert "fr-FR" in messages[0]["content"]
+
+
+def test_prompt_cache_callback_counts_cached_tokens():
+    model = GenericFakeChatModel(
+        messages=iter(
+            AIMessage(
+                content="ok",
+                usage_metadata={
+                    "input_tokens": 1000,
+                    "output_tokens": 1,
+                    "total_tokens": 1001,
+                    "input_token_details": {"cache_read": cached},
+                },
+            )
+            for cached in (0, 900)
+        )
+    )
+    config = {
+        "callbacks": [PromptCacheCallback()],
+        "metadata": {AGENT_METADATA_KEY: "test_prompt_cache"},
+    }
+    model.invoke("q", config)
+    model.invoke("q", config)
+    stats = get_prompt_cache_stats()["test_prompt_cache"]
+    assert stats["calls"] == 2
+    assert stats["input_tokens"] == 2000
+    assert stats["cached_tokens"] == 900
+    assert stats["cached_ratio"] == 0.45
+
+
+def test_renders_are_memoized_by_the_variables_a_template_uses(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMPT_BYTECODE_CACHE_DIR", str(tmp_path / "bytecode"))
+    monkeypatch.setattr("src.prompts.template.env.bytecode_cache", None)
+    assert precompile_prompt_templates() > 0
+    assert any((tmp_path / "bytecode").iterdir())
+    english = render_prompt_template("researcher", {"locale": "en-US", "x": [1]})
+    # Variables the template does not use, even unhashable ones, are ignored
+    again = render_prompt_template("researcher", {"locale": "en-US", "x": [2]})
+    french = render_prompt_template("researcher", {"locale": "fr-FR", "x": [1]})
+    assert again is english
+    assert "fr-FR" in french
+    stats = get_prompt_template_stats()["researcher"]
+    assert stats["cache_hits"] >= 1
+    assert stats["renders"] >= 2
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.llms.rate_limit import (
+    RateLimiter,
+    RateLimitedChatModel,
+    RequestPriority,
+)
+from src.llms.tokens import estimate_tokens
+
+
+def test_request_bucket_delays_calls_over_quota():
+    limiter = RateLimiter("test", requests_per_minute=600)
+    assert limiter.acquire(1) < 0.01
+    limiter.request_bucket.tokens = 0
+    wait = limiter.acquire(1)
+    assert 0.05 < wait < 0.5
+    stats = limiter.get_stats()
+    assert stats["requests"] == 2
+    assert stats["delayed"] == 1
+    assert stats["queued"] == 0
+
+
+def test_token_bucket_accounts_for_prompt_size():
+    limiter = RateLimiter("test", tokens_per_minute=6000)
+    limiter.token_bucket.tokens = 0
+    # 100 tokens per second, 20 tokens take about 0.2s to refill
+    wait = limiter.acquire(20)
+    assert 0.1 < wait < 0.6
+    assert limiter.get_stats()["tokens"] == 20
+
+
+def test_interactive_calls_go_first():
+    limiter = RateLimiter("test", requests_per_minute=600, poll_interval=0.01)
+    limiter.request_bucket.tokens = 0
+    order = []
+
+    async def call(name, priority):
+        await limiter.aacquire(1, priority)
+        order.append(name)
+
+    async def calls():
+        batch = [
+            asyncio.create_task(call(f"batch-{i}", RequestPriority.BATCH))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(
+            call("interactive", RequestPriority.INTERACTIVE)
+        )
+        await asyncio.gather(*batch, interactive)
+
+    asyncio.run(calls())
+    assert order == ["interactive", "batch-0", "batch-1"]
+
+
+def test_priority_is_read_from_run_metadata():
+    limiter = RateLimiter("test", requests_per_minute=600)
+    llm = RateLimitedChatModel(
+        model=FakeListChatModel(responses=["a", "b"]), limiter=limiter
+    )
+    assert llm.invoke("hi").content == "a"
+    assert (
+        llm.invoke("hi", config={"metadata": {"llm_priority": "batch"}}).content == "b"
+    )
+    assert set(limiter.get_stats()["wait_seconds_by_priority"]) == {
+        "interactive",
+        "batch",
+    }
+
+
+def test_estimate_tokens():
+    assert estimate_tokens([{"role": "user", "content": "x" * 40}]) == 14
+    assert estimate_tokens([], tools=[{"name": "tool"}]) > 0
@@ -0,0 +1,116 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, PrivateAttr
+
+from src.storage.disk_cache import DiskLRUCache
+from src.tools.decorators import create_cached_tool, create_logged_tool
+from src.tools.search_cache import (
+    SearchCache,
+    get_search_cache_stats,
+    search_cache_key,
+    search_params,
+)
+
+
+class _Wrapper(BaseModel):
+    api_key: str = "secret"
+    region: str = "us"
+
+
+class _Search(BaseTool):
+    name: str = "web_search"
+    description: str = "A search engine that counts its calls."
+    response_format: str = "content_and_artifact"
+    max_results: int = 3
+    api_wrapper: _Wrapper = _Wrapper()
+    # Not a field, so that it doesn't change the cache key
+    _calls: list = PrivateAttr(default_factory=list)
+
+    @property
+    def calls(self) -> int:
+        return len(self._calls)
+
+    def _run(self, query: str, run_manager=None) -> tuple:
+        self._calls.append(query)
+        if query == "fail":
+            return "ConnectError()", {}
+        return [{"title": query, "max_results": self.max_results}], {"raw": query}
+
+
+def test_search_cache_key_normalizes_queries_and_covers_parameters():
+    params = search_params(_Search())
+    assert params["max_results"] == 3
+    assert params["api_wrapper"] == {"region": "us"}
+    assert "name" not in params
+    key = search_cache_key("tavily", "Tidal power UK", params)
+    assert key == search_cache_key("tavily", "  tidal POWER  uk", params)
+    assert key != search_cache_key("brave", "tidal power uk", params)
+    assert key != search_cache_key(
+        "tavily", "tidal power uk", search_params(_Search(max_results=5))
+    )
+
+
+@pytest.mark.parametrize(
+    "query, other",
+    [
+        ("C++ tutorial", "C# tutorial"),
+        ("C++ tutorial", "c tutorial"),
+        ("python vs rust", "rust vs python"),
+        (".NET", "NET"),
+        ("go go", "go"),
+    ],
+)
+def test_search_cache_key_keeps_order_and_symbols(query, other):
+    params = search_params(_Search())
+    assert search_cache_key("tavily", query, params) != search_cache_key(
+        "tavily", other, params
+    )
+
+
+def test_search_cache_serves_memory_then_disk_with_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / "search.sqlite")
+    cache = SearchCache(DiskLRUCache(path), memory_entries=1)
+    cache.put("a", [{"title": "A"}])
+    cache.put("b", "results of b")
+    assert cache.get("b") == "results of b"
+    # "a" was evicted from memory and is read from disk
+    assert cache.get("a") == [{"title": "A"}]
+    assert cache.get("missing") is None
+    stats = cache.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["memory_entries"] == 1 and stats["entries"] == 2
+
+    # Results survive a restart, until they expire
+    restarted = SearchCache(DiskLRUCache(path), ttl_seconds=60)
+    assert restarted.get("b") == "results of b"
+    monkeypatch.setattr("src.tools.search_cache.time.time", lambda: 10**12)
+    assert restarted.get("b") is None
+    assert restarted.get_stats()["expired"] == 1
+
+
+def test_cached_tool_skips_repeated_and_failed_searches(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_PATH", str(tmp_path / "search.sqlite"))
+    monkeypatch.setattr("src.tools.search_cache._search_cache", None)
+    search = create_cached_tool(create_logged_tool(_Search))()
+    result = search.invoke("tidal power")
+    assert search.invoke("Tidal  power") == result
+    assert asyncio.run(search.ainvoke("Tidal Power")) == result
+    assert search.calls == 1
+    # Results of other parameters are cached apart
+    create_cached_tool(_Search)(max_results=5).invoke("tidal power")
+
+    search.invoke("fail")
+    search.invoke("fail")
+    assert search.calls == 3
+    stats = get_search_cache_stats()
+    assert (stats["memory_hits"], stats["misses"]) == (2, 4)
+
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+    search.invoke("tidal power")
+    assert search.calls == 4